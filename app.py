@@ -1,20 +1,59 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.responses import HTMLResponse, RedirectResponse
 from uvicorn import run as app_run
 
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Optional
 
 # Importing constants and pipeline modules from the project
 from src.constants import APP_HOST, APP_PORT
-from src.pipline.prediction_pipeline import VehicleData, VehicleDataClassifier
-from src.pipline.training_pipeline import TrainPipeline
+from src.pipline.prediction_pipeline import VehicleBatchData, VehicleData, VehicleDataClassifier
+from src.pipline.micro_batcher import MicroBatcher
+from src.pipline.training_jobs import TrainingJobManager
+from src.utils.metrics import metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Sets up the executor layer and the prediction path at startup and tears them down on shutdown:
+    - a bounded thread pool for CPU-bound inference, so scoring never runs on the event loop
+    - a separate worker process for training jobs started from /train
+    - the warm production model cache and the micro-batcher that serves the form POST
+    """
+    classifier = VehicleDataClassifier()
+    config = classifier.prediction_pipeline_config
+
+    app.state.inference_executor = ThreadPoolExecutor(max_workers=config.inference_max_workers,
+                                                      thread_name_prefix="inference")
+    app.state.training_jobs = TrainingJobManager()
+    app.state.training_jobs.start()
+
+    model_cache = classifier.get_model_cache()
+    await asyncio.get_running_loop().run_in_executor(app.state.inference_executor, model_cache.start)
+
+    app.state.micro_batcher = MicroBatcher(
+        predict_fn=classifier.predict_batch,
+        max_batch_size=config.micro_batch_max_size,
+        max_wait_ms=config.micro_batch_max_wait_ms,
+        executor=app.state.inference_executor,
+    )
+    await app.state.micro_batcher.start()
+    yield
+    await app.state.micro_batcher.stop()
+    model_cache.stop()
+    app.state.training_jobs.shutdown()
+    app.state.inference_executor.shutdown(wait=False)
 
 # Initialize FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Mount the 'static' directory for serving static files (like CSS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -81,19 +120,46 @@ async def index(request: Request):
     return templates.TemplateResponse(
             "index.html",{"request": request, "context": "Rendering"})
 
+# Route to expose serving metrics (model cache hits/misses, ...)
+@app.get("/metrics")
+async def metricsRouteClient():
+    """
+    Returns a snapshot of all in-process serving metrics.
+    """
+    return metrics.snapshot()
+
+# Liveness probe; stays responsive while training runs in its own process
+@app.get("/health")
+async def healthRouteClient():
+    """
+    Returns OK as long as the event loop is serving requests.
+    """
+    return {"status": "ok"}
+
 # Route to trigger the model training process
 @app.get("/train")
-async def trainRouteClient():
+async def trainRouteClient(request: Request):
     """
-    Endpoint to initiate the model training pipeline.
+    Endpoint to queue the model training pipeline in the background.
+    Returns the job id right away; progress is available from /train/{job_id}.
     """
     try:
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training successful!!!")
+        job_id = request.app.state.training_jobs.submit()
+        return {"status": True, "job_id": job_id, "status_url": f"/train/{job_id}"}
 
     except Exception as e:
-        return Response(f"Error Occurred! {e}")
+        return JSONResponse(status_code=500, content={"status": False, "error": f"{e}"})
+
+# Route to report the stage-by-stage progress of a training job
+@app.get("/train/{job_id}")
+async def trainStatusRouteClient(request: Request, job_id: str):
+    """
+    Endpoint to fetch the status of a training job.
+    """
+    status = request.app.state.training_jobs.get_status(job_id)
+    if status is None:
+        return JSONResponse(status_code=404, content={"status": False, "error": f"Unknown training job: {job_id}"})
+    return status
 
 # Route to handle form submission and make predictions
 @app.post("/")
@@ -119,14 +185,9 @@ async def predictRouteClient(request: Request):
                                 Vintage = form.Vintage
                                 )
 
-        # Convert form data into a DataFrame for the model
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
-
-        # Initialize the prediction pipeline
-        model_predictor = VehicleDataClassifier()
-
-        # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
+        # Queue the row with other concurrent requests; the micro-batcher scores them in one call
+        predictions, _ = await request.app.state.micro_batcher.submit(vehicle_data.get_vehicle_data_as_dict())
+        value = predictions[0]
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
@@ -140,6 +201,58 @@ async def predictRouteClient(request: Request):
     except Exception as e:
         return {"status": False, "error": f"{e}"}
 
+def score_batch_body(body: bytes, is_ndjson: bool) -> Response:
+    """
+    Parses, validates and scores a batch request body. CPU-bound, so it runs on the inference pool.
+    """
+    if is_ndjson:
+        data = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        data = json.loads(body)
+
+    batch = VehicleBatchData(data)
+    errors = batch.validate()
+    if errors:
+        return JSONResponse(status_code=422, content={"status": False, "errors": errors})
+
+    predictions, probabilities = VehicleDataClassifier().predict_batch(
+        dataframe=batch.get_vehicle_input_data_frame()
+    )
+
+    if is_ndjson:
+        lines = (
+            json.dumps({"prediction": prediction, "probability": probability})
+            for prediction, probability in zip(predictions.tolist(), probabilities.tolist())
+        )
+        return Response("\n".join(lines) + "\n", media_type="application/x-ndjson")
+
+    return JSONResponse(
+        content={"status": True, "predictions": predictions.tolist(), "probabilities": probabilities.tolist()}
+    )
+
+# Route to score many rows in one call (JSON or NDJSON body)
+@app.post("/predict/batch")
+async def predictBatchRouteClient(request: Request):
+    """
+    Endpoint to score a batch of vehicle records with a single vectorized model call.
+
+    Accepts a JSON list of records, a JSON object of column -> values, or NDJSON (one record per line).
+    Returns predictions and positive-class probabilities in input order.
+    """
+    try:
+        body = await request.body()
+        is_ndjson = "ndjson" in request.headers.get("content-type", "")
+
+        return await asyncio.get_running_loop().run_in_executor(
+            request.app.state.inference_executor, score_batch_body, body, is_ndjson
+        )
+
+    except json.JSONDecodeError as e:
+        return JSONResponse(status_code=400, content={"status": False, "error": f"Invalid JSON body: {e}"})
+
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": False, "error": f"{e}"})
+
 # Main entry point to start the FastAPI server
 if __name__ == "__main__":
     app_run(app, host=APP_HOST, port=APP_PORT)
\ No newline at end of file
@@ -1,9 +1,16 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from src.configuration.aws_connection import S3Client
 from io import StringIO
-from typing import Union,List
+from typing import Union,Optional
 import os,sys
+import tempfile
+import threading
+import time
+from src.constants import (S3_METADATA_CACHE_TTL_SECONDS, S3_TRANSFER_CHUNK_SIZE, S3_TRANSFER_MAX_CONCURRENCY,
+                           S3_TRANSFER_MULTIPART_THRESHOLD)
 from src.logger import logging
+from src.utils.metrics import metrics
 from mypy_boto3_s3.service_resource import Bucket
 from src.exception import MyException
 from botocore.exceptions import ClientError
@@ -11,24 +18,89 @@ from pandas import DataFrame
 import pickle
 
 
+downloaded_bytes = metrics.counter("s3_downloaded_bytes_total", "Bytes read from S3")
+uploaded_bytes = metrics.counter("s3_uploaded_bytes_total", "Bytes written to S3")
+transfer_throughput = metrics.histogram(
+    "s3_transfer_throughput_mib_per_second", buckets=[1, 2, 5, 10, 20, 50, 100, 200, 500, 1000],
+    description="Throughput of single S3 uploads and downloads"
+)
+head_requests = metrics.counter("s3_head_requests_total", "HEAD requests sent to S3")
+metadata_cache_hits = metrics.counter("s3_metadata_cache_hits_total", "Object metadata lookups answered from cache")
+
+
+def _record_transfer(direction: str, key: str, n_bytes: int, seconds: float) -> None:
+    (downloaded_bytes if direction == "download" else uploaded_bytes).inc(n_bytes)
+    throughput = n_bytes / (1024 * 1024) / max(seconds, 1e-9)
+    transfer_throughput.observe(throughput)
+    logging.info(f"S3 {direction} of {key}: {n_bytes} bytes in {seconds:.2f}s ({throughput:.1f} MiB/s)")
+
+
+class ObjectMetadataCache:
+    """
+    Thread-safe TTL cache of HEAD results keyed by (bucket, key). A missing object is cached as None,
+    so repeated existence checks for an absent model do not reach S3 either.
+    """
+
+    def __init__(self, ttl_seconds: float = S3_METADATA_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, bucket_name: str, s3_key: str):
+        """
+        Returns (found, metadata); found is False when there is no fresh entry.
+        """
+        with self._lock:
+            entry = self._entries.get((bucket_name, s3_key))
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return False, None
+        return True, entry[1]
+
+    def put(self, bucket_name: str, s3_key: str, metadata: Optional[dict]) -> None:
+        with self._lock:
+            self._entries[(bucket_name, s3_key)] = (time.monotonic(), metadata)
+
+    def invalidate(self, bucket_name: str, s3_key: str) -> None:
+        with self._lock:
+            self._entries.pop((bucket_name, s3_key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class SimpleStorageService:
     """
     A class for interacting with AWS S3 storage, providing methods for file management, 
     data uploads, and data retrieval in S3 buckets.
     """
 
-    def __init__(self):
+    # Shared by every instance, so the estimator's existence check and the loaders reuse one HEAD
+    metadata_cache = ObjectMetadataCache()
+
+    def __init__(self, transfer_config: Optional[TransferConfig] = None):
         """
         Initializes the SimpleStorageService instance with S3 resource and client
         from the S3Client class.
+
+        Args:
+            transfer_config (TransferConfig): Part size and concurrency of large transfers;
+                defaults to the S3_TRANSFER_* constants.
         """
         s3_client = S3Client()
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
+        self.transfer_config = transfer_config or TransferConfig(
+            multipart_threshold=S3_TRANSFER_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_TRANSFER_CHUNK_SIZE,
+            max_concurrency=S3_TRANSFER_MAX_CONCURRENCY,
+            use_threads=True
+        )
 
     def s3_key_path_available(self, bucket_name, s3_key) -> bool:
         """
         Checks if a specified S3 key path (file path) is available in the specified bucket.
+        Only the exact key counts: "model.pkl" is not found through "model.pkl.bak".
 
         Args:
             bucket_name (str): Name of the S3 bucket.
@@ -38,9 +110,7 @@ class SimpleStorageService:
             bool: True if the file exists, False otherwise.
         """
         try:
-            bucket = self.get_bucket(bucket_name)
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=s3_key)]
-            return len(file_objects) > 0
+            return self.head_object(bucket_name, s3_key) is not None
         except Exception as e:
             raise MyException(e, sys)
         
@@ -73,7 +143,9 @@ class SimpleStorageService:
         
     def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
         """
-        Loads a serialized model from the specified S3 bucket.
+        Loads a serialized model from the specified S3 bucket without holding its bytes in memory:
+        small models are unpickled straight from the response stream, large ones are downloaded
+        to a temporary file with parallel ranged GETs and unpickled from disk.
 
         Args:
             model_name (str): Name of the model file in the bucket.
@@ -85,9 +157,23 @@ class SimpleStorageService:
         """
         try:
             model_file = model_dir + "/" + model_name if model_dir else model_name
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            size = self.get_object_metadata(bucket_name, model_file)["ContentLength"]
+
+            if size >= self.transfer_config.multipart_threshold:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    local_file = os.path.join(tmp_dir, os.path.basename(model_file))
+                    self.download_file(bucket_name, model_file, local_file)
+                    with open(local_file, "rb") as file_obj:
+                        model = pickle.load(file_obj)
+            else:
+                started_at = time.perf_counter()
+                body = self.s3_client.get_object(Bucket=bucket_name, Key=model_file)["Body"]
+                try:
+                    model = pickle.load(body)
+                finally:
+                    body.close()
+                _record_transfer("download", model_file, size, time.perf_counter() - started_at)
+
             logging.info("Production model loaded from S3 bucket.")
             return model
         except Exception as e:
@@ -111,31 +197,144 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
         
-    def get_file_object(self, filename: str, bucket_name: str) -> Union[List[object], object]:
+    def get_file_object(self, filename: str, bucket_name: str) -> object:
         """
-        Retrieves the file object(s) from the specified bucket based on the filename.
+        Retrieves the file object with exactly this key from the specified bucket.
 
         Args:
             filename (str): The name of the file to retrieve.
             bucket_name (str): The name of the S3 bucket.
 
         Returns:
-            Union[List[object], object]: The S3 file object or list of file objects.
+            object: The S3 file object.
         """
         logging.info("Entered the get_file_object method of SimpleStorageService class")
         try:
-            bucket = self.get_bucket(bucket_name)
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
-            func = lambda x: x[0] if len(x) == 1 else x
-            file_objs = func(file_objects)
+            if self.head_object(bucket_name, filename) is None:
+                raise FileNotFoundError(f"s3://{bucket_name}/{filename} does not exist")
+            file_obj = self.s3_resource.Object(bucket_name, filename)
             logging.info("Exited the get_file_object method of SimpleStorageService class")
-            return file_objs
+            return file_obj
         except Exception as e:
             raise MyException(e, sys) from e
-        
+
+    def head_object(self, bucket_name: str, s3_key: str, use_cache: bool = True) -> Optional[dict]:
+        """
+        Fetches the metadata of a single S3 object with a HEAD request (no body is downloaded),
+        answering from the shared TTL cache when a fresh entry exists.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the object.
+            use_cache (bool): Whether a cached result may be returned.
+
+        Returns:
+            Optional[dict]: The object's ETag, LastModified timestamp and ContentLength, None when it does not exist.
+        """
+        try:
+            if use_cache:
+                found, metadata = self.metadata_cache.get(bucket_name, s3_key)
+                if found:
+                    metadata_cache_hits.inc()
+                    return metadata
+
+            head_requests.inc()
+            try:
+                response = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+                metadata = {
+                    "ETag": response["ETag"],
+                    "LastModified": response["LastModified"],
+                    "ContentLength": response["ContentLength"],
+                }
+            except ClientError as error:
+                if error.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                    raise
+                metadata = None
+            self.metadata_cache.put(bucket_name, s3_key, metadata)
+            return metadata
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_object_metadata(self, bucket_name: str, s3_key: str, use_cache: bool = True) -> dict:
+        """
+        Fetches the metadata of a single S3 object that must exist (see head_object).
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the object.
+            use_cache (bool): Whether a cached result may be returned.
+
+        Returns:
+            dict: The object's ETag, LastModified timestamp and ContentLength.
+        """
+        try:
+            metadata = self.head_object(bucket_name, s3_key, use_cache=use_cache)
+            if metadata is None:
+                raise FileNotFoundError(f"s3://{bucket_name}/{s3_key} does not exist")
+            return metadata
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_object_bytes(self, bucket_name: str, s3_key: str) -> Optional[bytes]:
+        """
+        Reads the body of a small object, such as a manifest, by its exact key.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the object.
+
+        Returns:
+            Optional[bytes]: The object's content, None when the key does not exist.
+        """
+        try:
+            try:
+                return self.s3_client.get_object(Bucket=bucket_name, Key=s3_key)["Body"].read()
+            except ClientError as error:
+                if error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                    return None
+                raise
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def put_object_bytes(self, bucket_name: str, s3_key: str, body: bytes, content_type: str = None) -> None:
+        """
+        Writes a small object in a single PUT; S3 replaces the whole object atomically.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the object.
+            body (bytes): Content to store.
+            content_type (str): Optional MIME type of the content.
+        """
+        try:
+            extra = {"ContentType": content_type} if content_type else {}
+            self.s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=body, **extra)
+            self.metadata_cache.invalidate(bucket_name, s3_key)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def download_file(self, bucket_name: str, s3_key: str, to_filename: str) -> None:
+        """
+        Downloads an object by its exact key into a local file. Objects above the multipart threshold
+        are fetched as parallel ranged GETs of the configured chunk size, written straight to disk.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the object.
+            to_filename (str): Local destination path.
+        """
+        try:
+            logging.info(f"Downloading {s3_key} from {bucket_name} to {to_filename}")
+            started_at = time.perf_counter()
+            self.s3_client.download_file(bucket_name, s3_key, to_filename, Config=self.transfer_config)
+            _record_transfer("download", s3_key, os.path.getsize(to_filename), time.perf_counter() - started_at)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True):
         """
         Uploads a local file to the specified S3 bucket with an optional file deletion.
+        Files above the multipart threshold are uploaded as concurrent multipart parts.
 
         Args:
             from_filename (str): Path of the local file.
@@ -146,7 +345,12 @@ class SimpleStorageService:
         logging.info("Entered the upload_file method of SimpleStorageService class")
         try:
             logging.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
+            size = os.path.getsize(from_filename)
+            started_at = time.perf_counter()
+            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename,
+                                                     Config=self.transfer_config)
+            self.metadata_cache.invalidate(bucket_name, to_filename)
+            _record_transfer("upload", to_filename, size, time.perf_counter() - started_at)
             logging.info(f"Uploaded {from_filename} to {to_filename} in {bucket_name}")
 
             # Delete the local file if remove is True
@@ -0,0 +1,146 @@
+import json
+import sys
+from typing import Any, Dict, Iterator, Optional
+
+from pandas import DataFrame
+
+from src.exception import MyException
+from src.logger import logging
+from src.constants import SCHEMA_FILE_PATH
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+from src.entity.config_entity import DataDriftConfig
+from src.entity.artifact_entity import (DataIngestionArtifact, DataValidationArtifact, DataDriftArtifact,
+                                        ProductionModelArtifact)
+from src.entity.feature_sketches import FrequencySketch, QuantileSketch, compare_sketches, sketch_from_dict
+from src.data_access.table_storage import iter_table
+
+
+class DataDrift:
+    def __init__(self, data_ingestion_artifact: DataIngestionArtifact,
+                 data_validation_artifact: DataValidationArtifact,
+                 data_drift_config: DataDriftConfig,
+                 production_model_artifact: Optional[ProductionModelArtifact] = None):
+        """
+        :param data_ingestion_artifact: output of the ingestion stage; its in-memory train frame is used when present
+        :param data_validation_artifact: output of the validation stage; the drift result is added to its report
+        :param data_drift_config: configuration for drift detection
+        :param production_model_artifact: production model whose stored sketches are the drift reference
+        """
+        try:
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.data_validation_artifact = data_validation_artifact
+            self.data_drift_config = data_drift_config
+            self.production_model_artifact = production_model_artifact
+            self.schema = read_yaml_file(SCHEMA_FILE_PATH)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def _iter_chunks(self) -> Iterator[DataFrame]:
+        chunk_size = self.data_drift_config.chunk_size
+        dataframe = self.data_ingestion_artifact.train_df
+        if dataframe is not None:
+            for start in range(0, len(dataframe), chunk_size):
+                yield dataframe.iloc[start:start + chunk_size]
+        else:
+            yield from iter_table(self.data_ingestion_artifact.trained_file_path, chunk_size)
+
+    def build_sketches(self) -> Dict[str, Any]:
+        """
+        Description: This method sketches every drift column of the training data in one chunked pass
+
+        Output: Returns the sketches by column name
+        """
+        drift_columns = self.schema["drift_columns"]
+        sketches = {column: QuantileSketch(self.data_drift_config.sketch_capacity)
+                    for column in drift_columns["quantile"]}
+        sketches.update({column: FrequencySketch() for column in drift_columns["frequency"]})
+        for chunk in self._iter_chunks():
+            for column, sketch in sketches.items():
+                sketch.update(chunk[column])
+        return sketches
+
+    def get_reference_sketches(self) -> Optional[Dict[str, Any]]:
+        """
+        Description: This method reads the sketches stored with the production model
+
+        Output: Returns them by column name, or None when there is no production model or it predates sketches
+        """
+        artifact = self.production_model_artifact
+        if artifact is None or not artifact.is_model_present or artifact.estimator is None:
+            return None
+        # Models trained before drift detection existed have no feature_sketches attribute
+        stored = getattr(artifact.estimator.loaded_model, "feature_sketches", None)
+        if not stored:
+            return None
+        return {column: sketch_from_dict(data) for column, data in stored.items()}
+
+    def compare(self, reference: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Description: This method computes PSI (and KS for numeric columns) of each column present in both sketch sets
+
+        Output: Returns the statistics and drift flag by column name
+        """
+        results = {}
+        for column in sorted(set(reference) & set(current)):
+            stats = compare_sketches(reference[column], current[column])
+            drifted = (stats["psi"] > self.data_drift_config.psi_threshold or
+                       (stats["ks"] is not None and stats["ks"] > self.data_drift_config.ks_threshold))
+            results[column] = {"psi": round(stats["psi"], 6),
+                               "ks": None if stats["ks"] is None else round(stats["ks"], 6),
+                               "drift_detected": drifted}
+        return results
+
+    def _update_validation_report(self, drift_report: Dict[str, Any]) -> None:
+        report_file_path = self.data_validation_artifact.validation_report_file_path
+        with open(report_file_path) as report_file:
+            report = json.load(report_file)
+        report["drift"] = drift_report
+        with open(report_file_path, "w") as report_file:
+            json.dump(report, report_file, indent=4)
+
+    def initiate_data_drift(self) -> DataDriftArtifact:
+        """
+        Description: This method initiates drift detection: it sketches the new training data, compares it with
+                     the production model's sketches and records the result in the validation report
+
+        Output: Returns the drift artifact, including the new sketches for the model trainer
+        On Failure: Write an exception log and then raise an exception
+        """
+        try:
+            logging.info("Starting data drift detection")
+            sketches = self.build_sketches()
+            serialized = {column: sketch.to_dict() for column, sketch in sketches.items()}
+            write_yaml_file(self.data_drift_config.sketch_file_path, serialized)
+
+            reference = self.get_reference_sketches()
+            if reference is None:
+                columns, drifted = {}, []
+                message = "No reference sketches from a production model; drift not evaluated"
+            else:
+                columns = self.compare(reference, sketches)
+                drifted = [column for column, result in columns.items() if result["drift_detected"]]
+                message = f"Drift detected in {drifted}" if drifted else "No drift detected"
+
+            drift_detected = bool(drifted)
+            retraining_required = not self.data_drift_config.gate_retraining or reference is None or drift_detected
+            logging.info(f"{message}; retraining required: {retraining_required}")
+
+            self._update_validation_report({
+                "drift_detected": drift_detected,
+                "retraining_required": retraining_required,
+                "message": message,
+                "psi_threshold": self.data_drift_config.psi_threshold,
+                "ks_threshold": self.data_drift_config.ks_threshold,
+                "columns": columns,
+            })
+
+            return DataDriftArtifact(
+                drift_detected=drift_detected,
+                retraining_required=retraining_required,
+                message=message,
+                sketch_file_path=self.data_drift_config.sketch_file_path,
+                validation_report_file_path=self.data_validation_artifact.validation_report_file_path,
+                sketches=serialized,
+            )
+        except Exception as e:
+            raise MyException(e, sys) from e
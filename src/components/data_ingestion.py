@@ -1,5 +1,6 @@
 import os
 import sys
+from typing import Optional
 
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
@@ -9,22 +10,90 @@ from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import MyException
 from src.logger import logging
 from src.data_access.proj1_data import Proj1Data
+from src.data_access.ingestion_snapshot import IngestionSnapshot
+from src.data_access.table_storage import apply_schema_dtypes, table_file_path, write_table
+from src.utils.artifact_writer import ArtifactWriter, write_artifact
 
 class DataIngestion:
-    def __init__(self,data_ingestion_config:DataIngestionConfig=DataIngestionConfig()):
+    def __init__(self,data_ingestion_config:DataIngestionConfig=DataIngestionConfig(),
+                 artifact_writer: Optional[ArtifactWriter] = None):
         """
         :param data_ingestion_config: configuration for data ingestion
+        :param artifact_writer: when given, files are written in the background and the artifact
+                                carries the train and test DataFrames for the next stages
         """
         try:
             self.data_ingestion_config = data_ingestion_config
+            self.artifact_writer = artifact_writer
         except Exception as e:
             raise MyException(e,sys)
         
 
+    def export_collection(self, my_data: Proj1Data, query: Optional[dict] = None) -> DataFrame:
+        """
+        Exports the documents matching `query`, in parallel key ranges when more than one worker is configured.
+        """
+        config = self.data_ingestion_config
+        if config.export_max_workers > 1:
+            return my_data.export_collection_parallel(collection_name=config.collection_name,
+                                                      partition_key=config.export_partition_key,
+                                                      partition_size=config.export_partition_size,
+                                                      max_workers=config.export_max_workers,
+                                                      chunk_size=config.export_chunk_size,
+                                                      query=query)
+        return my_data.concat_chunks(list(my_data.iter_collection_chunks(collection_name=config.collection_name,
+                                                                         chunk_size=config.export_chunk_size,
+                                                                         query=query)))
+
+    def export_incremental(self, my_data: Proj1Data) -> DataFrame:
+        """
+        Method Name :   export_incremental
+        Description :   This method pulls only documents above the persisted watermark, appends them to the
+                        local snapshot and returns the full snapshot
+
+        Output      :   every document ingested so far is returned as a dataframe
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
+            key = config.export_partition_key
+            snapshot = IngestionSnapshot(config.snapshot_dir, key)
+            watermark = snapshot.watermark
+
+            # Fix the upper bound first so documents inserted during the export are left for the next run
+            upper = my_data.get_max_key(config.collection_name, partition_key=key)
+            if upper is None or (watermark is not None and upper <= watermark):
+                logging.info(f"No documents above watermark {watermark}, reusing the snapshot")
+                return snapshot.read()
+
+            key_range = {"$lte": upper}
+            if watermark is not None:
+                key_range["$gt"] = watermark
+            delta = self.export_collection(my_data, query={key: key_range})
+            logging.info(f"Pulled {len(delta)} new documents with {key} in ({watermark}, {upper}]")
+
+            snapshot.append(delta, upper)
+            return snapshot.read()
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def write_ingestion_file(self, dataframe: DataFrame, file_path: str) -> str:
+        """
+        Writes `dataframe` in the configured format next to `file_path`, plus a CSV copy when export_csv is set.
+        Returns the path of the file downstream stages should read.
+        """
+        config = self.data_ingestion_config
+        output_file_path = table_file_path(file_path, config.file_format)
+        write_artifact(self.artifact_writer, write_table, dataframe, output_file_path)
+        if config.export_csv and config.file_format != "csv":
+            write_artifact(self.artifact_writer, write_table, dataframe, table_file_path(file_path, "csv"))
+        return output_file_path
+
     def export_data_into_feature_store(self)->DataFrame:
         """
         Method Name :   export_data_into_feature_store
-        Description :   This method exports data from mongodb to csv file
+        Description :   This method exports data from mongodb to the feature store file
         
         Output      :   data is returned as artifact of data ingestion components
         On Failure  :   Write an exception log and then raise an exception
@@ -32,43 +101,46 @@ class DataIngestion:
         try:
             logging.info(f"Exporting data from mongodb")
             my_data = Proj1Data()
-            dataframe = my_data.export_collection_as_dataframe(collection_name=
-                                                                   self.data_ingestion_config.collection_name)
+            if self.data_ingestion_config.incremental:
+                dataframe = self.export_incremental(my_data)
+            else:
+                dataframe = self.export_collection(my_data)
             logging.info(f"Shape of dataframe: {dataframe.shape}")
             feature_store_file_path  = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path,exist_ok=True)
             logging.info(f"Saving exported data into feature store file path: {feature_store_file_path}")
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
+            self.write_ingestion_file(dataframe, feature_store_file_path)
             return dataframe
 
         except Exception as e:
             raise MyException(e,sys)
 
-    def split_data_as_train_test(self,dataframe: DataFrame) ->None:
+    def split_data_as_train_test(self,dataframe: DataFrame) ->DataIngestionArtifact:
         """
         Method Name :   split_data_as_train_test
         Description :   This method splits the dataframe into train set and test set based on split ratio 
         
-        Output      :   Folder is created in s3 bucket
+        Output      :   Artifact with the paths of the train and test files (and the frames in memory mode)
         On Failure  :   Write an exception log and then raise an exception
         """
         logging.info("Entered split_data_as_train_test method of Data_Ingestion class")
 
         try:
             train_set, test_set = train_test_split(dataframe, test_size=self.data_ingestion_config.train_test_split_ratio)
+            # Type the frames once so the in-memory copies match what a later read of the files returns
+            train_set, test_set = apply_schema_dtypes(train_set), apply_schema_dtypes(test_set)
             logging.info("Performed train test split on the dataframe")
             logging.info(
                 "Exited split_data_as_train_test method of Data_Ingestion class"
             )
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path,exist_ok=True)
-            
             logging.info(f"Exporting train and test file path.")
-            train_set.to_csv(self.data_ingestion_config.training_file_path,index=False,header=True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path,index=False,header=True)
+            trained_file_path = self.write_ingestion_file(train_set, self.data_ingestion_config.training_file_path)
+            test_file_path = self.write_ingestion_file(test_set, self.data_ingestion_config.testing_file_path)
 
             logging.info(f"Exported train and test file path.")
+            in_memory = self.artifact_writer is not None
+            return DataIngestionArtifact(trained_file_path=trained_file_path, test_file_path=test_file_path,
+                                         train_df=train_set if in_memory else None,
+                                         test_df=test_set if in_memory else None)
         except Exception as e:
             raise MyException(e, sys) from e
 
@@ -87,7 +159,7 @@ class DataIngestion:
 
             logging.info("Got the data from mongodb")
 
-            self.split_data_as_train_test(dataframe)
+            data_ingestion_artifact = self.split_data_as_train_test(dataframe)
 
             logging.info("Performed train test split on the dataset")
 
@@ -95,9 +167,6 @@ class DataIngestion:
                 "Exited initiate_data_ingestion method of Data_Ingestion class"
             )
 
-            data_ingestion_artifact = DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path,
-            test_file_path=self.data_ingestion_config.testing_file_path)
-            
             logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
             return data_ingestion_artifact
         except Exception as e:
@@ -1,11 +1,15 @@
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
 import numpy as np
 import pandas as pd
 
-from imblearn.combine import SMOTEENN
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder
@@ -21,6 +25,9 @@ from src.exception import MyException
 from src.logger import logging
 from src.utils.main_utils import read_yaml_file, save_object, save_numpy_array_data
 from src.components.transformers import GenderMapper, ColumnDropper   
+from src.data_access.table_storage import get_schema_dtypes, iter_table, read_table
+from src.utils.artifact_writer import ArtifactWriter, write_artifact
+from src.components.resampling import get_resampling_strategy, resample_with_metrics
 
 
 class DataTransformation:
@@ -29,11 +36,13 @@ class DataTransformation:
         data_ingestion_artifact: DataIngestionArtifact,
         data_validation_artifact: DataValidationArtifact,
         data_transformation_config: DataTransformationConfig,
+        artifact_writer: Optional[ArtifactWriter] = None,
     ):
         try:
             self.ingestion_artifact = data_ingestion_artifact
             self.validation_artifact = data_validation_artifact
             self.config = data_transformation_config
+            self.artifact_writer = artifact_writer
             self.schema = read_yaml_file(SCHEMA_FILE_PATH)
         except Exception as e:
             raise MyException(e, sys)
@@ -88,15 +97,199 @@ class DataTransformation:
         except Exception as e:
             raise MyException(e, sys)
         
+    def _iter_frames(self, dataframe: Optional[pd.DataFrame], file_path: str,
+                     columns: Optional[list] = None) -> Iterator[pd.DataFrame]:
+        chunk_size = self.config.chunk_size
+        if dataframe is not None:
+            for start in range(0, len(dataframe), chunk_size):
+                yield dataframe.iloc[start:start + chunk_size]
+        else:
+            yield from iter_table(file_path, chunk_size, columns=columns or list(get_schema_dtypes()))
+
+    def _count_rows(self, dataframe: Optional[pd.DataFrame], file_path: str) -> int:
+        if dataframe is not None:
+            return len(dataframe)
+        return sum(len(chunk) for chunk in self._iter_frames(None, file_path, columns=[TARGET_COLUMN]))
+
+    def fit_preprocessor_chunked(self, train_df: Optional[pd.DataFrame], train_file_path: str) -> Tuple[Pipeline, int]:
+        """
+        Description: This method fits the preprocessing pipeline in one pass over the training chunks. Scalers are
+                     fitted with partial_fit and the one-hot encoder from the set of categories seen, so only one
+                     chunk is in memory at a time
+
+        Output: Returns the fitted pipeline and the number of training rows
+        """
+        pipeline = self.get_preprocessor()
+        # GenderMapper and ColumnDropper hold no fitted state
+        stateless_steps = [step for _, step in pipeline.steps[:-1]]
+        column_transformer = pipeline.steps[-1][1]
+
+        incremental, categories = {}, {}
+        for name, transformer, columns in column_transformer.transformers:
+            estimator = transformer.steps[-1][1]
+            if hasattr(estimator, "partial_fit"):
+                incremental[name] = (clone(estimator), columns)
+            elif isinstance(estimator, OneHotEncoder):
+                categories.update({column: set() for column in columns})
+            else:
+                raise ValueError(f"Transformer '{name}' cannot be fitted chunk by chunk")
+
+        n_rows, first_chunk = 0, None
+        for chunk in self._iter_frames(train_df, train_file_path):
+            X_chunk = chunk.drop(columns=[TARGET_COLUMN])
+            if first_chunk is None:
+                first_chunk = X_chunk
+            transformed = X_chunk
+            for step in stateless_steps:
+                transformed = step.transform(transformed)
+            for estimator, columns in incremental.values():
+                estimator.partial_fit(transformed[columns])
+            for column, seen in categories.items():
+                seen.update(X_chunk[column].dropna().unique().tolist())
+            n_rows += len(chunk)
+        if first_chunk is None:
+            raise ValueError("Training data is empty")
+
+        # Fitting on the first chunk plus one row per category it lacks gives the pipeline its structure and the
+        # encoder the complete category set; the scalers are then swapped for their incrementally fitted copies
+        fit_frame = first_chunk.astype({column: object for column in categories})
+        extra_rows = []
+        for column, seen in categories.items():
+            for value in sorted(seen - set(first_chunk[column].dropna().unique().tolist()), key=str):
+                row = fit_frame.iloc[[0]].copy()
+                row[column] = value
+                extra_rows.append(row)
+        pipeline.fit(pd.concat([fit_frame, *extra_rows], ignore_index=True))
+
+        fitted_transformers = pipeline.steps[-1][1].named_transformers_
+        for name, (estimator, _) in incremental.items():
+            steps = fitted_transformers[name].steps
+            steps[-1] = (steps[-1][0], estimator)
+        return pipeline, n_rows
+
+    def transform_to_memmap(self, pipeline: Pipeline, dataframe: Optional[pd.DataFrame], file_path: str,
+                            features_path: str, target_path: str, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description: This method streams chunks through the fitted pipeline into preallocated memory-mapped
+                     .npy files, one for the features and one for the target
+
+        Output: Returns the memory-mapped features and target
+        """
+        features, target, position = None, None, 0
+        for chunk in self._iter_frames(dataframe, file_path):
+            transformed = pipeline.transform(chunk.drop(columns=[TARGET_COLUMN]))
+            if features is None:
+                os.makedirs(os.path.dirname(features_path), exist_ok=True)
+                features = np.lib.format.open_memmap(features_path, mode="w+", dtype=self.config.feature_dtype,
+                                                     shape=(n_rows, transformed.shape[1]))
+                target = np.lib.format.open_memmap(target_path, mode="w+", dtype=self.config.target_dtype,
+                                                   shape=(n_rows,))
+            features[position:position + len(chunk)] = transformed
+            target[position:position + len(chunk)] = chunk[TARGET_COLUMN].to_numpy()
+            position += len(chunk)
+        if features is None:
+            raise ValueError(f"No rows to transform in {file_path}")
+        features.flush()
+        target.flush()
+        return features, target
+
+    def _create_artifact(self, pipeline: Pipeline, class_weight: Optional[dict],
+                         train_features: np.ndarray, train_target: np.ndarray,
+                         test_features: np.ndarray, test_target: np.ndarray,
+                         unresampled_features: Optional[np.ndarray] = None,
+                         unresampled_target: Optional[np.ndarray] = None) -> DataTransformationArtifact:
+        handoff = self.artifact_writer is not None
+        resampled = unresampled_features is not None
+        return DataTransformationArtifact(
+            transformed_object_file_path=self.config.transformed_object_file_path,
+            transformed_train_file_path=self.config.transformed_train_file_path,
+            transformed_test_file_path=self.config.transformed_test_file_path,
+            transformed_train_target_file_path=self.config.transformed_train_target_file_path,
+            transformed_test_target_file_path=self.config.transformed_test_target_file_path,
+            class_weight=class_weight,
+            resampling_strategy=self.config.resampling_strategy if resampled else None,
+            unresampled_train_file_path=self.config.unresampled_train_file_path if resampled else None,
+            unresampled_train_target_file_path=self.config.unresampled_train_target_file_path if resampled else None,
+            preprocessing_object=pipeline if handoff else None,
+            train_features=train_features if handoff else None,
+            train_target=train_target if handoff else None,
+            test_features=test_features if handoff else None,
+            test_target=test_target if handoff else None,
+            unresampled_train_features=unresampled_features if handoff else None,
+            unresampled_train_target=unresampled_target if handoff else None,
+        )
+
+    def initiate_chunked_transformation(self) -> DataTransformationArtifact:
+        """
+        Description: This method runs the transformation out of core: peak memory is set by the chunk size, not by
+                     the number of rows. The class_weight strategy keeps it that way through resampling; the other
+                     strategies still need the training matrix in memory for their nearest-neighbour searches
+
+        Output: Returns the transformation artifact; its arrays are memory-mapped from the written files
+        """
+        train_df, test_df = self.ingestion_artifact.train_df, self.ingestion_artifact.test_df
+        train_file_path, test_file_path = self.ingestion_artifact.trained_file_path, self.ingestion_artifact.test_file_path
+
+        pipeline, n_train_rows = self.fit_preprocessor_chunked(train_df, train_file_path)
+        logging.info(f"Fitted the preprocessor incrementally over {n_train_rows} training rows")
+
+        streamed_paths = {self.config.transformed_train_file_path + ".stream": self.config.transformed_train_file_path,
+                          self.config.transformed_train_target_file_path + ".stream":
+                              self.config.transformed_train_target_file_path}
+        X_train, y_train = self.transform_to_memmap(pipeline, train_df, train_file_path, *streamed_paths, n_train_rows)
+        test_features, test_target = self.transform_to_memmap(pipeline, test_df, test_file_path,
+                                                              self.config.transformed_test_file_path,
+                                                              self.config.transformed_test_target_file_path,
+                                                              self._count_rows(test_df, test_file_path))
+
+        strategy = get_resampling_strategy(self.config.resampling_strategy, n_jobs=self.config.resampling_n_jobs,
+                                           random_state=self.config.resampling_random_state)
+        train_features, train_target, class_weight = resample_with_metrics(strategy, X_train, y_train)
+        unchanged = train_features is X_train
+        del X_train, y_train
+
+        unresampled_features, unresampled_target = None, None
+        if unchanged:
+            # No rows changed, so the streamed files are the training arrays as they are
+            del train_features, train_target
+            for streamed_path, final_path in streamed_paths.items():
+                os.replace(streamed_path, final_path)
+            train_features = np.load(self.config.transformed_train_file_path, mmap_mode="r")
+            train_target = np.load(self.config.transformed_train_target_file_path, mmap_mode="r")
+        else:
+            train_features = np.ascontiguousarray(train_features, dtype=self.config.feature_dtype)
+            train_target = np.ascontiguousarray(train_target, dtype=self.config.target_dtype)
+            save_numpy_array_data(self.config.transformed_train_file_path, train_features)
+            save_numpy_array_data(self.config.transformed_train_target_file_path, train_target)
+            # The streamed files are the rows before resampling, which the hyperparameter search folds over
+            for streamed_path, final_path in zip(streamed_paths, (self.config.unresampled_train_file_path,
+                                                                  self.config.unresampled_train_target_file_path)):
+                os.replace(streamed_path, final_path)
+            unresampled_features = np.load(self.config.unresampled_train_file_path, mmap_mode="r")
+            unresampled_target = np.load(self.config.unresampled_train_target_file_path, mmap_mode="r")
+
+        save_object(self.config.transformed_object_file_path, pipeline)
+        logging.info("Chunked Data Transformation Completed Successfully")
+        return self._create_artifact(pipeline, class_weight, train_features, train_target, test_features, test_target,
+                                     unresampled_features, unresampled_target)
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         try:
             if not self.validation_artifact.validation_status:
                 raise Exception(self.validation_artifact.message)
 
+            if self.config.chunked:
+                return self.initiate_chunked_transformation()
+
             logging.info("Starting Data Transformation")
 
-            train_df = pd.read_csv(self.ingestion_artifact.trained_file_path)
-            test_df = pd.read_csv(self.ingestion_artifact.test_file_path)
+            # Only the schema columns are loaded; validation has already rejected anything else
+            schema_columns = list(get_schema_dtypes())
+            train_df, test_df = self.ingestion_artifact.train_df, self.ingestion_artifact.test_df
+            if train_df is None:
+                train_df = read_table(self.ingestion_artifact.trained_file_path, columns=schema_columns)
+            if test_df is None:
+                test_df = read_table(self.ingestion_artifact.test_file_path, columns=schema_columns)
 
             X_train = train_df.drop(TARGET_COLUMN, axis=1)
             y_train = train_df[TARGET_COLUMN]
@@ -107,31 +300,48 @@ class DataTransformation:
             pipeline = self.get_preprocessor()
 
             X_train_transformed = pipeline.fit_transform(X_train)
-            X_test_transformed = pipeline.transform(X_test)
-
-            # Applying SMOTE on training data to handle imbalanced distribution
-            smote = SMOTEENN(sampling_strategy="minority")
-            result = smote.fit_resample(X_train_transformed, y_train)
-            X_train_resampled, y_train_resampled = result[0], result[1]
 
-            train_arr = np.c_[X_train_resampled, y_train_resampled]
-            test_arr = np.c_[X_test_transformed, y_test]
+            # The fitted pipeline transforms the test set on another thread while the train set is resampled
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                X_test_future = executor.submit(pipeline.transform, X_test)
 
-            save_object(self.config.transformed_object_file_path, pipeline)
-            save_numpy_array_data(self.config.transformed_train_file_path, train_arr)
-            save_numpy_array_data(self.config.transformed_test_file_path, test_arr)
+                # Rebalancing the training data with the configured strategy
+                strategy = get_resampling_strategy(self.config.resampling_strategy,
+                                                   n_jobs=self.config.resampling_n_jobs,
+                                                   random_state=self.config.resampling_random_state)
+                X_train_resampled, y_train_resampled, class_weight = resample_with_metrics(
+                    strategy, X_train_transformed, y_train)
 
-            logging.info("Data Transformation Completed Successfully")
-
-            return DataTransformationArtifact(
-                transformed_object_file_path=self.config.transformed_object_file_path,
-                transformed_train_file_path=self.config.transformed_train_file_path,
-                transformed_test_file_path=self.config.transformed_test_file_path,
-            )
+                X_test_transformed = X_test_future.result()
 
-        except Exception as e:
-            raise MyException(e, sys)
+            # Resampling runs at full precision; the stored features are cast to the dtype the forest computes in,
+            # so the trained model is the same as with float64 inputs
+            train_features = np.ascontiguousarray(X_train_resampled, dtype=self.config.feature_dtype)
+            train_target = np.ascontiguousarray(y_train_resampled, dtype=self.config.target_dtype)
+            test_features = np.ascontiguousarray(X_test_transformed, dtype=self.config.feature_dtype)
+            test_target = np.ascontiguousarray(y_test, dtype=self.config.target_dtype)
+            arrays = [(self.config.transformed_train_file_path, train_features),
+                      (self.config.transformed_train_target_file_path, train_target),
+                      (self.config.transformed_test_file_path, test_features),
+                      (self.config.transformed_test_target_file_path, test_target)]
 
+            # When the strategy changed the rows, the rows before resampling are kept for the hyperparameter search
+            unresampled_features, unresampled_target = None, None
+            if X_train_resampled is not X_train_transformed:
+                unresampled_features = np.ascontiguousarray(X_train_transformed, dtype=self.config.feature_dtype)
+                unresampled_target = np.ascontiguousarray(y_train, dtype=self.config.target_dtype)
+                arrays += [(self.config.unresampled_train_file_path, unresampled_features),
+                           (self.config.unresampled_train_target_file_path, unresampled_target)]
 
+            write_artifact(self.artifact_writer, save_object, self.config.transformed_object_file_path, pipeline)
+            for file_path, array in arrays:
+                write_artifact(self.artifact_writer, save_numpy_array_data, file_path, array)
 
+            logging.info(f"Data Transformation Completed Successfully: {train_features.nbytes + train_target.nbytes} "
+                         f"bytes of training arrays ({self.config.feature_dtype} features, "
+                         f"{self.config.target_dtype} target)")
+            return self._create_artifact(pipeline, class_weight, train_features, train_target,
+                                         test_features, test_target, unresampled_features, unresampled_target)
 
+        except Exception as e:
+            raise MyException(e, sys)
@@ -1,6 +1,8 @@
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
 
 import pandas as pd
 
@@ -12,6 +14,8 @@ from src.utils.main_utils import read_yaml_file
 from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from src.entity.config_entity import DataValidationConfig
 from src.constants import SCHEMA_FILE_PATH
+from src.data_access.table_storage import iter_table, read_table
+from src.components.validation_engine import ValidationEngine
 
 class DataValidation:
     def __init__(
@@ -19,6 +23,10 @@ class DataValidation:
         data_ingestion_artifact: DataIngestionArtifact,
         data_validation_config: DataValidationConfig
     ):
+        """
+        :param data_ingestion_artifact: output of the ingestion stage; its in-memory frames are used when present
+        :param data_validation_config: configuration for data validation
+        """
         try:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
@@ -29,7 +37,7 @@ class DataValidation:
     @staticmethod
     def read_data(file_path: str) -> DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_table(file_path)
         except Exception as e:
             raise MyException(e, sys)
 
@@ -80,6 +88,37 @@ class DataValidation:
 
         return errors
 
+    def _iter_chunks(self, dataframe: Optional[DataFrame], file_path: str) -> Iterator[DataFrame]:
+        chunk_size = self.data_validation_config.chunk_size
+        if dataframe is not None:
+            for start in range(0, len(dataframe), chunk_size):
+                yield dataframe.iloc[start:start + chunk_size]
+        else:
+            yield from iter_table(file_path, chunk_size)
+
+    def _validate_dataset(self, dataframe: Optional[DataFrame], file_path: str,
+                          dataset_name: str) -> Tuple[list[str], list[str], list[str], dict]:
+        """
+        Description: This method validates one dataset in a single chunked pass: column names and groups
+                     from the first chunk, and every value rule through the validation engine
+
+        Output: Returns column errors, column group errors, value errors and the dataset report
+        """
+        engine = ValidationEngine(self.schema, self.data_validation_config.sample_rows)
+        first_chunk = None
+        for chunk in self._iter_chunks(dataframe, file_path):
+            if first_chunk is None:
+                first_chunk = chunk
+            engine.update(chunk)
+        if first_chunk is None:
+            # Empty dataset: still check its columns
+            first_chunk = dataframe if dataframe is not None else self.read_data(file_path)
+
+        value_errors, report = engine.result(dataset_name)
+        return (self._validate_columns(first_chunk, dataset_name),
+                self._validate_column_groups(first_chunk, dataset_name),
+                value_errors, report)
+
     def initiate_data_validation(self) -> DataValidationArtifact:
         """
         Description: This method initiates the data validation component for the pipeline
@@ -90,16 +129,21 @@ class DataValidation:
         try:
             logging.info("Starting data validation")
 
-            train_df = self.read_data(self.data_ingestion_artifact.trained_file_path)
-            test_df = self.read_data(self.data_ingestion_artifact.test_file_path)
-           
+            # Train and test are validated concurrently; the in-memory frames are used when the
+            # ingestion artifact carries them, otherwise the files are streamed chunk by chunk
+            artifact = self.data_ingestion_artifact
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                train_result, test_result = executor.map(
+                    self._validate_dataset,
+                    [artifact.train_df, artifact.test_df],
+                    [artifact.trained_file_path, artifact.test_file_path],
+                    ["Train", "Test"])
+
+            # Column errors first, then column groups, then values
             errors = []
-
-            errors.extend(self._validate_columns(train_df, "Train"))
-            errors.extend(self._validate_columns(test_df, "Test"))
-
-            errors.extend(self._validate_column_groups(train_df, "Train"))
-            errors.extend(self._validate_column_groups(test_df, "Test"))
+            for index in range(3):
+                errors.extend(train_result[index])
+                errors.extend(test_result[index])
 
             validation_status = len(errors) == 0
             message = "; ".join(errors)
@@ -119,7 +163,8 @@ class DataValidation:
                 json.dump(
                     {
                         "validation_status": validation_status,
-                        "errors": errors
+                        "errors": errors,
+                        "datasets": {"Train": train_result[3], "Test": test_result[3]}
                     },
                     f,
                     indent=4
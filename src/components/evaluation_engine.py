@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.stats import rankdata
+
+from src.entity.artifact_entity import ClassificationMetricArtifact
+
+POSITIVE_LABEL = 1
+# Thresholds at which the precision/recall curve is kept; fine enough to pick an operating point
+CURVE_THRESHOLDS = np.round(np.linspace(0.0, 1.0, 21), 2)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    # Matches sklearn's zero_division=0 for undefined precision/recall/F1
+    return float(numerator / denominator) if denominator else 0.0
+
+
+def roc_auc(y_true: np.ndarray, positive_proba: np.ndarray) -> Optional[float]:
+    """
+    Area under the ROC curve from the rank statistic of the positive scores (ties count half).
+    None when only one class is present.
+    """
+    positives = y_true == POSITIVE_LABEL
+    n_positive = int(positives.sum())
+    n_negative = len(y_true) - n_positive
+    if not n_positive or not n_negative:
+        return None
+    ranks = rankdata(positive_proba)
+    return float((ranks[positives].sum() - n_positive * (n_positive + 1) / 2) / (n_positive * n_negative))
+
+
+def threshold_curve(y_true: np.ndarray, positive_proba: np.ndarray) -> List[Dict[str, float]]:
+    """
+    Precision, recall, F1 and false positive rate when predicting positive for proba >= threshold, at every
+    threshold in CURVE_THRESHOLDS. One sort of the scores serves all thresholds.
+    """
+    positives = y_true == POSITIVE_LABEL
+    sorted_positive = np.sort(positive_proba[positives])
+    sorted_negative = np.sort(positive_proba[~positives])
+    tp = len(sorted_positive) - np.searchsorted(sorted_positive, CURVE_THRESHOLDS, side="left")
+    fp = len(sorted_negative) - np.searchsorted(sorted_negative, CURVE_THRESHOLDS, side="left")
+    fn = len(sorted_positive) - tp
+    return [{"threshold": float(threshold),
+             "precision": round(_ratio(tp_i, tp_i + fp_i), 6),
+             "recall": round(_ratio(tp_i, tp_i + fn_i), 6),
+             "f1": round(_ratio(2 * tp_i, 2 * tp_i + fp_i + fn_i), 6),
+             "fpr": round(_ratio(fp_i, len(sorted_negative)), 6)}
+            for threshold, tp_i, fp_i, fn_i in zip(CURVE_THRESHOLDS, tp, fp, fn)]
+
+
+def metrics_from_scores(y_true: Any, predictions: Any, positive_proba: Any) -> ClassificationMetricArtifact:
+    """
+    Builds the confusion matrix once and derives every metric from it; ROC-AUC and the threshold curve come
+    from the same probabilities the predictions were made from.
+    """
+    y_true = np.asarray(y_true)
+    predictions = np.asarray(predictions)
+    positive_proba = np.asarray(positive_proba, dtype=np.float64)
+
+    # Rows are the true class, columns the predicted one: [[tn, fp], [fn, tp]]
+    actual, predicted = (y_true == POSITIVE_LABEL).astype(np.intp), (predictions == POSITIVE_LABEL).astype(np.intp)
+    tn, fp, fn, tp = (int(count) for count in np.bincount(2 * actual + predicted, minlength=4))
+
+    return ClassificationMetricArtifact(
+        f1_score=_ratio(2 * tp, 2 * tp + fp + fn),
+        precision_score=_ratio(tp, tp + fp),
+        recall_score=_ratio(tp, tp + fn),
+        accuracy_score=_ratio(tp + tn, len(y_true)),
+        roc_auc_score=roc_auc(y_true, positive_proba),
+        confusion_matrix=[[tn, fp], [fn, tp]],
+        threshold_curve=threshold_curve(y_true, positive_proba),
+    )
+
+
+def evaluate_classifier(model: Any, X: np.ndarray, y: np.ndarray) -> ClassificationMetricArtifact:
+    """
+    Scores a fitted classifier with a single predict_proba call. Predictions are taken from the same probability
+    matrix exactly as the classifier's predict does.
+    """
+    probabilities = model.predict_proba(X)
+    classes = model.classes_
+    predictions = classes.take(np.argmax(probabilities, axis=1), axis=0)
+    positive_proba = probabilities[:, list(classes).index(POSITIVE_LABEL)] if POSITIVE_LABEL in classes \
+        else np.zeros(len(probabilities))
+    return metrics_from_scores(y, predictions, positive_proba)
+
+
+def subsample(X: np.ndarray, y: np.ndarray, max_rows: Optional[int],
+              random_state: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    At most max_rows random rows of (X, y), taken in file order so memory-mapped arrays are read sequentially.
+    Small inputs are returned as they are, without a copy.
+    """
+    if max_rows is None or len(y) <= max_rows:
+        return X, y
+    rows = np.sort(np.random.default_rng(random_state).choice(len(y), size=max_rows, replace=False))
+    return X[rows], y[rows]
+
+
+def _f1_from_counts(tp: np.ndarray, fp: np.ndarray, fn: np.ndarray) -> np.ndarray:
+    denominator = 2 * tp + fp + fn
+    return np.divide(2 * tp, denominator, out=np.zeros(denominator.shape), where=denominator > 0)
+
+
+def bootstrap_f1_difference(y_true: Any, challenger_predictions: Any, champion_predictions: Any,
+                            n_resamples: int = 1000, confidence_level: float = 0.95,
+                            random_state: Optional[int] = None) -> Tuple[float, float, float]:
+    """
+    Paired bootstrap of F1(challenger) - F1(champion) on the same rows. Returns (difference, lower, upper).
+
+    Both F1 scores only depend on how many rows fall in each of the 8 (actual, challenger, champion) label cells,
+    so resampling rows with replacement is drawing those 8 counts from a multinomial. All resamples are drawn in
+    one call, so the cost does not grow with the size of the test set.
+    """
+    actual = (np.asarray(y_true) == POSITIVE_LABEL).astype(np.intp)
+    challenger = (np.asarray(challenger_predictions) == POSITIVE_LABEL).astype(np.intp)
+    champion = (np.asarray(champion_predictions) == POSITIVE_LABEL).astype(np.intp)
+    cells = np.bincount(4 * actual + 2 * challenger + champion, minlength=8)
+
+    def difference(counts: np.ndarray) -> np.ndarray:
+        # Cell index bits: 4 = actual positive, 2 = challenger predicts positive, 1 = champion predicts positive
+        c = counts.T
+        challenger_f1 = _f1_from_counts(c[6] + c[7], c[2] + c[3], c[4] + c[5])
+        champion_f1 = _f1_from_counts(c[5] + c[7], c[1] + c[3], c[4] + c[6])
+        return challenger_f1 - champion_f1
+
+    observed = float(difference(cells[None, :])[0])
+    n_rows = int(cells.sum())
+    if n_resamples <= 0 or n_rows == 0:
+        return observed, observed, observed
+
+    resampled = np.random.default_rng(random_state).multinomial(n_rows, cells / n_rows, size=n_resamples)
+    alpha = (1 - confidence_level) / 2
+    lower, upper = np.quantile(difference(resampled), [alpha, 1 - alpha])
+    return observed, float(lower), float(upper)
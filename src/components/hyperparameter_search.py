@@ -0,0 +1,169 @@
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+
+from src.exception import MyException
+from src.logger import logging
+
+
+@dataclass
+class SearchSpace:
+    """
+    The `search` section of config/model.yaml.
+    """
+    param_distributions: Dict[str, List[Any]]
+    resource: str = "n_estimators"
+    min_resources: int = 10
+    max_resources: int = 100
+    factor: int = 3
+    n_candidates: int = 27
+    cv: int = 3
+    scoring: str = "f1"
+    min_improvement: float = 0.001
+    time_budget_seconds: Optional[float] = None
+    random_state: Optional[int] = None
+    enabled: bool = True
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "SearchSpace":
+        return cls(**values)
+
+
+@dataclass
+class Trial:
+    round: int
+    candidate: int
+    params: Dict[str, Any]
+    resources: int
+    fit_times: List[float] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+
+    @property
+    def mean_score(self) -> float:
+        return float(np.mean(self.scores))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"round": self.round, "candidate": self.candidate, "params": self.params,
+                "resources": self.resources, "mean_score": round(self.mean_score, 6),
+                "scores": [round(score, 6) for score in self.scores],
+                "fit_time": round(sum(self.fit_times), 4)}
+
+
+def _fit_and_score(estimator: Any, params: Dict[str, Any], X_fit: np.ndarray, y_fit: np.ndarray,
+                   X_val: np.ndarray, y_val: np.ndarray, scorer: Any) -> Tuple[float, float]:
+    model = clone(estimator).set_params(**params)
+    started_at = time.perf_counter()
+    model.fit(X_fit, y_fit)
+    fit_time = time.perf_counter() - started_at
+    return fit_time, float(scorer(model, X_val, y_val))
+
+
+class SuccessiveHalvingSearch:
+    """
+    Budgeted successive halving: every candidate is scored with a small resource (e.g. few trees); only the best
+    1/factor go on to the next round with factor times the resource. All (candidate, fold) fits of a round run in
+    parallel across n_jobs cores. The search stops early once the best score stops improving by min_improvement,
+    or when the time budget is spent.
+
+    When a sampler is given, X and y are the rows before resampling and only each training fold is resampled,
+    so validation folds never hold synthetic rows interpolated from themselves. The resource is only the
+    evaluation budget: best_params_ is the best-scoring candidate of any round, with the
+    resource set to max_resources for the final fit, however early the search stopped.
+    """
+
+    def __init__(self, estimator: Any, search_space: SearchSpace, n_jobs: Optional[int] = None,
+                 sampler: Optional[Any] = None):
+        """
+        :param sampler: ResamplingStrategy applied to each training fold (see src/components/resampling.py)
+        """
+        self.estimator = estimator
+        self.search_space = search_space
+        self.n_jobs = n_jobs
+        self.sampler = sampler
+        self.trials: List[Trial] = []
+        self.best_trial_: Optional[Trial] = None
+        self.best_params_: Optional[Dict[str, Any]] = None
+        self.best_score_: Optional[float] = None
+        self.stop_reason_: Optional[str] = None
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "SuccessiveHalvingSearch":
+        try:
+            space = self.search_space
+            candidates = [dict(params) for params in ParameterSampler(space.param_distributions, space.n_candidates,
+                                                                      random_state=space.random_state)]
+            folds = []
+            for train_index, test_index in StratifiedKFold(n_splits=space.cv, shuffle=True,
+                                                           random_state=space.random_state).split(np.zeros(len(y)), y):
+                X_fit, y_fit = X[train_index], y[train_index]
+                # Resampled once per fold and shared by every candidate and round
+                if self.sampler is not None:
+                    X_fit, y_fit, _ = self.sampler.resample(X_fit, y_fit)
+                folds.append((X_fit, y_fit, X[test_index], y[test_index]))
+            scorer = get_scorer(space.scoring)
+            n_rounds = max(1, math.ceil(math.log(len(candidates), space.factor)) + 1) if len(candidates) > 1 else 1
+            started_at = time.perf_counter()
+            survivors = list(range(len(candidates)))
+            previous_best = -np.inf
+            self.trials = []
+            self.best_trial_ = None
+
+            for round_index in range(n_rounds):
+                resources = min(space.max_resources, space.min_resources * space.factor ** round_index)
+                if round_index == n_rounds - 1:
+                    resources = space.max_resources
+                round_trials = [Trial(round_index, candidate, candidates[candidate], resources)
+                                for candidate in survivors]
+
+                # Threads: forest fitting releases the GIL, and the (possibly memory-mapped) arrays are shared
+                results = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                    delayed(_fit_and_score)(self.estimator, {**trial.params, space.resource: resources},
+                                            *fold, scorer)
+                    for trial in round_trials for fold in folds)
+                for position, (fit_time, score) in enumerate(results):
+                    trial = round_trials[position // len(folds)]
+                    trial.fit_times.append(fit_time)
+                    trial.scores.append(score)
+                self.trials.extend(round_trials)
+
+                round_trials.sort(key=lambda trial: trial.mean_score, reverse=True)
+                best = round_trials[0]
+                logging.info(f"Search round {round_index}: {len(round_trials)} candidates with "
+                             f"{space.resource}={resources}, best {space.scoring}={best.mean_score:.4f}")
+                if self.best_trial_ is None or best.mean_score > self.best_trial_.mean_score:
+                    self.best_trial_ = best
+
+                if len(round_trials) == 1 or resources >= space.max_resources:
+                    self.stop_reason_ = "completed"
+                    break
+                if round_index > 0 and best.mean_score - previous_best < space.min_improvement:
+                    self.stop_reason_ = f"no improvement of at least {space.min_improvement}"
+                    break
+                if space.time_budget_seconds is not None and time.perf_counter() - started_at > space.time_budget_seconds:
+                    self.stop_reason_ = f"time budget of {space.time_budget_seconds}s spent"
+                    break
+                previous_best = best.mean_score
+                survivors = [trial.candidate for trial in round_trials[:max(1, len(round_trials) // space.factor)]]
+
+            self.best_params_ = {**self.best_trial_.params, space.resource: space.max_resources}
+            self.best_score_ = self.best_trial_.mean_score
+            logging.info(f"Search finished ({self.stop_reason_}) after {len(self.trials)} trials: "
+                         f"best {space.scoring}={self.best_score_:.4f} with {self.best_params_}")
+            return self
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def trial_report(self) -> Dict[str, Any]:
+        return {"scoring": self.search_space.scoring, "stop_reason": self.stop_reason_,
+                "best_params": self.best_params_,
+                "best_round": None if self.best_trial_ is None else self.best_trial_.round,
+                "best_resources": None if self.best_trial_ is None else self.best_trial_.resources,
+                "best_score": None if self.best_score_ is None else round(self.best_score_, 6),
+                "trials": [trial.to_dict() for trial in self.trials]}
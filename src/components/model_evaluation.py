@@ -1,16 +1,21 @@
 import sys
+import numpy as np
 import pandas as pd
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from dataclasses import dataclass
-from sklearn.metrics import f1_score
 
 from src.entity.config_entity import ModelEvaluationConfig
-from src.entity.artifact_entity import ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact
+from src.entity.artifact_entity import (ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact,
+                                       ProductionModelArtifact)
+from src.entity.estimator import MyModel
 from src.exception import MyException
 from src.constants import TARGET_COLUMN
 from src.logger import logging
 from src.utils.main_utils import load_object
 from src.entity.s3_estimator import Proj1Estimator
+from src.data_access.table_storage import get_schema_dtypes, read_table
+from src.components.evaluation_engine import bootstrap_f1_difference, metrics_from_scores
 
 @dataclass
 class EvaluateModelResponse:
@@ -18,16 +23,43 @@ class EvaluateModelResponse:
     best_model_f1_score: float
     is_model_accepted: bool
     difference: float
+    difference_lower: Optional[float] = None
+    difference_upper: Optional[float] = None
 
 
 class ModelEvaluation:
     def __init__(self, model_eval_config: ModelEvaluationConfig, 
                  data_ingestion_artifact: DataIngestionArtifact,
-                 model_trainer_artifact: ModelTrainerArtifact):
+                 model_trainer_artifact: ModelTrainerArtifact,
+                 production_model_artifact: Optional[ProductionModelArtifact] = None):
+        """
+        :param production_model_artifact: production model fetched ahead of time by fetch_production_model;
+                                          when omitted it is fetched from S3 during evaluation
+        """
         try:
             self.model_eval_config = model_eval_config
             self.data_ingestion_artifact = data_ingestion_artifact
             self.model_trainer_artifact = model_trainer_artifact
+            self.production_model_artifact = production_model_artifact
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def fetch_production_model(model_eval_config: ModelEvaluationConfig) -> ProductionModelArtifact:
+        """
+        Description: This method checks for a production model in S3 and downloads it if present, so it can
+                     run while the new model is still being trained
+
+        Output: It returns the production model artifact.
+        """
+        try:
+            model_path = model_eval_config.s3_model_key_path
+            proj1_estimator = Proj1Estimator(bucket_name=model_eval_config.bucket_name, model_path=model_path)
+            if not proj1_estimator.is_model_present(model_path=model_path):
+                return ProductionModelArtifact(s3_model_path=model_path, is_model_present=False)
+
+            proj1_estimator.loaded_model = proj1_estimator.load_model()
+            return ProductionModelArtifact(s3_model_path=model_path, is_model_present=True, estimator=proj1_estimator)
         except Exception as e:
             raise MyException(e, sys) from e
 
@@ -38,6 +70,9 @@ class ModelEvaluation:
         Output: It returns the model estimator.  
         """
         try:
+            if self.production_model_artifact is not None:
+                return self.production_model_artifact.estimator
+
             bucket_name = self.model_eval_config.bucket_name
             model_path = self.model_eval_config.s3_model_key_path
             proj1_estimator = Proj1Estimator(bucket_name=bucket_name, model_path=model_path)
@@ -48,44 +83,98 @@ class ModelEvaluation:
         except Exception as e:
             raise MyException(e, sys)
 
+    def load_test_data(self) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Description: This method parses the raw test data once; both models are scored on the same frame
+
+        Output: It returns the test features and target.
+        """
+        try:
+            logging.info("Loading raw test data for evaluation")
+            test_df = self.data_ingestion_artifact.test_df
+            if test_df is None:
+                test_df = read_table(self.data_ingestion_artifact.test_file_path, columns=list(get_schema_dtypes()))
+            return test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_trained_model(self) -> MyModel:
+        try:
+            trained_model = self.model_trainer_artifact.trained_model
+            if trained_model is None:
+                trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
+            return trained_model
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def score_best_model(best_model: Proj1Estimator, x: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Description: This method downloads the production model unless it was prefetched, and scores it
+
+        Output: It returns the production model's predictions and positive-class probabilities.
+        """
+        try:
+            if best_model.loaded_model is None:
+                best_model.loaded_model = best_model.load_model()
+            return best_model.loaded_model.predict_with_proba(x)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def evaluate_model(self) -> EvaluateModelResponse:
         """
         Description: This method compares the retrieved model from S3 bucket with the currently trained model.
+                     Both are scored on one parse of the test data, concurrently, and the new model is accepted
+                     only when the lower bound of the bootstrap interval on its F1 gain clears the threshold.
 
         Output: This method returns the performing model's and the degraded model's metrics & their comparison.
         """
         try:
-            
-            logging.info("Loading raw test data for evaluation")
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
-            x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
-
-            logging.info("Loading the newly trained model from artifacts")
-            trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
-            
-            y_hat_trained_model = trained_model.predict(x)
-            trained_model_f1_score = f1_score(y, y_hat_trained_model)
-            
-            best_model_f1_score = 0.0
+            config = self.model_eval_config
             best_model = self.get_best_model()
-            
-            if best_model is not None:
-                logging.info("Production model found. Computing F1 score for comparison...")
-                y_hat_best_model = best_model.predict(x)
-                best_model_f1_score = f1_score(y, y_hat_best_model)
-            else:
-                logging.info("No model found in S3. New model will be accepted by default.")
 
-            difference = trained_model_f1_score - best_model_f1_score
-            is_model_accepted = difference > self.model_eval_config.changed_threshold_score
+            if best_model is None:
+                logging.info("No model found in S3. New model will be accepted by default.")
+                # The trainer already scored the new model on the same test split; reuse it instead of predicting
+                trained_metrics = self.model_trainer_artifact.metric_artifact
+                if trained_metrics is None:
+                    x, y = self.load_test_data()
+                    trained_metrics = metrics_from_scores(y, *self.get_trained_model().predict_with_proba(x))
+                difference = trained_metrics.f1_score
+                return EvaluateModelResponse(
+                    trained_model_f1_score=trained_metrics.f1_score,
+                    best_model_f1_score=0.0,
+                    is_model_accepted=difference > config.changed_threshold_score,
+                    difference=difference
+                )
+
+            logging.info("Production model found. Scoring both models for comparison...")
+            x, y = self.load_test_data()
+            # The production model is downloaded (when it was not prefetched) and scored on another thread
+            # while the new model is scored here
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                best_future = executor.submit(self.score_best_model, best_model, x)
+                trained_predictions, trained_proba = self.get_trained_model().predict_with_proba(x)
+                best_predictions, best_proba = best_future.result()
+
+            trained_model_f1_score = metrics_from_scores(y, trained_predictions, trained_proba).f1_score
+            best_model_f1_score = metrics_from_scores(y, best_predictions, best_proba).f1_score
+            difference, lower, upper = bootstrap_f1_difference(
+                y, trained_predictions, best_predictions, n_resamples=config.bootstrap_resamples,
+                confidence_level=config.confidence_level, random_state=config.random_state)
+            is_model_accepted = lower > config.changed_threshold_score
+
+            logging.info(f"New Model F1: {trained_model_f1_score}, Best Model F1: {best_model_f1_score}, "
+                         f"difference {difference:.4f} with {config.confidence_level:.0%} interval "
+                         f"[{lower:.4f}, {upper:.4f}]")
 
-            logging.info(f"New Model F1: {trained_model_f1_score}, Best Model F1: {best_model_f1_score}")
-            
             return EvaluateModelResponse(
                 trained_model_f1_score=trained_model_f1_score,
                 best_model_f1_score=best_model_f1_score,
                 is_model_accepted=is_model_accepted,
-                difference=difference
+                difference=difference,
+                difference_lower=lower,
+                difference_upper=upper
             )
 
         except Exception as e:
@@ -105,7 +194,9 @@ class ModelEvaluation:
                 is_model_accepted=evaluate_model_response.is_model_accepted,
                 s3_model_path=self.model_eval_config.s3_model_key_path,
                 trained_model_path=self.model_trainer_artifact.trained_model_file_path,
-                changed_accuracy=evaluate_model_response.difference
+                changed_accuracy=evaluate_model_response.difference,
+                changed_accuracy_lower=evaluate_model_response.difference_lower,
+                changed_accuracy_upper=evaluate_model_response.difference_upper
             )
 
             logging.info(f"Evaluation complete. Model accepted: {model_evaluation_artifact.is_model_accepted}")
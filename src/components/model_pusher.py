@@ -36,12 +36,13 @@ class ModelPusher:
             if self.model_evaluation_artifact.is_model_accepted:
                 logging.info("Model evaluation passed. Proceeding to upload model to S3.")
                 
-                # Uploading the model file to S3
-                self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
+                # Registering the model file as a new version in the S3 model registry
+                version = self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
                 
                 model_pusher_artifact = ModelPusherArtifact(
                     bucket_name=self.model_pusher_config.bucket_name,
-                    s3_model_path=self.model_pusher_config.s3_model_key_path
+                    s3_model_path=self.proj1_estimator.registry.version_key(version),
+                    model_version=version
                 )
                 
                 logging.info(f"Model successfully pushed to S3: {model_pusher_artifact}")
@@ -1,63 +1,112 @@
 import sys
-from typing import Tuple, Any
+from typing import Tuple, Any, Optional
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import load_numpy_array_data, load_object, save_object
+from src.utils.main_utils import load_numpy_array_data, load_object, read_yaml_file, save_object, write_yaml_file
 from src.entity.config_entity import ModelTrainerConfig
-from src.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
+from src.entity.artifact_entity import (DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact,
+                                        DataDriftArtifact)
 from src.entity.estimator import MyModel
+from src.utils.artifact_writer import ArtifactWriter, write_artifact
+from src.components.hyperparameter_search import SearchSpace, SuccessiveHalvingSearch
+from src.components.resampling import get_resampling_strategy
+from src.components.evaluation_engine import evaluate_classifier, subsample
 
 class ModelTrainer:
     def __init__(self, data_transformation_artifact: DataTransformationArtifact,
-                 model_trainer_config: ModelTrainerConfig):
+                 model_trainer_config: ModelTrainerConfig, artifact_writer: Optional[ArtifactWriter] = None,
+                 data_drift_artifact: Optional[DataDriftArtifact] = None):
+        """
+        :param data_drift_artifact: when given, its training-data sketches are stored with the model
+        """
         self.data_transformation_artifact = data_transformation_artifact
         self.model_trainer_config = model_trainer_config
+        self.artifact_writer = artifact_writer
+        self.data_drift_artifact = data_drift_artifact
+
+    def get_base_params(self, model_config: dict) -> dict:
+        """
+        Forest parameters from the `model` section of config/model.yaml, falling back to the constants.
+        """
+        params = {
+            "n_estimators": self.model_trainer_config._n_estimators,
+            "min_samples_split": self.model_trainer_config._min_samples_split,
+            "min_samples_leaf": self.model_trainer_config._min_samples_leaf,
+            "max_depth": self.model_trainer_config._max_depth,
+            "criterion": self.model_trainer_config._criterion,
+            "random_state": self.model_trainer_config._random_state,
+        }
+        params.update((model_config.get("model") or {}).get("params") or {})
+        return params
 
-    def get_model_object_and_report(self, train: np.array, test: np.array) -> Tuple[Any, ClassificationMetricArtifact]:
+    def search_params(self, x_train: np.ndarray, y_train: np.ndarray, base_params: dict, model_config: dict) -> dict:
+        """
+        Runs the successive-halving search from the `search` section of config/model.yaml, if enabled, and
+        records every trial's fit time and score. Returns the parameters to train the final model with.
+        """
+        search_config = model_config.get("search")
+        if not search_config or not search_config.get("enabled", True):
+            return base_params
+
+        search_space = SearchSpace.from_dict(search_config)
+        # Cross-validating on resampled rows would score folds on synthetic points made from their own rows;
+        # the search folds over the rows before resampling and resamples each training fold instead
+        artifact, sampler = self.data_transformation_artifact, None
+        if artifact.resampling_strategy is not None:
+            x_train, y_train = artifact.unresampled_train_features, artifact.unresampled_train_target
+            if x_train is None:
+                x_train = load_numpy_array_data(artifact.unresampled_train_file_path,
+                                                mmap_mode=self.model_trainer_config.mmap_mode)
+                y_train = load_numpy_array_data(artifact.unresampled_train_target_file_path,
+                                                mmap_mode=self.model_trainer_config.mmap_mode)
+            sampler = get_resampling_strategy(artifact.resampling_strategy, n_jobs=self.model_trainer_config.n_jobs,
+                                              random_state=search_space.random_state)
+
+        estimator = RandomForestClassifier(**base_params, class_weight=artifact.class_weight)
+        search = SuccessiveHalvingSearch(estimator, search_space, n_jobs=self.model_trainer_config.n_jobs,
+                                         sampler=sampler).fit(x_train, y_train)
+        write_artifact(self.artifact_writer, write_yaml_file, self.model_trainer_config.trial_log_file_path,
+                       search.trial_report())
+        return {**base_params, **search.best_params_}
+
+    def get_model_object_and_report(self, x_train: np.ndarray, y_train: np.ndarray, x_test: np.ndarray,
+                                    y_test: np.ndarray) -> Tuple[Any, ClassificationMetricArtifact]:
         """
         Trains the model and returns the model object along with a detailed metric report.
         """
         try:
-            logging.info("Splitting features and target for train and test sets")
-            x_train, y_train, x_test, y_test = train[:, :-1], train[:, -1], test[:, :-1], test[:, -1]
-
+            model_config = read_yaml_file(self.model_trainer_config.model_config_file_path) or {}
+            params = self.search_params(x_train, y_train, self.get_base_params(model_config), model_config)
             model = RandomForestClassifier(
-                n_estimators=self.model_trainer_config._n_estimators,
-                min_samples_split=self.model_trainer_config._min_samples_split,
-                min_samples_leaf=self.model_trainer_config._min_samples_leaf,
-                max_depth=self.model_trainer_config._max_depth,
-                criterion=self.model_trainer_config._criterion,
-                random_state=self.model_trainer_config._random_state
+                **params,
+                n_jobs=self.model_trainer_config.n_jobs,
+                class_weight=self.data_transformation_artifact.class_weight
             )
 
-            logging.info("Fitting the RandomForest model...")
+            logging.info(f"Fitting the RandomForest model with {params}...")
             model.fit(x_train, y_train)
 
-            # Performance on Test Data
-            y_test_pred = model.predict(x_test)
-            test_acc = accuracy_score(y_test, y_test_pred)
-            
-            # Performance on Train Data (to check for overfitting)
-            y_train_pred = model.predict(x_train)
-            train_acc = accuracy_score(y_train, y_train_pred)
+            # Performance on Test Data: one predict_proba pass yields every metric
+            metric_artifact = evaluate_classifier(model, x_test, y_test)
+            test_acc = metric_artifact.accuracy_score
+
+            # Performance on a bounded sample of the Train Data (to check for overfitting)
+            x_sample, y_sample = subsample(x_train, y_train, self.model_trainer_config.train_score_max_rows,
+                                           random_state=params.get("random_state"))
+            train_acc = evaluate_classifier(model, x_sample, y_sample).accuracy_score
 
-            logging.info(f"Model trained. Train Accuracy: {train_acc:.4f}, Test Accuracy: {test_acc:.4f}")
+            logging.info(f"Model trained. Train Accuracy: {train_acc:.4f} (on {len(y_sample)} rows), "
+                         f"Test Accuracy: {test_acc:.4f}, Test F1: {metric_artifact.f1_score:.4f}, "
+                         f"Test ROC-AUC: {metric_artifact.roc_auc_score}")
 
             # Check for Overfitting (threshold can be added to config)
             if abs(train_acc - test_acc) > 0.15: # 15% threshold
                 logging.warning("Warning: Model might be overfitted. Difference between train and test accuracy is high.")
 
-            metric_artifact = ClassificationMetricArtifact(
-                f1_score=f1_score(y_test, y_test_pred),
-                precision_score=precision_score(y_test, y_test_pred),
-                recall_score=recall_score(y_test, y_test_pred)
-            )
-
             return model, metric_artifact, test_acc
         
         except Exception as e:
@@ -67,15 +116,25 @@ class ModelTrainer:
         try:
             logging.info("Starting Model Trainer Component")
             
-            # Load data
-            train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_train_file_path)
-            test_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_test_file_path)
-            
+            # Load data: features are stored as C-contiguous float32, the layout the forest asks for, and targets
+            # separately, so memory-mapped files are fed to sklearn without any copy
+            artifact = self.data_transformation_artifact
+            arrays = []
+            for in_memory, file_path in ((artifact.train_features, artifact.transformed_train_file_path),
+                                         (artifact.train_target, artifact.transformed_train_target_file_path),
+                                         (artifact.test_features, artifact.transformed_test_file_path),
+                                         (artifact.test_target, artifact.transformed_test_target_file_path)):
+                if in_memory is None:
+                    in_memory = load_numpy_array_data(file_path=file_path, mmap_mode=self.model_trainer_config.mmap_mode)
+                arrays.append(in_memory)
+
             # Train and evaluate
-            trained_model, metric_artifact, test_acc = self.get_model_object_and_report(train=train_arr, test=test_arr)
+            trained_model, metric_artifact, test_acc = self.get_model_object_and_report(*arrays)
             
             # Load preprocessing object
-            preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
+            preprocessing_obj = self.data_transformation_artifact.preprocessing_object
+            if preprocessing_obj is None:
+                preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
 
             # Threshold Check
             if test_acc < self.model_trainer_config.expected_accuracy:
@@ -85,13 +144,20 @@ class ModelTrainer:
 
             # Final Wrapper
             logging.info("Wrapping model and preprocessor into MyModel object")
-            my_model = MyModel(preprocessing_object=preprocessing_obj, trained_model_object=trained_model)
+            feature_sketches = None
+            if self.data_drift_artifact is not None:
+                feature_sketches = self.data_drift_artifact.sketches
+                if feature_sketches is None:
+                    feature_sketches = read_yaml_file(self.data_drift_artifact.sketch_file_path)
+            my_model = MyModel(preprocessing_object=preprocessing_obj, trained_model_object=trained_model,
+                               feature_sketches=feature_sketches)
             
-            save_object(self.model_trainer_config.trained_model_file_path, my_model)
+            write_artifact(self.artifact_writer, save_object, self.model_trainer_config.trained_model_file_path, my_model)
 
             return ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 metric_artifact=metric_artifact,
+                trained_model=my_model if self.artifact_writer is not None else None,
             )
         
         except Exception as e:
@@ -0,0 +1,143 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+from imblearn.combine import SMOTEENN
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils.class_weight import compute_class_weight
+
+from src.exception import MyException
+from src.logger import logging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# SMOTE's default k_neighbors=5, plus the sample itself
+SMOTE_NEIGHBORS = 6
+
+
+class ResamplingStrategy(ABC):
+    """
+    Rebalances the transformed training set. resample() returns the features, the target and the class
+    weights the model should be trained with (None when the data itself has been rebalanced).
+    """
+    name = ""
+
+    def __init__(self, n_jobs: Optional[int] = None, random_state: Optional[int] = None):
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    @abstractmethod
+    def resample(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[Dict[int, float]]]:
+        ...
+
+    def _smote(self, sampling_strategy: str) -> SMOTE:
+        return SMOTE(sampling_strategy=sampling_strategy, random_state=self.random_state,
+                     k_neighbors=NearestNeighbors(n_neighbors=SMOTE_NEIGHBORS, n_jobs=self.n_jobs))
+
+
+class SmoteEnnStrategy(ResamplingStrategy):
+    """
+    SMOTE oversampling of the minority class followed by Edited Nearest Neighbours cleaning. Most accurate and
+    most expensive: two kNN passes over the whole training matrix, parallelised over n_jobs cores.
+    """
+    name = "smoteenn"
+
+    def resample(self, X, y):
+        sampler = SMOTEENN(sampling_strategy="minority", random_state=self.random_state,
+                           smote=self._smote("minority"), n_jobs=self.n_jobs)
+        X_resampled, y_resampled = sampler.fit_resample(X, y)
+        return X_resampled, y_resampled, None
+
+
+class SmoteStrategy(ResamplingStrategy):
+    """
+    SMOTE oversampling of the minority class only; skips the ENN cleaning pass.
+    """
+    name = "smote"
+
+    def resample(self, X, y):
+        X_resampled, y_resampled = self._smote("minority").fit_resample(X, y)
+        return X_resampled, y_resampled, None
+
+
+class RandomUnderSampleStrategy(ResamplingStrategy):
+    """
+    Drops majority-class rows at random. Cheapest option, and the training set shrinks instead of growing.
+    """
+    name = "undersample"
+
+    def resample(self, X, y):
+        X_resampled, y_resampled = RandomUnderSampler(random_state=self.random_state).fit_resample(X, y)
+        return X_resampled, y_resampled, None
+
+
+class ClassWeightStrategy(ResamplingStrategy):
+    """
+    Leaves the data untouched and returns balanced class weights for the model instead.
+    """
+    name = "class_weight"
+
+    def resample(self, X, y):
+        classes = np.unique(y)
+        weights = compute_class_weight("balanced", classes=classes, y=y)
+        # Plain Python types: the weights end up in the stage cache's YAML entries
+        return X, y, {int(label): float(weight) for label, weight in zip(classes, weights)}
+
+
+RESAMPLING_STRATEGIES: Dict[str, Type[ResamplingStrategy]] = {
+    strategy.name: strategy
+    for strategy in (SmoteEnnStrategy, SmoteStrategy, RandomUnderSampleStrategy, ClassWeightStrategy)
+}
+
+
+def get_resampling_strategy(name: str, n_jobs: Optional[int] = None,
+                            random_state: Optional[int] = None) -> ResamplingStrategy:
+    try:
+        if name not in RESAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown resampling strategy '{name}'; expected one of {sorted(RESAMPLING_STRATEGIES)}")
+        return RESAMPLING_STRATEGIES[name](n_jobs=n_jobs, random_state=random_state)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """
+    High-water mark of the process's resident memory, None where getrusage is unavailable (Windows).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def resample_with_metrics(strategy: ResamplingStrategy, X: np.ndarray,
+                          y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[Dict[int, float]]]:
+    """
+    Runs the strategy and logs its runtime and the process's peak resident memory, so strategies can be compared
+    per environment. The peak is the kernel's RSS high-water mark read before and after the call, which costs
+    nothing while the strategy runs (unlike allocation tracing). The growth of the high-water mark is the part of
+    the peak the resampling raised, such as the kNN spike of the SMOTE strategies; it is 0 when an earlier step
+    had already used more memory.
+    """
+    peak_before = _peak_rss_bytes()
+    started_at = time.perf_counter()
+    X_resampled, y_resampled, class_weight = strategy.resample(X, y)
+    elapsed = time.perf_counter() - started_at
+    peak_after = _peak_rss_bytes()
+
+    if peak_after is None:
+        memory = "peak memory unavailable"
+    else:
+        memory = (f"peak memory {peak_after / 2 ** 20:.1f} MiB "
+                  f"(+{(peak_after - peak_before) / 2 ** 20:.1f} MiB during resampling)")
+    logging.info(f"Resampling strategy '{strategy.name}' (n_jobs={strategy.n_jobs}): {len(y)} -> {len(y_resampled)} "
+                 f"rows in {elapsed:.2f}s, {memory}, class weights {class_weight}")
+    return X_resampled, y_resampled, class_weight
@@ -5,12 +5,14 @@ from sklearn.base import BaseEstimator, TransformerMixin
 class GenderMapper(BaseEstimator, TransformerMixin):
     """Maps Gender column: Female → 0, Male → 1"""
 
+    mapping = {"Female": 0, "Male": 1}
+
     def fit(self, X, y=None):
         return self
 
     def transform(self, X):
         X = X.copy()
-        X["Gender"] = X["Gender"].map({"Female": 0, "Male": 1})
+        X["Gender"] = X["Gender"].map(self.mapping)
         return X
 
 
@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _to_builtin(value: Any) -> Any:
+    # Report values go to JSON
+    if hasattr(value, "item"):
+        return value.item()
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+class ColumnCheck:
+    """
+    Running totals of every rule for one column. Each chunk is checked with a few vectorized masks,
+    so a column is visited once no matter how many rules apply to it.
+    """
+    VIOLATIONS = ("dtype", "category", "below_min", "above_max")
+
+    def __init__(self, column: str, dtype: str, allowed: Optional[List[Any]], bounds: Dict[str, float],
+                 max_null_fraction: float, sample_rows: int):
+        self.column = column
+        self.dtype = dtype
+        self.allowed = allowed
+        self.lower = bounds.get("min")
+        self.upper = bounds.get("max")
+        self.max_null_fraction = max_null_fraction
+        self.sample_rows = sample_rows
+        self.rows = 0
+        self.nulls = 0
+        self.counts = dict.fromkeys(self.VIOLATIONS, 0)
+        self.samples: Dict[str, List[Dict[str, Any]]] = {violation: [] for violation in self.VIOLATIONS}
+
+    def _record(self, violation: str, mask: np.ndarray, values: pd.Series, row_offset: int) -> None:
+        count = int(mask.sum())
+        if not count:
+            return
+        self.counts[violation] += count
+        needed = self.sample_rows - len(self.samples[violation])
+        for position in np.flatnonzero(mask)[:max(needed, 0)]:
+            self.samples[violation].append({"row": row_offset + int(position),
+                                            "value": _to_builtin(values.iloc[position])})
+
+    def update(self, values: pd.Series, row_offset: int) -> None:
+        nulls = values.isna().to_numpy()
+        self.rows += len(values)
+        self.nulls += int(nulls.sum())
+
+        if self.dtype in ("int", "float"):
+            if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+                numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                self._record("dtype", np.isnan(numeric) & ~nulls, values, row_offset)
+            valid = ~np.isnan(numeric)
+            with np.errstate(invalid="ignore"):
+                if self.dtype == "int":
+                    self._record("dtype", valid & (np.mod(numeric, 1.0) != 0), values, row_offset)
+                if self.lower is not None:
+                    self._record("below_min", valid & (numeric < self.lower), values, row_offset)
+                if self.upper is not None:
+                    self._record("above_max", valid & (numeric > self.upper), values, row_offset)
+
+        elif self.allowed is not None:
+            self._record("category", ~values.isin(self.allowed).to_numpy() & ~nulls, values, row_offset)
+
+    def result(self, dataset_name: str) -> Tuple[List[str], Dict[str, Any]]:
+        errors = []
+        null_fraction = self.nulls / self.rows if self.rows else 0.0
+        if null_fraction > self.max_null_fraction:
+            errors.append(f"{dataset_name}: Column '{self.column}' is {null_fraction:.2%} null, "
+                          f"above the {self.max_null_fraction:.2%} threshold")
+        messages = {
+            "dtype": f"values that are not valid {self.dtype}",
+            "category": f"values outside {self.allowed}",
+            "below_min": f"values below {self.lower}",
+            "above_max": f"values above {self.upper}",
+        }
+        for violation, count in self.counts.items():
+            if count:
+                errors.append(f"{dataset_name}: Column '{self.column}' has {count} {messages[violation]}")
+
+        report = {
+            "dtype": self.dtype,
+            "nulls": self.nulls,
+            "null_fraction": round(null_fraction, 6),
+            "violations": dict(self.counts),
+            "samples": {violation: rows for violation, rows in self.samples.items() if rows},
+        }
+        return errors, report
+
+
+class ValidationEngine:
+    """
+    Validates a dataset chunk by chunk against schema.yaml: declared dtypes, allowed categories,
+    numeric bounds and null thresholds. Memory use is bounded by the chunk size, and the totals
+    are identical however the data is chunked.
+    """
+
+    def __init__(self, schema: Dict[str, Any], sample_rows: int):
+        dtypes = {}
+        for column_dict in schema["columns"]:
+            dtypes.update(column_dict)
+        allowed_categories = schema.get("allowed_categories", {})
+        column_bounds = schema.get("column_bounds", {})
+        null_thresholds = schema.get("max_null_fraction", {})
+
+        self.rows = 0
+        self.checks = {
+            column: ColumnCheck(column, dtype, allowed_categories.get(column), column_bounds.get(column, {}),
+                                null_thresholds.get(column, null_thresholds.get("default", 0.0)), sample_rows)
+            for column, dtype in dtypes.items()
+        }
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for column, check in self.checks.items():
+            if column in chunk.columns:
+                check.update(chunk[column], self.rows)
+        self.rows += len(chunk)
+
+    def result(self, dataset_name: str) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Returns the error messages and a structured report with per-column counts and sample rows.
+        """
+        errors, columns = [], {}
+        for column, check in self.checks.items():
+            column_errors, columns[column] = check.result(dataset_name)
+            errors.extend(column_errors)
+        return errors, {"rows": self.rows, "columns": columns}
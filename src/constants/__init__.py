@@ -7,7 +7,16 @@ COLLECTION_NAME = "Proj1-Data"
 MONGODB_URL_KEY = "MONGODB_URL"
 
 PIPELINE_NAME: str = ""
+# Hand DataFrames/arrays between training stages in memory and persist artifacts in the background
+PIPELINE_IN_MEMORY_HANDOFF: bool = True
+PIPELINE_ARTIFACT_WRITER_WORKERS: int = 2
 ARTIFACT_DIR: str = "artifact"
+# Reuse a previous run's stage artifacts when the stage's inputs hash to the same key
+PIPELINE_STAGE_CACHE_ENABLED: bool = True
+PIPELINE_STAGE_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "stage_cache")
+# Independent stages of the pipeline DAG run concurrently on this many threads
+PIPELINE_MAX_PARALLEL_STAGES: int = 4
+PIPELINE_TRACE_FILE_NAME: str = "pipeline_trace.yaml"
 
 MODEL_FILE_NAME = "model.pkl"
 
@@ -24,6 +33,14 @@ SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 AWS_ACCESS_KEY_ID_ENV_KEY = "AWS_ACCESS_KEY_ID"
 AWS_SECRET_ACCESS_KEY_ENV_KEY = "AWS_SECRET_ACCESS_KEY"
 REGION_NAME = "us-east-1"
+# Optional S3-compatible endpoint (a local stand-in such as moto server, MinIO or LocalStack)
+AWS_S3_ENDPOINT_URL_ENV_KEY = "AWS_S3_ENDPOINT_URL"
+# Objects of at least this size move in parallel parts: ranged GETs down, multipart upload up
+S3_TRANSFER_MULTIPART_THRESHOLD: int = 16 * 1024 * 1024
+S3_TRANSFER_CHUNK_SIZE: int = 16 * 1024 * 1024
+S3_TRANSFER_MAX_CONCURRENCY: int = 8
+# HEAD results (including "no such key") are reused for this long by every SimpleStorageService in the process
+S3_METADATA_CACHE_TTL_SECONDS: float = 30
 
 
 """
@@ -34,12 +51,31 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.25
+DATA_INGESTION_EXPORT_CHUNK_SIZE: int = 50000
+DATA_INGESTION_EXPORT_MAX_WORKERS: int = 8
+DATA_INGESTION_EXPORT_PARTITION_SIZE: int = 500000
+DATA_INGESTION_EXPORT_PARTITION_KEY: str = "_id"
+DATA_INGESTION_INCREMENTAL: bool = False
+DATA_INGESTION_SNAPSHOT_DIR: str = os.path.join(ARTIFACT_DIR, "ingestion_snapshot")
+DATA_INGESTION_FILE_FORMAT: str = "parquet"
+DATA_INGESTION_EXPORT_CSV: bool = False
 
 """
 Data Validation realted contant start with DATA_VALIDATION VAR NAME
 """
 DATA_VALIDATION_DIR_NAME: str = "data_validation"
 DATA_VALIDATION_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_CHUNK_SIZE: int = 100000
+DATA_VALIDATION_SAMPLE_ROWS: int = 5
+
+"""
+Data Drift related constant start with DATA_DRIFT VAR NAME
+"""
+DATA_DRIFT_SKETCH_FILE_NAME: str = "feature_sketches.yaml"
+DATA_DRIFT_SKETCH_CAPACITY: int = 200
+DATA_DRIFT_PSI_THRESHOLD: float = 0.2
+DATA_DRIFT_KS_THRESHOLD: float = 0.1
+DATA_DRIFT_GATE_RETRAINING: bool = False
 
 """
 Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
@@ -47,6 +83,21 @@ Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_TRAIN_TARGET_FILE_NAME: str = "train_target.npy"
+DATA_TRANSFORMATION_TEST_TARGET_FILE_NAME: str = "test_target.npy"
+# Training arrays before resampling, kept when the strategy changes rows so the search resamples inside its folds
+DATA_TRANSFORMATION_UNRESAMPLED_TRAIN_FILE_NAME: str = "train_unresampled.npy"
+DATA_TRANSFORMATION_UNRESAMPLED_TRAIN_TARGET_FILE_NAME: str = "train_unresampled_target.npy"
+# float32 is what the forest trains and predicts on internally; 0/1 features are exact in it
+DATA_TRANSFORMATION_FEATURE_DTYPE: str = "float32"
+DATA_TRANSFORMATION_TARGET_DTYPE: str = "int8"
+# One of "smoteenn", "smote", "undersample" or "class_weight" (see src/components/resampling.py)
+DATA_TRANSFORMATION_RESAMPLING_STRATEGY: str = "smoteenn"
+DATA_TRANSFORMATION_RESAMPLING_N_JOBS: int = -1
+DATA_TRANSFORMATION_RESAMPLING_RANDOM_STATE: int = 42
+# Out-of-core mode: fit from incremental statistics and stream chunks into memory-mapped arrays
+DATA_TRANSFORMATION_CHUNKED: bool = False
+DATA_TRANSFORMATION_CHUNK_SIZE: int = 100000
 
 """
 MODEL TRAINER related constant start with MODEL_TRAINER var name
@@ -56,6 +107,13 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
+# Transformed arrays are memory-mapped read-only and fed to the forest without copying; None reads them into memory
+MODEL_TRAINER_MMAP_MODE: str = "r"
+MODEL_TRAINER_N_JOBS: int = -1
+MODEL_TRAINER_TRIAL_LOG_FILE_NAME: str = "search_trials.yaml"
+# The train set is only scored to check for overfitting, so a random subsample of this size is enough
+MODEL_TRAINER_TRAIN_SCORE_MAX_ROWS: int = 50000
+# Defaults for parameters config/model.yaml does not set
 MODEL_TRAINER_N_ESTIMATORS=20
 MODEL_TRAINER_MIN_SAMPLES_SPLIT: int = 7
 MODEL_TRAINER_MIN_SAMPLES_LEAF: int = 6
@@ -67,9 +125,39 @@ MIN_SAMPLES_SPLIT_RANDOM_STATE: int = 101
 MODEL Evaluation related constants
 """
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
+# The new model is accepted when the lower bound of this bootstrap interval on its F1 gain clears the threshold
+MODEL_EVALUATION_BOOTSTRAP_RESAMPLES: int = 2000
+MODEL_EVALUATION_CONFIDENCE_LEVEL: float = 0.95
+MODEL_EVALUATION_RANDOM_STATE: int = 42
 MODEL_BUCKET_NAME = "my-model-ml-project"
 MODEL_PUSHER_S3_KEY = "model-registry"
+# Models are pushed to immutable <prefix>/versions/<version>/model.pkl keys; the manifest points at the champion
+MODEL_REGISTRY_MANIFEST_NAME: str = "manifest.json"
+# Downloaded model files, named by their SHA-256, so a version already on disk is never fetched again
+MODEL_REGISTRY_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "model_registry_cache")
 
 
 APP_HOST = "0.0.0.0"
-APP_PORT = 5000
\ No newline at end of file
+APP_PORT = 5000
+
+"""
+Prediction serving related constants
+"""
+MODEL_CACHE_REFRESH_INTERVAL_SECONDS: int = 60
+PREDICTION_BATCH_MAX_ROWS: int = 100000
+PREDICTION_BATCH_MAX_ERROR_ROWS: int = 20
+PREDICTION_MICRO_BATCH_MAX_SIZE: int = 64
+PREDICTION_MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+PREDICTION_THREAD_POOL_WORKERS: int = 4
+
+"""
+Training job related constants
+"""
+TRAINING_JOB_MAX_WORKERS: int = 1
+
+"""
+Prediction / compiled forest related constants
+"""
+PREDICTION_USE_COMPILED_FOREST: bool = True
+COMPILED_FOREST_CHUNK_SIZE: int = 4096
+COMPILED_FOREST_MAX_BATCH_ROWS: int = 2048
@@ -0,0 +1,105 @@
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from bson import ObjectId
+
+from src.data_access.proj1_data import Proj1Data
+from src.data_access.table_storage import read_table, write_table
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+
+
+class IngestionSnapshot:
+    """
+    Local columnar copy of everything ingested so far, plus the high-water mark it was taken up to.
+
+    The snapshot is a directory of Parquet part files, one per ingestion run, and a `watermark.yaml`
+    manifest that records the watermark and the parts that belong to it. A part only becomes visible
+    once the manifest naming it has been replaced, so an interrupted run leaves the previous snapshot intact.
+    """
+    MANIFEST_FILE_NAME = "watermark.yaml"
+
+    def __init__(self, snapshot_dir: str, partition_key: str):
+        self.snapshot_dir = snapshot_dir
+        self.partition_key = partition_key
+        self.manifest_file_path = os.path.join(snapshot_dir, self.MANIFEST_FILE_NAME)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_file_path):
+            return {}
+        manifest = read_yaml_file(self.manifest_file_path)
+        if manifest.get("partition_key") != self.partition_key:
+            logging.warning(f"Ignoring snapshot taken on '{manifest.get('partition_key')}', "
+                            f"ingestion now partitions on '{self.partition_key}'")
+            return {}
+        return manifest
+
+    @staticmethod
+    def _encode(value: Any) -> Dict[str, Any]:
+        if isinstance(value, ObjectId):
+            return {"type": "ObjectId", "value": str(value)}
+        if hasattr(value, "item"):
+            value = value.item()
+        return {"type": type(value).__name__, "value": value}
+
+    @staticmethod
+    def _decode(encoded: Dict[str, Any]) -> Any:
+        if encoded["type"] == "ObjectId":
+            return ObjectId(encoded["value"])
+        return encoded["value"]
+
+    @property
+    def watermark(self) -> Optional[Any]:
+        """
+        Largest partition key already ingested, or None when there is no snapshot yet.
+        """
+        try:
+            manifest = self._read_manifest()
+            return self._decode(manifest["watermark"]) if manifest else None
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @property
+    def parts(self) -> List[str]:
+        return self._read_manifest().get("parts", [])
+
+    def read(self) -> pd.DataFrame:
+        """
+        Loads every committed part in ingestion order.
+        """
+        try:
+            chunks = [read_table(os.path.join(self.snapshot_dir, part)) for part in self.parts]
+            return Proj1Data.concat_chunks(chunks)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def append(self, dataframe: pd.DataFrame, watermark: Any) -> None:
+        """
+        Writes `dataframe` as a new part and advances the watermark to `watermark`.
+        """
+        try:
+            manifest = self._read_manifest()
+            parts = list(manifest.get("parts", []))
+
+            if len(dataframe):
+                part = f"part-{len(parts):05d}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}.parquet"
+                write_table(dataframe, os.path.join(self.snapshot_dir, part))
+                parts.append(part)
+
+            tmp_manifest_file_path = self.manifest_file_path + ".tmp"
+            write_yaml_file(tmp_manifest_file_path, {
+                "partition_key": self.partition_key,
+                "watermark": self._encode(watermark),
+                "parts": parts,
+                "row_count": int(manifest.get("row_count", 0)) + len(dataframe),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            })
+            os.replace(tmp_manifest_file_path, self.manifest_file_path)
+            logging.info(f"Appended {len(dataframe)} rows to ingestion snapshot, watermark is now {watermark}")
+
+        except Exception as e:
+            raise MyException(e, sys) from e
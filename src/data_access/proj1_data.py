@@ -1,12 +1,18 @@
 import sys
 import pandas as pd
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pandas.api.types import union_categoricals
 
 from src.configuration.mongo_db_connection import MongoDBClient
-from src.constants import DATABASE_NAME
+from src.constants import (DATABASE_NAME, DATA_INGESTION_EXPORT_CHUNK_SIZE,
+                           DATA_INGESTION_EXPORT_MAX_WORKERS, DATA_INGESTION_EXPORT_PARTITION_SIZE,
+                           DATA_INGESTION_EXPORT_PARTITION_KEY)
 from src.exception import MyException
 from src.logger.logger import logging  # Using your configured logger
+from src.data_access.table_storage import get_schema_dtypes
 
 class Proj1Data:
     """
@@ -25,11 +31,68 @@ class Proj1Data:
             logging.error("Failed to initialize MongoDB connection in Proj1Data", exc_info=True)
             raise MyException(e, sys)
 
-    def export_collection_as_dataframe(
-        self, collection_name: str, database_name: Optional[str] = None
-    ) -> pd.DataFrame:
+    def _get_collection(self, collection_name: str, database_name: Optional[str] = None):
+        # Use specified database or default database
+        db_to_use = (
+            MongoDBClient.get_database()
+            if database_name is None
+            else MongoDBClient.connect(database_name=database_name)
+        )
+        logging.info(f"Fetching collection '{collection_name}' from database '{db_to_use.name}'...")
+        return db_to_use[collection_name]
+
+    @staticmethod
+    def get_schema_dtypes() -> Dict[str, str]:
         """
-        Exports an entire MongoDB collection as a pandas DataFrame.
+        Returns the column -> dtype mapping declared under `columns` in schema.yaml.
+        """
+        return get_schema_dtypes()
+
+    @staticmethod
+    def documents_to_dataframe(documents: List[Dict[str, Any]], dtypes: Dict[str, str]) -> pd.DataFrame:
+        """
+        Converts a batch of documents straight into typed columns.
+
+        Schema columns always come first and in schema order, so every chunk has the same layout.
+        'na' strings become NaN; int columns stay int64 unless the chunk has missing values (then float64).
+        """
+        columns = list(dtypes)
+        for document in documents:
+            for key in document:
+                if key not in dtypes and key not in columns:
+                    columns.append(key)
+
+        data = {}
+        for column in columns:
+            values = pd.Series([document.get(column) for document in documents], dtype=object)
+            values = values.mask(values == "na")
+            dtype = dtypes.get(column)
+
+            if dtype in ("int", "float"):
+                numeric = pd.to_numeric(values, errors="coerce")
+                coerced = int(numeric.isna().sum() - values.isna().sum())
+                if coerced:
+                    logging.warning(f"{coerced} non-numeric values in column '{column}' were replaced with NaN")
+                if dtype == "float" or numeric.isna().any():
+                    numeric = numeric.astype(np.float64)
+                data[column] = numeric
+            elif dtype == "category":
+                data[column] = values.astype("category")
+            else:
+                data[column] = values.infer_objects()
+
+        return pd.DataFrame(data)
+
+    def iter_collection_chunks(
+        self, collection_name: str, database_name: Optional[str] = None,
+        chunk_size: int = DATA_INGESTION_EXPORT_CHUNK_SIZE, query: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a MongoDB collection as typed DataFrame chunks of at most `chunk_size` rows.
+
+        '_id' is excluded by a server-side projection and the cursor is read in `chunk_size` batches,
+        so only one chunk of documents is held in memory at a time.
 
         Parameters:
         ----------
@@ -37,38 +100,205 @@ class Proj1Data:
             The name of the MongoDB collection to export.
         database_name : Optional[str]
             Name of the database (optional). Defaults to self.database_name.
+        chunk_size : int
+            Number of documents per chunk.
+        query : Optional[Dict[str, Any]]
+            Optional filter passed to find().
+        sort : Optional[List[Tuple[str, int]]]
+            Optional sort specification passed to find().
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            dtypes = self.get_schema_dtypes()
+            cursor = collection.find(query or {}, projection={"_id": 0}, batch_size=chunk_size, sort=sort)
 
-        Returns:
-        -------
-        pd.DataFrame
-            DataFrame containing the collection data, with '_id' column removed and 'na' values replaced with NaN.
+            n_rows = 0
+            while True:
+                documents = list(islice(cursor, chunk_size))
+                if not documents:
+                    break
+                n_rows += len(documents)
+                yield self.documents_to_dataframe(documents, dtypes)
+
+            logging.info(f"Streamed {n_rows} records from collection '{collection_name}'.")
+
+        except Exception as e:
+            logging.error(f"Failed to stream collection '{collection_name}'.", exc_info=True)
+            raise MyException(e, sys)
+
+    def get_partition_bounds(
+        self, collection_name: str, database_name: Optional[str] = None,
+        partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY,
+        partition_size: int = DATA_INGESTION_EXPORT_PARTITION_SIZE, query: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """
+        Returns sorted split points that cut the collection into ranges of roughly `partition_size` documents.
+
+        Each split point is found by skipping `partition_size` keys from the previous one, so the walk is a
+        single covered pass over the `partition_key` index (which must exist, as it does for '_id').
+        Only documents matching the optional `query` are counted.
         """
         try:
-            # Use specified database or default database
-            db_to_use = (
-                MongoDBClient.get_database()
-                if database_name is None
-                else MongoDBClient.connect(database_name=database_name)
-            )
+            collection = self._get_collection(collection_name, database_name)
+            bounds, operator = [], "$gte"
+            while True:
+                key_range = {partition_key: {operator: bounds[-1]}} if bounds else {}
+                cursor = collection.find(self.combine_queries(query, key_range), projection={partition_key: 1}, sort=[(partition_key, 1)],
+                                         skip=partition_size, limit=1)
+                document = next(iter(cursor), None)
+                if document is None:
+                    break
+                if bounds and document[partition_key] == bounds[-1]:
+                    # More than partition_size documents share this key; continue after it
+                    operator = "$gt"
+                    continue
+                bounds.append(document[partition_key])
+                operator = "$gte"
+
+            logging.info(f"Split collection '{collection_name}' into {len(bounds) + 1} partitions on '{partition_key}'.")
+            return bounds
+
+        except Exception as e:
+            logging.error(f"Failed to partition collection '{collection_name}'.", exc_info=True)
+            raise MyException(e, sys)
 
-            logging.info(f"Fetching collection '{collection_name}' from database '{db_to_use.name}'...")
+    @staticmethod
+    def combine_queries(*queries: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        ANDs together the non-empty filters.
+        """
+        queries = [query for query in queries if query]
+        if len(queries) > 1:
+            return {"$and": queries}
+        return queries[0] if queries else {}
+
+    @staticmethod
+    def get_partition_queries(bounds: List[Any], partition_key: str) -> List[Dict[str, Any]]:
+        """
+        Turns split points into contiguous [lower, upper) range filters covering the whole key space.
+        """
+        edges = [None] + list(bounds) + [None]
+        queries = []
+        for lower, upper in zip(edges[:-1], edges[1:]):
+            key_range = {}
+            if lower is not None:
+                key_range["$gte"] = lower
+            if upper is not None:
+                key_range["$lt"] = upper
+            queries.append({partition_key: key_range} if key_range else {})
+        return queries
 
-            # Access the collection
-            collection = db_to_use[collection_name]
+    def export_collection_parallel(
+        self, collection_name: str, database_name: Optional[str] = None,
+        partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY,
+        partition_size: int = DATA_INGESTION_EXPORT_PARTITION_SIZE,
+        max_workers: int = DATA_INGESTION_EXPORT_MAX_WORKERS,
+        chunk_size: int = DATA_INGESTION_EXPORT_CHUNK_SIZE, query: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Exports a collection (or the documents matching `query`) by reading its `partition_key` ranges concurrently over the pooled MongoDB client.
 
-            # Fetch data and convert to DataFrame
-            df = pd.DataFrame(list(collection.find()))
-            logging.info(f"Fetched {len(df)} records from collection '{collection_name}'.")
+        Partitions are read in key order and concatenated in partition order, so the result is the
+        same on every run regardless of which worker finishes first.
+        """
+        try:
+            bounds = self.get_partition_bounds(collection_name, database_name, partition_key, partition_size, query)
+            queries = self.get_partition_queries(bounds, partition_key)
 
-            # Drop '_id' column if exists
-            if "_id" in df.columns:
-                df = df.drop(columns=["_id"], axis=1)
-                logging.debug(f"Dropped '_id' column from collection '{collection_name}'.")
+            def read_partition(key_range: Dict[str, Any]) -> List[pd.DataFrame]:
+                return list(self.iter_collection_chunks(collection_name, database_name, chunk_size=chunk_size,
+                                                        query=self.combine_queries(query, key_range),
+                                                        sort=[(partition_key, 1)]))
 
-            # Replace "na" strings with np.nan
-            df.replace({"na": np.nan}, inplace=True)
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries))),
+                                    thread_name_prefix="mongo-export") as executor:
+                partitions = list(executor.map(read_partition, queries))
 
-            logging.info(f"Collection '{collection_name}' successfully converted to DataFrame.")
+            df = self.concat_chunks([chunk for chunks in partitions for chunk in chunks])
+            logging.info(f"Collection '{collection_name}' exported from {len(queries)} partitions "
+                         f"with {max_workers} workers: {len(df)} records.")
+            return df
+
+        except Exception as e:
+            logging.error(f"Failed to export collection '{collection_name}' in parallel.", exc_info=True)
+            raise MyException(e, sys)
+
+    def get_max_key(
+        self, collection_name: str, database_name: Optional[str] = None,
+        partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY, query: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Returns the largest `partition_key` value among documents matching `query`, or None if there are none.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            cursor = collection.find(query or {}, projection={partition_key: 1}, sort=[(partition_key, -1)], limit=1)
+            document = next(iter(cursor), None)
+            return None if document is None else document.get(partition_key)
+
+        except Exception as e:
+            logging.error(f"Failed to read the max '{partition_key}' of collection '{collection_name}'.", exc_info=True)
+            raise MyException(e, sys)
+
+    def get_collection_fingerprint(
+        self, collection_name: str, database_name: Optional[str] = None,
+        partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY
+    ) -> Dict[str, Any]:
+        """
+        Cheap summary of a collection's contents: its document count from collection metadata and its max key.
+        Inserts and deletes change it; in-place updates of existing documents do not.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            return {
+                "collection": collection_name,
+                "count": collection.estimated_document_count(),
+                "max_key": str(self.get_max_key(collection_name, database_name, partition_key)),
+            }
+        except Exception as e:
+            logging.error(f"Failed to fingerprint collection '{collection_name}'.", exc_info=True)
+            raise MyException(e, sys)
+
+    @staticmethod
+    def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenates typed chunks, keeping category columns categorical even when chunks saw different values.
+        """
+        if not chunks:
+            return pd.DataFrame()
+
+        dataframe = pd.concat(chunks, ignore_index=True)
+        for column in chunks[0].columns:
+            if isinstance(chunks[0][column].dtype, pd.CategoricalDtype) and \
+                    not isinstance(dataframe[column].dtype, pd.CategoricalDtype):
+                dataframe[column] = union_categoricals([chunk[column] for chunk in chunks], ignore_order=True)
+        return dataframe
+
+    def export_collection_as_dataframe(
+        self, collection_name: str, database_name: Optional[str] = None,
+        chunk_size: int = DATA_INGESTION_EXPORT_CHUNK_SIZE
+    ) -> pd.DataFrame:
+        """
+        Exports an entire MongoDB collection as a pandas DataFrame.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to self.database_name.
+        chunk_size : int
+            Number of documents converted at a time; see iter_collection_chunks.
+
+        Returns:
+        -------
+        pd.DataFrame
+            DataFrame containing the collection data, typed from schema.yaml, without '_id' and with 'na' values as NaN.
+        """
+        try:
+            chunks = list(self.iter_collection_chunks(collection_name, database_name, chunk_size=chunk_size))
+            df = self.concat_chunks(chunks)
+            logging.info(f"Collection '{collection_name}' successfully converted to DataFrame with {len(df)} records.")
             return df
 
         except Exception as e:
@@ -0,0 +1,203 @@
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.exception import MyException
+from src.logger import logging
+from src.constants import SCHEMA_FILE_PATH
+from src.utils.main_utils import read_yaml_file
+
+
+class TableFormat(ABC):
+    """
+    Storage backend for tabular ingestion artifacts. Subclasses implement write and read;
+    read must honour `columns` so downstream stages only materialise what they use.
+    """
+    name: str = ""
+    extensions: tuple = ()
+
+    @abstractmethod
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        ...
+
+    @abstractmethod
+    def read(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        ...
+
+    def iter_chunks(self, file_path: str, chunk_size: int,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields the table in chunks of at most `chunk_size` rows. Backends override this to avoid loading
+        the whole file; the fallback reads it once and slices.
+        """
+        dataframe = self.read(file_path, columns=columns)
+        for start in range(0, len(dataframe), chunk_size):
+            yield dataframe.iloc[start:start + chunk_size]
+
+
+class ParquetFormat(TableFormat):
+    name = "parquet"
+    extensions = (".parquet",)
+
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        dataframe.to_parquet(file_path, index=False)
+
+    def read(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(file_path, columns=columns)
+
+    def iter_chunks(self, file_path: str, chunk_size: int,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+
+class FeatherFormat(TableFormat):
+    """
+    Arrow IPC file format; uncompressed Arrow memory-maps and decodes faster than Parquet at the cost of size.
+    """
+    name = "feather"
+    extensions = (".feather", ".arrow")
+
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        dataframe.to_feather(file_path)
+
+    def read(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_feather(file_path, columns=columns)
+
+    def iter_chunks(self, file_path: str, chunk_size: int,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        import pyarrow as pa
+
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(start, chunk_size).to_pandas()
+
+
+class CsvFormat(TableFormat):
+    """
+    Plain CSV, kept for exports that need to be opened outside the pipeline. Types are restored from schema.yaml.
+    """
+    name = "csv"
+    extensions = (".csv",)
+
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        dataframe.to_csv(file_path, index=False, header=True)
+
+    def read(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        dataframe = pd.read_csv(file_path, usecols=columns)
+        # usecols keeps file order; match the column order the other backends return
+        return apply_schema_dtypes(dataframe if columns is None else dataframe[columns])
+
+    def iter_chunks(self, file_path: str, chunk_size: int,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        # Left as parsed so validation sees the raw values rather than failing on a cast
+        for dataframe in pd.read_csv(file_path, usecols=columns, chunksize=chunk_size):
+            yield dataframe if columns is None else dataframe[columns]
+
+
+TABLE_FORMATS: Dict[str, TableFormat] = {}
+
+
+def register_table_format(table_format: TableFormat) -> None:
+    """
+    Makes a backend available by name and by file extension.
+    """
+    TABLE_FORMATS[table_format.name] = table_format
+
+
+for _table_format in (ParquetFormat(), FeatherFormat(), CsvFormat()):
+    register_table_format(_table_format)
+
+
+def get_table_format(file_format: str) -> TableFormat:
+    try:
+        return TABLE_FORMATS[file_format]
+    except KeyError:
+        raise ValueError(f"Unknown table format '{file_format}', expected one of {sorted(TABLE_FORMATS)}")
+
+
+def get_table_format_for_path(file_path: str) -> TableFormat:
+    extension = os.path.splitext(file_path)[1].lower()
+    for table_format in TABLE_FORMATS.values():
+        if extension in table_format.extensions:
+            return table_format
+    raise ValueError(f"No table format registered for '{file_path}'")
+
+
+def table_file_path(file_path: str, file_format: str) -> str:
+    """
+    Returns `file_path` with its extension replaced by the one for `file_format`.
+    """
+    return os.path.splitext(file_path)[0] + get_table_format(file_format).extensions[0]
+
+
+def get_schema_dtypes() -> Dict[str, str]:
+    dtypes = {}
+    for column_dict in read_yaml_file(SCHEMA_FILE_PATH)["columns"]:
+        dtypes.update(column_dict)
+    return dtypes
+
+
+def apply_schema_dtypes(dataframe: pd.DataFrame, dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Casts schema columns to their declared type: int -> int64 (float64 when values are missing or fractional),
+    float -> float64, category -> pandas category. Other columns are left untouched.
+    """
+    dtypes = get_schema_dtypes() if dtypes is None else dtypes
+    casts = {}
+    for column, dtype in dtypes.items():
+        if column not in dataframe.columns:
+            continue
+        series = dataframe[column]
+        if dtype == "int":
+            # Never truncate: columns with missing or fractional values stay float for validation to flag
+            fractional = pd.api.types.is_float_dtype(series.dtype) and bool((series % 1 != 0).any())
+            casts[column] = np.float64 if fractional or series.isna().any() else np.int64
+        elif dtype == "float":
+            casts[column] = np.float64
+        elif dtype == "category" and not isinstance(series.dtype, pd.CategoricalDtype):
+            casts[column] = "category"
+    return dataframe.astype(casts) if casts else dataframe
+
+
+def write_table(dataframe: pd.DataFrame, file_path: str) -> None:
+    """
+    Writes `dataframe` with schema-typed columns in the format implied by the file extension.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        get_table_format_for_path(file_path).write(apply_schema_dtypes(dataframe).reset_index(drop=True), file_path)
+        logging.info(f"Wrote {len(dataframe)} rows to {file_path}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def iter_table(file_path: str, chunk_size: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Streams a table written by write_table in chunks of at most `chunk_size` rows.
+    """
+    try:
+        yield from get_table_format_for_path(file_path).iter_chunks(file_path, chunk_size, columns=columns)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_table(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads a table written by write_table, loading only `columns` when given.
+    """
+    try:
+        return get_table_format_for_path(file_path).read(file_path, columns=columns)
+    except Exception as e:
+        raise MyException(e, sys) from e
@@ -1,16 +1,40 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
 
 
 @dataclass
 class DataIngestionArtifact:
     trained_file_path:str 
     test_file_path:str
+    # In-memory copies for the next stages; the files above may still be being written in the background
+    train_df: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+    test_df: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
 
 @dataclass
 class DataTransformationArtifact:
     transformed_object_file_path:str
+    # Feature matrices; the targets are stored as separate vectors
     transformed_train_file_path: str
     transformed_test_file_path:str
+    transformed_train_target_file_path: str
+    transformed_test_target_file_path: str
+    # Set by the class_weight resampling strategy, which leaves the training data unbalanced
+    class_weight: Optional[dict] = None
+    # Set when the resampling strategy changed the training rows: the strategy and the arrays it was applied to,
+    # so the hyperparameter search can resample inside each training fold instead of validating on synthetic rows
+    resampling_strategy: Optional[str] = None
+    unresampled_train_file_path: Optional[str] = None
+    unresampled_train_target_file_path: Optional[str] = None
+    preprocessing_object: Optional[Any] = field(default=None, repr=False, compare=False)
+    train_features: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    train_target: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    test_features: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    test_target: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    unresampled_train_features: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    unresampled_train_target: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
     
 @dataclass
 class DataValidationArtifact:
@@ -18,16 +42,38 @@ class DataValidationArtifact:
     message:str
     validation_report_file_path:str
 
+@dataclass
+class DataDriftArtifact:
+    drift_detected: bool
+    retraining_required: bool
+    message: str
+    sketch_file_path: str
+    validation_report_file_path: str
+    sketches: Optional[dict] = field(default=None, repr=False, compare=False)
+
 @dataclass
 class ClassificationMetricArtifact:
     f1_score:float
     precision_score:float
     recall_score:float
+    accuracy_score: Optional[float] = None
+    roc_auc_score: Optional[float] = None
+    # [[tn, fp], [fn, tp]]
+    confusion_matrix: Optional[list] = None
+    threshold_curve: Optional[list] = None
 
 @dataclass
 class ModelTrainerArtifact:
     trained_model_file_path:str 
     metric_artifact:ClassificationMetricArtifact
+    trained_model: Optional[Any] = field(default=None, repr=False, compare=False)
+
+@dataclass
+class ProductionModelArtifact:
+    s3_model_path:str
+    is_model_present:bool
+    # Proj1Estimator with the production model already loaded, when one is present
+    estimator: Optional[Any] = field(default=None, repr=False, compare=False)
 
 @dataclass
 class ModelEvaluationArtifact:
@@ -35,8 +81,13 @@ class ModelEvaluationArtifact:
     changed_accuracy:float
     s3_model_path:str 
     trained_model_path:str
+    # Bootstrap confidence interval of the F1 gain over the production model, None when there was none
+    changed_accuracy_lower: Optional[float] = None
+    changed_accuracy_upper: Optional[float] = None
 
 @dataclass
 class ModelPusherArtifact:
     bucket_name:str
-    s3_model_path:str
\ No newline at end of file
+    s3_model_path:str
+    # Registry version the model was pushed as; None when nothing was pushed
+    model_version: Optional[str] = None
@@ -0,0 +1,154 @@
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.constants import COMPILED_FOREST_CHUNK_SIZE
+from src.exception import MyException
+
+
+@dataclass
+class CompiledForest:
+    """
+    Array-backed form of a fitted RandomForestClassifier.
+
+    Every tree's nodes are concatenated into contiguous arrays (feature, threshold, children, value)
+    with absolute child indices. A batch is evaluated for all trees at once by moving an (n_rows, n_trees)
+    matrix of node ids down one level per step, which replaces sklearn's per-tree, per-call machinery
+    with a handful of vectorized gathers. Leaves point to themselves, so extra steps are no-ops.
+    """
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    missing_go_to_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    classes_: np.ndarray
+    n_features_in_: int
+    chunk_size: int = COMPILED_FOREST_CHUNK_SIZE
+
+    @classmethod
+    def from_estimator(cls, forest: RandomForestClassifier,
+                       chunk_size: int = COMPILED_FOREST_CHUNK_SIZE) -> "CompiledForest":
+        """
+        Compiles a fitted single-output RandomForestClassifier.
+        """
+        try:
+            if not isinstance(forest, RandomForestClassifier):
+                raise ValueError(f"Cannot compile model of type {type(forest).__name__}")
+            if forest.n_outputs_ != 1:
+                raise ValueError("Cannot compile a multi-output forest")
+
+            features, thresholds, children, missing_lefts, values, roots = [], [], [], [], [], []
+            offset, max_depth = 0, 0
+
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                node_ids = np.arange(tree.node_count)
+                is_leaf = tree.children_left == -1
+
+                features.append(np.where(is_leaf, 0, tree.feature))
+                thresholds.append(tree.threshold)
+                # Row 2*i is the left child of node i, row 2*i + 1 the right one
+                children.append(np.column_stack([np.where(is_leaf, node_ids, tree.children_left),
+                                                 np.where(is_leaf, node_ids, tree.children_right)]).ravel() + offset)
+                # Trees from sklearn releases without missing-value support send NaN to the right child
+                missing_lefts.append(np.asarray(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)),
+                                                dtype=bool))
+                values.append(cls._leaf_probabilities(tree.value[:, 0, :forest.n_classes_]))
+                roots.append(offset)
+
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+
+            return cls(
+                feature=np.concatenate(features).astype(np.intp),
+                threshold=cls._float32_thresholds(np.concatenate(thresholds)),
+                children=np.concatenate(children).astype(np.intp),
+                missing_go_to_left=np.concatenate(missing_lefts),
+                value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+                roots=np.asarray(roots, dtype=np.intp),
+                max_depth=int(max_depth),
+                classes_=forest.classes_,
+                n_features_in_=int(forest.n_features_in_),
+                chunk_size=chunk_size,
+            )
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _float32_thresholds(threshold: np.ndarray) -> np.ndarray:
+        # sklearn compares float32 features against float64 thresholds. Rounding each threshold down to the
+        # largest float32 not above it gives the same comparison result at half the memory traffic.
+        rounded = threshold.astype(np.float32)
+        too_high = rounded.astype(np.float64) > threshold
+        rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+        return rounded
+
+    @staticmethod
+    def _leaf_probabilities(value: np.ndarray) -> np.ndarray:
+        # Recent sklearn stores class fractions in tree_.value; older releases store weighted counts
+        # and normalise them in predict_proba. Mirror whichever this tree uses so results stay identical.
+        totals = value.sum(axis=1, keepdims=True)
+        if np.allclose(totals, 1.0):
+            return value.copy()
+        totals[totals == 0.0] = 1.0
+        return value / totals
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * X.shape[1])[:, None]
+        has_missing = bool(np.isnan(X).any())
+
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        positions = np.empty((n_rows, n_trees), dtype=np.intp)
+        values = np.empty((n_rows, n_trees), dtype=np.float32)
+        thresholds = np.empty((n_rows, n_trees), dtype=np.float32)
+        go_right = np.empty((n_rows, n_trees), dtype=bool)
+
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=positions)
+            positions += row_offsets
+            np.take(flat_X, positions, out=values)
+            np.take(self.threshold, nodes, out=thresholds)
+            np.greater(values, thresholds, out=go_right)
+            if has_missing:
+                go_right |= np.isnan(values) & ~self.missing_go_to_left[nodes]
+            nodes *= 2
+            nodes += go_right
+            nodes = self.children[nodes]
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities, identical to RandomForestClassifier.predict_proba.
+        """
+        try:
+            # sklearn's trees compare float32 features against float64 thresholds
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+                raise ValueError(f"Expected input with {self.n_features_in_} features, got shape {X.shape}")
+
+            proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float64)
+            for start in range(0, X.shape[0], self.chunk_size):
+                stop = start + self.chunk_size
+                leaves = self._apply(X[start:stop])
+                chunk = proba[start:stop]
+                # Accumulate tree by tree, in estimator order, exactly like the forest does
+                for tree_index in range(leaves.shape[1]):
+                    chunk += self.value[leaves[:, tree_index]]
+            proba /= len(self.roots)
+            return proba
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class labels, identical to RandomForestClassifier.predict.
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
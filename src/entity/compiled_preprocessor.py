@@ -0,0 +1,209 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, OneHotEncoder, StandardScaler
+
+from src.components.transformers import ColumnDropper, GenderMapper
+from src.exception import MyException
+
+
+@dataclass
+class StandardBlock:
+    columns: List[str]
+    output_index: np.ndarray
+    mean: np.ndarray
+    scale: np.ndarray
+
+
+@dataclass
+class MinMaxBlock:
+    columns: List[str]
+    output_index: np.ndarray
+    scale: np.ndarray
+    min: np.ndarray
+
+
+@dataclass
+class PassthroughBlock:
+    columns: List[str]
+    output_index: np.ndarray
+
+
+@dataclass
+class OneHotBlock:
+    column: str
+    lookup: Dict[Any, int]
+
+
+@dataclass
+class CompiledPreprocessor:
+    """
+    Flat NumPy form of the fitted preprocessing Pipeline built in DataTransformation.get_preprocessor
+    (GenderMapper -> ColumnDropper -> ColumnTransformer of StandardScaler/MinMaxScaler/OneHotEncoder/passthrough).
+
+    It applies the same arithmetic in the same order as the sklearn transformers, so the output is
+    identical to pipeline.transform, but it works on a dict, a 2-D array or a DataFrame's columns
+    without allocating intermediate DataFrames.
+    """
+    input_columns: List[str]
+    n_output_features: int
+    value_maps: Dict[str, Dict[Any, Any]] = field(default_factory=dict)
+    standard_blocks: List[StandardBlock] = field(default_factory=list)
+    minmax_blocks: List[MinMaxBlock] = field(default_factory=list)
+    passthrough_blocks: List[PassthroughBlock] = field(default_factory=list)
+    onehot_blocks: List[OneHotBlock] = field(default_factory=list)
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline) -> "CompiledPreprocessor":
+        """
+        Exports a fitted preprocessing Pipeline. Raises if it contains a step the compiler does not know.
+        """
+        try:
+            value_maps: Dict[str, Dict[Any, Any]] = {}
+            column_transformer = None
+
+            for name, step in pipeline.steps:
+                if isinstance(step, GenderMapper):
+                    value_maps["Gender"] = dict(GenderMapper.mapping)
+                elif isinstance(step, ColumnDropper):
+                    continue  # only the ColumnTransformer's input columns are ever read
+                elif isinstance(step, ColumnTransformer):
+                    column_transformer = step
+                else:
+                    raise ValueError(f"Cannot compile pipeline step '{name}' of type {type(step).__name__}")
+
+            if column_transformer is None:
+                raise ValueError("Pipeline has no ColumnTransformer step")
+
+            input_columns = [str(column) for column in column_transformer.feature_names_in_]
+            compiled = cls(input_columns=input_columns, n_output_features=0, value_maps=value_maps)
+
+            position = 0
+            for name, transformer, columns in column_transformer.transformers_:
+                if isinstance(transformer, str) and transformer == "drop":
+                    continue
+                columns = [input_columns[c] if isinstance(c, (int, np.integer)) else str(c) for c in columns]
+                if len(columns) == 0:
+                    continue
+                position = compiled._add_transformer(name, transformer, columns, position)
+
+            compiled.n_output_features = position
+            return compiled
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _add_transformer(self, name: str, transformer: Any, columns: List[str], position: int) -> int:
+        if isinstance(transformer, Pipeline):
+            if len(transformer.steps) != 1:
+                raise ValueError(f"Cannot compile transformer '{name}': expected a single-step Pipeline")
+            transformer = transformer.steps[0][1]
+
+        n_columns = len(columns)
+        output_index = np.arange(position, position + n_columns)
+
+        if (isinstance(transformer, str) and transformer == "passthrough") or (
+                isinstance(transformer, FunctionTransformer) and transformer.func is None):
+            self.passthrough_blocks.append(PassthroughBlock(columns, output_index))
+            return position + n_columns
+
+        if isinstance(transformer, StandardScaler):
+            mean = transformer.mean_ if transformer.with_mean else np.zeros(n_columns)
+            scale = transformer.scale_ if transformer.with_std else np.ones(n_columns)
+            self.standard_blocks.append(StandardBlock(columns, output_index, mean.astype(np.float64),
+                                                      scale.astype(np.float64)))
+            return position + n_columns
+
+        if isinstance(transformer, MinMaxScaler):
+            if transformer.clip:
+                raise ValueError(f"Cannot compile transformer '{name}': MinMaxScaler(clip=True)")
+            self.minmax_blocks.append(MinMaxBlock(columns, output_index, transformer.scale_.astype(np.float64),
+                                                  transformer.min_.astype(np.float64)))
+            return position + n_columns
+
+        if isinstance(transformer, OneHotEncoder):
+            if getattr(transformer, "_infrequent_enabled", False):
+                raise ValueError(f"Cannot compile transformer '{name}': infrequent categories")
+            for feature_index, column in enumerate(columns):
+                categories = transformer.categories_[feature_index]
+                dropped = None if transformer.drop_idx_ is None else transformer.drop_idx_[feature_index]
+                lookup = {}
+                for category_index, category in enumerate(categories):
+                    if category_index == dropped:
+                        continue
+                    lookup[category.item() if isinstance(category, np.generic) else category] = position
+                    position += 1
+                self.onehot_blocks.append(OneHotBlock(column, lookup))
+            return position
+
+        raise ValueError(f"Cannot compile transformer '{name}' of type {type(transformer).__name__}")
+
+    def _get_columns(self, data: Union[Mapping[str, Any], DataFrame, np.ndarray, Sequence[Sequence[Any]]]
+                     ) -> Dict[str, np.ndarray]:
+        if isinstance(data, DataFrame):
+            return {column: data[column].to_numpy() for column in self.input_columns}
+
+        if isinstance(data, Mapping):
+            columns = {}
+            for column in self.input_columns:
+                values = data[column]
+                columns[column] = np.asarray(values if isinstance(values, (list, tuple, np.ndarray)) else [values])
+            return columns
+
+        array = np.asarray(data, dtype=object)
+        if array.ndim != 2 or array.shape[1] != len(self.input_columns):
+            raise ValueError(f"Expected a 2-D array with {len(self.input_columns)} columns "
+                             f"ordered as {self.input_columns}, got shape {array.shape}")
+        return {column: array[:, index] for index, column in enumerate(self.input_columns)}
+
+    @staticmethod
+    def _stack(columns: Dict[str, np.ndarray], names: List[str]) -> np.ndarray:
+        return np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in names])
+
+    def transform(self, data: Union[Mapping[str, Any], DataFrame, np.ndarray, Sequence[Sequence[Any]]]
+                  ) -> np.ndarray:
+        """
+        Transforms rows given as a dict (column -> scalar for one row, or column -> values), a 2-D array
+        with columns in `input_columns` order, or a DataFrame. Returns a float64 feature matrix.
+        """
+        try:
+            columns = self._get_columns(data)
+            for column, mapping in self.value_maps.items():
+                if column in columns:
+                    columns[column] = np.array([mapping.get(value, np.nan) for value in columns[column]],
+                                               dtype=object)
+
+            n_rows = len(columns[self.input_columns[0]])
+            output = np.zeros((n_rows, self.n_output_features), dtype=np.float64)
+
+            for block in self.standard_blocks:
+                values = self._stack(columns, block.columns)
+                values -= block.mean
+                values /= block.scale
+                output[:, block.output_index] = values
+
+            for block in self.minmax_blocks:
+                values = self._stack(columns, block.columns)
+                values *= block.scale
+                values += block.min
+                output[:, block.output_index] = values
+
+            for block in self.passthrough_blocks:
+                output[:, block.output_index] = self._stack(columns, block.columns)
+
+            for block in self.onehot_blocks:
+                lookup = block.lookup
+                for row, value in enumerate(columns[block.column]):
+                    index = lookup.get(value)
+                    if index is not None:
+                        output[row, index] = 1.0
+
+            return output
+
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from src.constants import *
 from dataclasses import dataclass
 from datetime import datetime
@@ -10,6 +11,12 @@ class TrainingPipelineConfig:
     pipeline_name: str = PIPELINE_NAME
     artifact_dir: str = os.path.join(ARTIFACT_DIR, TIMESTAMP)
     timestamp: str = TIMESTAMP
+    in_memory_handoff: bool = PIPELINE_IN_MEMORY_HANDOFF
+    artifact_writer_workers: int = PIPELINE_ARTIFACT_WRITER_WORKERS
+    stage_cache_enabled: bool = PIPELINE_STAGE_CACHE_ENABLED
+    stage_cache_dir: str = PIPELINE_STAGE_CACHE_DIR
+    max_parallel_stages: int = PIPELINE_MAX_PARALLEL_STAGES
+    trace_file_path: str = os.path.join(artifact_dir, PIPELINE_TRACE_FILE_NAME)
 
 
 training_pipeline_config: TrainingPipelineConfig = TrainingPipelineConfig()
@@ -23,6 +30,16 @@ class DataIngestionConfig:
     testing_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME)
     train_test_split_ratio: float = DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
     collection_name:str = DATA_INGESTION_COLLECTION_NAME
+    export_chunk_size: int = DATA_INGESTION_EXPORT_CHUNK_SIZE
+    export_max_workers: int = DATA_INGESTION_EXPORT_MAX_WORKERS
+    export_partition_size: int = DATA_INGESTION_EXPORT_PARTITION_SIZE
+    export_partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY
+    incremental: bool = DATA_INGESTION_INCREMENTAL
+    # Shared across runs, so it lives outside the timestamped artifact directory
+    snapshot_dir: str = DATA_INGESTION_SNAPSHOT_DIR
+    # Format of the feature store, train and test files; their paths above get this format's extension
+    file_format: str = DATA_INGESTION_FILE_FORMAT
+    export_csv: bool = DATA_INGESTION_EXPORT_CSV
 
 
 @dataclass
@@ -32,14 +49,46 @@ class DataTransformationConfig:
                                                     TRAIN_FILE_NAME.replace("csv", "npy"))
     transformed_test_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
                                                    TEST_FILE_NAME.replace("csv", "npy"))
+    transformed_train_target_file_path: str = os.path.join(data_transformation_dir,
+                                                           DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                           DATA_TRANSFORMATION_TRAIN_TARGET_FILE_NAME)
+    transformed_test_target_file_path: str = os.path.join(data_transformation_dir,
+                                                          DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                          DATA_TRANSFORMATION_TEST_TARGET_FILE_NAME)
     transformed_object_file_path: str = os.path.join(data_transformation_dir,
                                                      DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
                                                      PREPROCSSING_OBJECT_FILE_NAME)
+    unresampled_train_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                    DATA_TRANSFORMATION_UNRESAMPLED_TRAIN_FILE_NAME)
+    unresampled_train_target_file_path: str = os.path.join(data_transformation_dir,
+                                                           DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                           DATA_TRANSFORMATION_UNRESAMPLED_TRAIN_TARGET_FILE_NAME)
+    resampling_strategy: str = DATA_TRANSFORMATION_RESAMPLING_STRATEGY
+    resampling_n_jobs: int = DATA_TRANSFORMATION_RESAMPLING_N_JOBS
+    resampling_random_state: int = DATA_TRANSFORMATION_RESAMPLING_RANDOM_STATE
+    chunked: bool = DATA_TRANSFORMATION_CHUNKED
+    chunk_size: int = DATA_TRANSFORMATION_CHUNK_SIZE
+    feature_dtype: str = DATA_TRANSFORMATION_FEATURE_DTYPE
+    target_dtype: str = DATA_TRANSFORMATION_TARGET_DTYPE
     
 @dataclass
 class DataValidationConfig:
     data_validation_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_VALIDATION_DIR_NAME)
     validation_report_file_path: str = os.path.join(data_validation_dir, DATA_VALIDATION_REPORT_FILE_NAME)
+    chunk_size: int = DATA_VALIDATION_CHUNK_SIZE
+    sample_rows: int = DATA_VALIDATION_SAMPLE_ROWS
+
+@dataclass
+class DataDriftConfig:
+    # Drift results are added to the validation report, so the sketches live next to it
+    sketch_file_path: str = os.path.join(training_pipeline_config.artifact_dir, DATA_VALIDATION_DIR_NAME,
+                                         DATA_DRIFT_SKETCH_FILE_NAME)
+    sketch_capacity: int = DATA_DRIFT_SKETCH_CAPACITY
+    chunk_size: int = DATA_VALIDATION_CHUNK_SIZE
+    psi_threshold: float = DATA_DRIFT_PSI_THRESHOLD
+    ks_threshold: float = DATA_DRIFT_KS_THRESHOLD
+    # When set, the model is only retrained if drift is detected against the production model
+    gate_retraining: bool = DATA_DRIFT_GATE_RETRAINING
 
 @dataclass
 class ModelTrainerConfig:
@@ -47,6 +96,10 @@ class ModelTrainerConfig:
     trained_model_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_DIR, MODEL_FILE_NAME)
     expected_accuracy: float = MODEL_TRAINER_EXPECTED_SCORE
     model_config_file_path: str = MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+    mmap_mode: Optional[str] = MODEL_TRAINER_MMAP_MODE
+    n_jobs: int = MODEL_TRAINER_N_JOBS
+    trial_log_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRIAL_LOG_FILE_NAME)
+    train_score_max_rows: int = MODEL_TRAINER_TRAIN_SCORE_MAX_ROWS
     _n_estimators = MODEL_TRAINER_N_ESTIMATORS
     _min_samples_split = MODEL_TRAINER_MIN_SAMPLES_SPLIT
     _min_samples_leaf = MODEL_TRAINER_MIN_SAMPLES_LEAF
@@ -57,6 +110,9 @@ class ModelTrainerConfig:
 @dataclass
 class ModelEvaluationConfig:
     changed_threshold_score: float = MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE
+    bootstrap_resamples: int = MODEL_EVALUATION_BOOTSTRAP_RESAMPLES
+    confidence_level: float = MODEL_EVALUATION_CONFIDENCE_LEVEL
+    random_state: Optional[int] = MODEL_EVALUATION_RANDOM_STATE
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
 
@@ -69,3 +125,8 @@ class ModelPusherConfig:
 class VehiclePredictorConfig:
     model_file_path: str = MODEL_FILE_NAME
     model_bucket_name: str = MODEL_BUCKET_NAME
+    model_refresh_interval: float = MODEL_CACHE_REFRESH_INTERVAL_SECONDS
+    micro_batch_max_size: int = PREDICTION_MICRO_BATCH_MAX_SIZE
+    micro_batch_max_wait_ms: float = PREDICTION_MICRO_BATCH_MAX_WAIT_MS
+    inference_max_workers: int = PREDICTION_THREAD_POOL_WORKERS
+    use_compiled_forest: bool = PREDICTION_USE_COMPILED_FOREST
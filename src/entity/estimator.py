@@ -1,10 +1,14 @@
 import sys
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from sklearn.pipeline import Pipeline
+from src.constants import COMPILED_FOREST_MAX_BATCH_ROWS
+from src.entity.compiled_forest import CompiledForest
+from src.entity.compiled_preprocessor import CompiledPreprocessor
 from src.exception import MyException
 from src.logger import logging
-from typing import Any
+from typing import Any, Optional, Tuple
 
 class TargetValueMapping:
     def __init__(self):
@@ -23,9 +27,55 @@ class TargetValueMapping:
         return self.reverse_mapping_dict
 
 class MyModel:
-    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
+    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object,
+                 feature_sketches: Optional[dict] = None):
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        # Serialized training-data sketches (see src/entity/feature_sketches.py), the reference for drift detection
+        self.feature_sketches = feature_sketches
+        self.compiled_preprocessor = None
+        self.compiled_model = None
+
+    def compile_preprocessor(self) -> None:
+        """
+        Exports the fitted preprocessing pipeline into its flat NumPy form; transform uses it from then on.
+        """
+        try:
+            self.compiled_preprocessor = CompiledPreprocessor.from_pipeline(self.preprocessing_object)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def compile_model(self) -> None:
+        """
+        Compiles the trained forest into the array-backed inference engine; predictions use it from then on.
+        """
+        try:
+            self.compiled_model = CompiledForest.from_estimator(self.trained_model_object)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_inference_model(self, n_rows: int = 1) -> Any:
+        """
+        Returns the compiled forest for batches it scores faster than sklearn, the sklearn model otherwise.
+        Past COMPILED_FOREST_MAX_BATCH_ROWS sklearn's Cython traversal wins (see src/tests/benchmark_compiled_forest.py).
+        """
+        compiled = getattr(self, "compiled_model", None)
+        if compiled is not None and n_rows <= COMPILED_FOREST_MAX_BATCH_ROWS:
+            return compiled
+        return self.trained_model_object
+
+    def transform(self, data) -> np.ndarray:
+        """
+        Applies preprocessing to a DataFrame or a column -> values dict.
+        Uses the compiled fast path when available, the sklearn pipeline otherwise.
+        """
+        # Models pickled before the fast path existed have no compiled_preprocessor attribute
+        compiled = getattr(self, "compiled_preprocessor", None)
+        if compiled is not None:
+            return compiled.transform(data)
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        return self.preprocessing_object.transform(data)
 
     def predict(self, dataframe: pd.DataFrame):
         """
@@ -36,11 +86,11 @@ class MyModel:
 
             # Step 1: Transform features
             # Many models fail if the input isn't exactly as expected (e.g., column names missing)
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            transformed_feature = self.transform(dataframe)
 
             # Step 2: Predict
             logging.info("Using the trained model to get predictions")
-            predictions = self.trained_model_object.predict(transformed_feature) # type: ignore
+            predictions = self.get_inference_model(len(transformed_feature)).predict(transformed_feature)
 
             return predictions
 
@@ -48,6 +98,25 @@ class MyModel:
             # Using logging.error is good, but MyException already handles sys/traceback
             raise MyException(e, sys) from e
 
+    def predict_with_proba(self, dataframe: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies preprocessing once and returns (predictions, positive-class probabilities).
+        Predictions are derived from the same probability matrix, exactly as the classifier's predict does.
+        """
+        try:
+            transformed_feature = self.transform(dataframe)
+            model = self.get_inference_model(len(transformed_feature))
+            probabilities = model.predict_proba(transformed_feature)
+
+            classes = model.classes_
+            predictions = classes.take(np.argmax(probabilities, axis=1), axis=0)
+            positive_index = list(classes).index(1) if 1 in classes else -1
+
+            return predictions, probabilities[:, positive_index]
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def __repr__(self):
         # Improved repr to show both preprocessor and model info
         return f"MyModel(preprocessor={type(self.preprocessing_object).__name__}, model={type(self.trained_model_object).__name__})"
\ No newline at end of file
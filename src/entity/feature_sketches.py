@@ -0,0 +1,136 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Keeps log() finite when a bin is empty on one side
+PSI_EPSILON = 1e-4
+
+
+class QuantileSketch:
+    """
+    Mergeable approximation of a numeric column's distribution in `capacity` weighted centroids.
+
+    Values are buffered and, once the buffer holds twice the capacity, sorted and collapsed into
+    `capacity` centroids of roughly equal weight. Memory is O(capacity) regardless of row count,
+    and the rank error is about 1 / capacity, which is far below what PSI/KS thresholds resolve.
+    """
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.values = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.count = 0
+        self.nulls = 0
+
+    def update(self, values: Any) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        finite = values[~np.isnan(values)]
+        self.nulls += len(values) - len(finite)
+        self.count += len(finite)
+        self.values = np.concatenate([self.values, finite])
+        self.weights = np.concatenate([self.weights, np.ones(len(finite))])
+        if len(self.values) > 2 * self.capacity:
+            self._compress()
+
+    def _compress(self) -> None:
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+        cumulative = np.cumsum(weights)
+        bins = np.minimum(((cumulative - weights / 2) / cumulative[-1] * self.capacity).astype(np.intp),
+                          self.capacity - 1)
+        bin_weights = np.bincount(bins, weights=weights, minlength=self.capacity)
+        bin_sums = np.bincount(bins, weights=values * weights, minlength=self.capacity)
+        occupied = bin_weights > 0
+        self.values = bin_sums[occupied] / bin_weights[occupied]
+        self.weights = bin_weights[occupied]
+
+    def cdf(self, points: np.ndarray) -> np.ndarray:
+        """
+        Estimated fraction of values <= each point.
+        """
+        if not len(self.values):
+            return np.zeros(len(points))
+        order = np.argsort(self.values, kind="stable")
+        values, cumulative = self.values[order], np.cumsum(self.weights[order])
+        index = np.searchsorted(values, points, side="right")
+        return np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0) / cumulative[-1]
+
+    def quantiles(self, probabilities: np.ndarray) -> np.ndarray:
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(probabilities, positions, values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if len(self.values) > self.capacity:
+            self._compress()
+        return {"type": "quantile", "capacity": self.capacity, "count": self.count, "nulls": self.nulls,
+                "values": self.values.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["capacity"])
+        sketch.values = np.asarray(data["values"], dtype=np.float64)
+        sketch.weights = np.asarray(data["weights"], dtype=np.float64)
+        sketch.count, sketch.nulls = data["count"], data["nulls"]
+        return sketch
+
+
+class FrequencySketch:
+    """
+    Exact value counts of a categorical column; categorical domains here are tiny.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.count = 0
+        self.nulls = 0
+
+    def update(self, values: pd.Series) -> None:
+        self.nulls += int(values.isna().sum())
+        for value, count in values.dropna().astype(str).value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+            self.count += int(count)
+
+    def proportions(self, categories) -> np.ndarray:
+        total = max(self.count, 1)
+        return np.array([self.counts.get(category, 0) / total for category in categories])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "frequency", "count": self.count, "nulls": self.nulls, "counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrequencySketch":
+        sketch = cls()
+        sketch.counts = {str(key): int(value) for key, value in data["counts"].items()}
+        sketch.count, sketch.nulls = data["count"], data["nulls"]
+        return sketch
+
+
+def sketch_from_dict(data: Dict[str, Any]):
+    return QuantileSketch.from_dict(data) if data["type"] == "quantile" else FrequencySketch.from_dict(data)
+
+
+def population_stability_index(reference: np.ndarray, current: np.ndarray) -> float:
+    reference = np.clip(reference, PSI_EPSILON, None)
+    current = np.clip(current, PSI_EPSILON, None)
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+
+def compare_sketches(reference, current, n_bins: int = 10) -> Dict[str, Optional[float]]:
+    """
+    PSI over the reference distribution's deciles (numeric) or categories (categorical), and the
+    Kolmogorov-Smirnov statistic for numeric columns.
+    """
+    if isinstance(reference, QuantileSketch):
+        edges = np.unique(reference.quantiles(np.linspace(0, 1, n_bins + 1)[1:-1]))
+        reference_bins = np.diff(np.concatenate([[0.0], reference.cdf(edges), [1.0]]))
+        current_bins = np.diff(np.concatenate([[0.0], current.cdf(edges), [1.0]]))
+        points = np.union1d(reference.values, current.values)
+        ks = float(np.max(np.abs(reference.cdf(points) - current.cdf(points)))) if len(points) else 0.0
+        return {"psi": population_stability_index(reference_bins, current_bins), "ks": ks}
+
+    categories = sorted(set(reference.counts) | set(current.counts))
+    return {"psi": population_stability_index(reference.proportions(categories), current.proportions(categories)),
+            "ks": None}
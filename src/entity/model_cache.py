@@ -0,0 +1,157 @@
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.constants import MODEL_CACHE_REFRESH_INTERVAL_SECONDS, PREDICTION_USE_COMPILED_FOREST
+from src.entity.estimator import MyModel
+from src.entity.s3_estimator import Proj1Estimator
+from src.exception import MyException
+from src.logger import logging
+from src.utils.metrics import metrics
+
+
+cache_hits = metrics.counter("model_cache_hits_total", "Predictions served by the in-memory production model")
+cache_misses = metrics.counter("model_cache_misses_total", "Predictions that had to wait for a model download")
+cache_reloads = metrics.counter("model_cache_reloads_total", "Production model versions swapped in by the refresher")
+
+
+class ModelCache:
+    """
+    Process-wide, warm cache of the production MyModel stored in S3.
+
+    The model is loaded once (at app startup) and kept in memory. A daemon thread polls the
+    registry's current version and, when it changes (a deploy or a rollback), loads that version and
+    swaps it in with a single reference assignment, so requests never block on S3 once the cache is warm.
+    """
+
+    _instances: Dict[Tuple[str, str], "ModelCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, bucket_name: str, model_path: str,
+                 refresh_interval: float = MODEL_CACHE_REFRESH_INTERVAL_SECONDS,
+                 use_compiled_forest: bool = PREDICTION_USE_COMPILED_FOREST):
+        """
+        :param bucket_name: Name of the model bucket
+        :param model_path: Location of the model in the bucket
+        :param refresh_interval: Seconds between two S3 version checks
+        :param use_compiled_forest: Serve through the array-backed forest engine instead of sklearn's predict
+        """
+        self.bucket_name = bucket_name
+        self.model_path = model_path
+        self.refresh_interval = refresh_interval
+        self.use_compiled_forest = use_compiled_forest
+        self._estimator: Optional[Proj1Estimator] = None
+        # (model, version) is swapped as one tuple so readers never see a mismatched pair
+        self._entry: Optional[Tuple[MyModel, str]] = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls, bucket_name: str, model_path: str,
+                     refresh_interval: float = MODEL_CACHE_REFRESH_INTERVAL_SECONDS,
+                     use_compiled_forest: bool = PREDICTION_USE_COMPILED_FOREST) -> "ModelCache":
+        """
+        Returns the shared cache for a bucket/key pair, creating it on first use.
+        """
+        key = (bucket_name, model_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(bucket_name, model_path, refresh_interval, use_compiled_forest)
+            return cls._instances[key]
+
+    @property
+    def version(self) -> Optional[str]:
+        entry = self._entry
+        return entry[1] if entry is not None else None
+
+    def _get_estimator(self) -> Proj1Estimator:
+        if self._estimator is None:
+            self._estimator = Proj1Estimator(bucket_name=self.bucket_name, model_path=self.model_path)
+        return self._estimator
+
+    def _fetch_version(self) -> str:
+        return self._get_estimator().get_version()
+
+    def _load(self, version: str) -> None:
+        logging.info(f"Loading production model version {version} into the model cache")
+        # Load exactly the version that was looked up, so a deploy in between cannot pair it with another model
+        model = self._get_estimator().load_model(version)
+        try:
+            model.compile_preprocessor()
+        except Exception:
+            logging.warning("Preprocessor could not be compiled; serving through the sklearn pipeline", exc_info=True)
+        if self.use_compiled_forest:
+            try:
+                model.compile_model()
+            except Exception:
+                logging.warning("Model could not be compiled; serving through sklearn's predict", exc_info=True)
+        self._entry = (model, version)
+
+    def get_model(self) -> MyModel:
+        """
+        Returns the cached production model, downloading it only if the cache is still cold.
+        """
+        try:
+            entry = self._entry
+            if entry is not None:
+                cache_hits.inc()
+                return entry[0]
+
+            cache_misses.inc()
+            with self._load_lock:
+                if self._entry is None:
+                    self._load(self._fetch_version())
+                return self._entry[0]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def refresh(self) -> bool:
+        """
+        Checks the S3 object version and swaps in the new model if it changed.
+
+        Output: True when a new version was loaded.
+        """
+        try:
+            with self._load_lock:
+                version = self._fetch_version()
+                if version == self.version:
+                    return False
+                self._load(version)
+                cache_reloads.inc()
+                return True
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the model we already have; the next tick will retry
+                logging.error("Background model refresh failed", exc_info=True)
+
+    def start(self) -> None:
+        """
+        Warms the cache and starts the background version checker.
+        """
+        try:
+            self.refresh()
+        except Exception:
+            logging.error("Could not warm the model cache at startup; first request will load it", exc_info=True)
+
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._stop_event.clear()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="model-cache-refresher", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background version checker.
+        """
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
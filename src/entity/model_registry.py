@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.constants import MODEL_FILE_NAME, MODEL_PUSHER_S3_KEY, MODEL_REGISTRY_CACHE_DIR, MODEL_REGISTRY_MANIFEST_NAME
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_object
+from src.utils.metrics import metrics
+
+
+local_hits = metrics.counter("model_registry_local_hits_total", "Model loads served from the local content cache")
+downloads = metrics.counter("model_registry_downloads_total", "Model versions downloaded from S3")
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Versioned model store on S3 with a local, content-addressed cache.
+
+    Every pushed model gets an immutable key, <prefix>/versions/<version>/model.pkl, that is never overwritten.
+    A small manifest, <prefix>/manifest.json, records each version's SHA-256 and size and points at the current
+    champion; promoting or rolling back only rewrites the manifest. Downloaded files are kept under
+    cache_dir/<sha256>.pkl, so a version whose bytes are already on disk is loaded without touching S3 again.
+
+    The manifest is read-modified-written, so only one process (the training pipeline) should push at a time.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str = MODEL_PUSHER_S3_KEY,
+                 cache_dir: str = MODEL_REGISTRY_CACHE_DIR, s3: Optional[SimpleStorageService] = None):
+        """
+        :param bucket_name: Name of the model bucket
+        :param prefix: Key prefix holding the manifest and the versions
+        :param cache_dir: Local directory of downloaded model files
+        :param s3: Storage client to share, a new one otherwise
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix.rstrip("/")
+        self.cache_dir = cache_dir
+        self.s3 = s3 if s3 is not None else SimpleStorageService()
+        self._cache_lock = threading.Lock()
+        # (ETag, body) of the last manifest read; it is only downloaded again when its ETag changes
+        self._manifest: Optional[tuple] = None
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.prefix}/{MODEL_REGISTRY_MANIFEST_NAME}"
+
+    def version_key(self, version: str) -> str:
+        return f"{self.prefix}/versions/{version}/{MODEL_FILE_NAME}"
+
+    def cached_file_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.pkl")
+
+    def get_manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the manifest, or None when nothing was ever registered. The existence check is a HEAD
+        answered from the storage's metadata cache; the body is only fetched when the ETag changed.
+        """
+        try:
+            metadata = self.s3.head_object(self.bucket_name, self.manifest_key)
+            if metadata is None:
+                return None
+            cached = self._manifest
+            if cached is None or cached[0] != metadata["ETag"]:
+                body = self.s3.get_object_bytes(self.bucket_name, self.manifest_key)
+                if body is None:
+                    return None
+                cached = self._manifest = (metadata["ETag"], body)
+            return json.loads(cached[1])
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        self.s3.put_object_bytes(self.bucket_name, self.manifest_key,
+                                 json.dumps(manifest, indent=2).encode(), content_type="application/json")
+
+    def current_version(self) -> Optional[str]:
+        manifest = self.get_manifest()
+        return manifest["current"] if manifest else None
+
+    def register(self, from_file: str, promote: bool = True) -> str:
+        """
+        Uploads a model file as a new immutable version and, by default, makes it the champion.
+        A file whose content is already registered is not uploaded again; its existing version is reused.
+
+        Output: The version id.
+        """
+        try:
+            sha256 = file_sha256(from_file)
+            manifest = self.get_manifest() or {"current": None, "history": [], "versions": {}}
+
+            version = next((name for name, info in manifest["versions"].items() if info["sha256"] == sha256), None)
+            if version is None:
+                created_at = datetime.now(timezone.utc)
+                version = f"{created_at:%Y%m%dT%H%M%SZ}-{sha256[:12]}"
+                self.s3.upload_file(from_file, to_filename=self.version_key(version),
+                                    bucket_name=self.bucket_name, remove=False)
+                manifest["versions"][version] = {"key": self.version_key(version), "sha256": sha256,
+                                                 "size": os.path.getsize(from_file),
+                                                 "created_at": created_at.isoformat()}
+                logging.info(f"Registered model version {version}")
+            else:
+                logging.info(f"Model content is already registered as version {version}")
+
+            # The pushing process already has the bytes; keep them so it does not download them back
+            self._store_in_cache(from_file, sha256)
+
+            if promote and manifest["current"] != version:
+                manifest["current"] = version
+                manifest["history"].append(version)
+            self._write_manifest(manifest)
+            return version
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def promote(self, version: str) -> None:
+        """
+        Points the manifest at an already registered version.
+        """
+        try:
+            manifest = self.get_manifest()
+            if manifest is None or version not in manifest["versions"]:
+                raise ValueError(f"Model version {version} is not registered")
+            if manifest["current"] != version:
+                manifest["current"] = version
+                manifest["history"].append(version)
+                self._write_manifest(manifest)
+            logging.info(f"Model version {version} is now the champion")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """
+        Makes `version` the champion again or, by default, the one that preceded the current champion.
+        Only the manifest changes; no model bytes move.
+
+        Output: The new current version.
+        """
+        try:
+            if version is not None:
+                self.promote(version)
+                return version
+
+            manifest = self.get_manifest()
+            if manifest is None or len(manifest["history"]) < 2:
+                raise ValueError("There is no previous model version to roll back to")
+            rolled_back = manifest["history"].pop()
+            manifest["current"] = manifest["history"][-1]
+            self._write_manifest(manifest)
+            logging.info(f"Rolled back model version {rolled_back} to {manifest['current']}")
+            return manifest["current"]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _store_in_cache(self, from_file: str, sha256: str) -> None:
+        cached = self.cached_file_path(sha256)
+        if os.path.exists(cached):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        partial = f"{cached}.{os.getpid()}.{threading.get_ident()}.part"
+        shutil.copyfile(from_file, partial)
+        os.replace(partial, cached)
+
+    def fetch(self, version: Optional[str] = None) -> str:
+        """
+        Makes a version (the champion by default) available on local disk, downloading it only when its
+        content is not cached yet. The download is verified against the manifest's SHA-256.
+
+        Output: Path of the local model file.
+        """
+        try:
+            manifest = self.get_manifest()
+            version = version or (manifest or {}).get("current")
+            if manifest is None or version not in manifest["versions"]:
+                raise ValueError(f"Model version {version} is not registered")
+            info = manifest["versions"][version]
+            cached = self.cached_file_path(info["sha256"])
+
+            with self._cache_lock:
+                if os.path.exists(cached) and os.path.getsize(cached) == info["size"]:
+                    local_hits.inc()
+                    logging.info(f"Model version {version} found in the local cache")
+                    return cached
+
+                os.makedirs(self.cache_dir, exist_ok=True)
+                partial = f"{cached}.{os.getpid()}.{threading.get_ident()}.part"
+                self.s3.download_file(self.bucket_name, info["key"], partial)
+                if file_sha256(partial) != info["sha256"]:
+                    os.remove(partial)
+                    raise ValueError(f"Downloaded model version {version} does not match its SHA-256")
+                os.replace(partial, cached)
+                downloads.inc()
+                return cached
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_model(self, version: Optional[str] = None) -> Any:
+        """
+        Loads a version (the champion by default) through the local cache.
+        """
+        try:
+            return load_object(self.fetch(version))
+        except Exception as e:
+            raise MyException(e, sys) from e
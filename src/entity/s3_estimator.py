@@ -2,56 +2,81 @@ from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.logger import logging
 from src.entity.estimator import MyModel
+from src.entity.model_registry import ModelRegistry
+import os
 import sys
+from typing import Optional
 from pandas import DataFrame
 
 
 class Proj1Estimator:
     """
-    This class is used to save and retrieve our model from s3 bucket and to do prediction
+    This class is used to save and retrieve our model from s3 bucket and to do prediction.
+    Models are stored in the versioned registry; the single model_path key is only read while the
+    registry is still empty, so buckets pushed to before the registry existed keep working.
     """
 
-    def __init__(self,bucket_name,model_path,):
+    def __init__(self,bucket_name,model_path,registry: Optional[ModelRegistry] = None):
         """
         :param bucket_name: Name of your model bucket
-        :param model_path: Location of your model in bucket
+        :param model_path: Location of your model in bucket before the registry existed
+        :param registry: Model registry to use, the bucket's default one otherwise
         """
         self.bucket_name = bucket_name
         self.s3 = SimpleStorageService()
         self.model_path = model_path
+        self.registry = registry if registry is not None else ModelRegistry(bucket_name, s3=self.s3)
         self.loaded_model:MyModel= None
 
 
     def is_model_present(self,model_path):
         logging.info("Checking If Model is Present/NotPresent")
         try:
+            if self.registry.current_version() is not None:
+                return True
             return self.s3.s3_key_path_available(bucket_name=self.bucket_name, s3_key=model_path)
         except MyException as e:
             print(e)
             return False
 
-    def load_model(self,)->MyModel:
+    def get_version(self) -> str:
         """
-        Load the model from the model_path
+        Identifies the current champion: its registry version, or the ETag of the model_path object
+        :return:
+        """
+        version = self.registry.current_version()
+        if version is not None:
+            return version
+        metadata = self.s3.get_object_metadata(self.bucket_name, self.model_path)
+        return f"{metadata['ETag']}@{metadata['LastModified']}"
+
+    def load_model(self,version: Optional[str] = None)->MyModel:
+        """
+        Load a model, from the local cache when its bytes were already downloaded
+        :param version: A version returned by get_version; by default the current champion. A registry version
+                        is loaded exactly, even if the champion has moved on since get_version was called
         :return:
         """
         logging.info("Loading the model from S3 Bucket")
+        manifest = self.registry.get_manifest()
+        if manifest is not None:
+            if version is None or version in manifest["versions"]:
+                return self.registry.load_model(version)
         return self.s3.load_model(self.model_path,bucket_name=self.bucket_name)
 
-    def save_model(self,from_file,remove:bool=False)->None:
+    def save_model(self,from_file,remove:bool=False)->str:
         """
-        Save the model to the model_path
+        Register the model as a new version in the registry and make it the champion
         :param from_file: Your local system model path
         :param remove: By default it is false that mean you will have your model locally available in your system folder
-        :return:
+        :return: The registered version
         """
         try:
             logging.info("Saving the Model.pkl")
-            self.s3.upload_file(from_file,
-                                to_filename=self.model_path,
-                                bucket_name=self.bucket_name,
-                                remove=remove
-                                )
+            version = self.registry.register(from_file)
+            if remove:
+                os.remove(from_file)
+            return version
         except Exception as e:
             raise MyException(e, sys)
 
@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.exception import MyException
+from src.logger import logging
+
+
+@dataclass
+class Stage:
+    """
+    A node of the pipeline DAG. `inputs` maps keyword arguments of `fn` to the stages whose artifacts feed them.
+    """
+    name: str
+    fn: Callable[..., Any]
+    inputs: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    started_at: float
+    finished_at: float
+    status: str
+    thread: str
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+class DagExecutor:
+    """
+    Runs a DAG of stages on a thread pool, starting each stage as soon as all of its inputs are available.
+
+    A failure stops new stages from being scheduled; stages already running are allowed to finish and the
+    first error is re-raised. Every stage's start/finish time is kept in `trace` so the critical path of a
+    run can be inspected afterwards.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int):
+        try:
+            names = [stage.name for stage in stages]
+            if len(set(names)) != len(names):
+                raise ValueError(f"Duplicate stage names in {names}")
+            for stage in stages:
+                unknown = set(stage.inputs.values()) - set(names)
+                if unknown:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stages {sorted(unknown)}")
+        except Exception as e:
+            raise MyException(e, sys) from e
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.trace: List[StageTiming] = []
+        self._trace_lock = threading.Lock()
+        self._origin = 0.0
+
+    def _run_stage(self, stage: Stage, artifacts: Dict[str, Any]) -> Any:
+        started_at = time.perf_counter()
+        status = "failed"
+        try:
+            result = stage.fn(**{argument: artifacts[source] for argument, source in stage.inputs.items()})
+            status = "completed"
+            return result
+        finally:
+            with self._trace_lock:
+                self.trace.append(StageTiming(stage.name, started_at - self._origin,
+                                              time.perf_counter() - self._origin, status,
+                                              threading.current_thread().name))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executes every stage and returns their artifacts by stage name.
+        """
+        self._origin = time.perf_counter()
+        self.trace = []
+        artifacts: Dict[str, Any] = {}
+        pending = dict(self.stages)
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-stage") as executor:
+            while pending or running:
+                if error is None:
+                    ready = [name for name, stage in pending.items()
+                             if all(source in artifacts for source in stage.inputs.values())]
+                    for name in ready:
+                        stage = pending.pop(name)
+                        running[executor.submit(self._run_stage, stage, dict(artifacts))] = name
+
+                if not running:
+                    if pending and error is None:
+                        error = ValueError(f"Dependency cycle between stages {sorted(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        logging.error(f"Pipeline stage '{name}' failed; not scheduling further stages")
+                    else:
+                        artifacts[name] = future.result()
+
+        self.log_trace()
+        if error is not None:
+            raise error
+        return artifacts
+
+    def critical_path(self) -> List[str]:
+        """
+        Chain of stages that determined the run's wall time: starting from the last stage to finish,
+        repeatedly step to the input that finished last.
+        """
+        finished = {timing.name: timing for timing in self.trace}
+        if not finished:
+            return []
+        path = [max(finished.values(), key=lambda timing: timing.finished_at).name]
+        while True:
+            sources = [finished[source] for source in set(self.stages[path[-1]].inputs.values()) if source in finished]
+            if not sources:
+                break
+            path.append(max(sources, key=lambda timing: timing.finished_at).name)
+        return path[::-1]
+
+    def trace_report(self) -> Dict[str, Any]:
+        return {
+            "stages": [{"name": timing.name, "status": timing.status, "thread": timing.thread,
+                        "started_at": round(timing.started_at, 4), "finished_at": round(timing.finished_at, 4),
+                        "duration": round(timing.duration, 4)}
+                       for timing in sorted(self.trace, key=lambda timing: timing.started_at)],
+            "critical_path": self.critical_path(),
+            "wall_time": round(max((timing.finished_at for timing in self.trace), default=0.0), 4),
+        }
+
+    def log_trace(self) -> None:
+        for timing in sorted(self.trace, key=lambda timing: timing.started_at):
+            logging.info(f"Stage {timing.name:<24} {timing.status:<9} start={timing.started_at:8.3f}s "
+                         f"duration={timing.duration:8.3f}s thread={timing.thread}")
+        logging.info(f"Critical path: {' -> '.join(self.critical_path())}")
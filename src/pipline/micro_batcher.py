@@ -0,0 +1,139 @@
+import asyncio
+import sys
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.exception import MyException
+from src.logger import logging
+from src.utils.metrics import metrics
+
+
+batch_size_histogram = metrics.histogram(
+    "predict_micro_batch_size", buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+    description="Rows scored per micro-batch"
+)
+queue_depth_histogram = metrics.histogram(
+    "predict_micro_batch_queue_depth", buckets=[0, 1, 2, 4, 8, 16, 32, 64, 128, 256],
+    description="Requests still waiting in the queue when a micro-batch is dispatched"
+)
+
+
+@dataclass
+class _PendingRequest:
+    data: Dict[str, List[Any]]
+    n_rows: int
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """
+    Collects concurrent prediction requests for up to `max_wait_ms` or `max_batch_size` rows and
+    scores them with one vectorized call, then hands each caller back its own rows.
+    """
+
+    def __init__(self, predict_fn: Callable[[Dict[str, List[Any]]], Tuple[np.ndarray, np.ndarray]],
+                 max_batch_size: int, max_wait_ms: float, executor: Optional[Executor] = None):
+        """
+        :param predict_fn: Scores a column -> values dict and returns (predictions, probabilities) in row order
+        :param max_batch_size: Maximum number of rows in one micro-batch
+        :param max_wait_ms: Longest time the first request of a batch waits for company
+        :param executor: Where predict_fn runs; None uses the event loop's default thread pool
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Starts the batching worker on the running event loop.
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(), name="predict-micro-batcher")
+
+    async def stop(self) -> None:
+        """
+        Stops the batching worker and fails any request that is still queued.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Micro-batcher stopped before the request was scored"))
+
+    async def submit(self, data: Dict[str, List[Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Queues rows given as column -> values (e.g. VehicleData.get_vehicle_data_as_dict())
+        and waits for their (predictions, probabilities).
+        """
+        if self._worker is None:
+            raise RuntimeError("Micro-batcher is not running")
+
+        n_rows = len(next(iter(data.values())))
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(data=data, n_rows=n_rows, future=future))
+        return await future
+
+    async def _collect(self) -> List[_PendingRequest]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        n_rows = batch[0].n_rows
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        while n_rows < self.max_batch_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                pending = self._queue.get_nowait()
+            batch.append(pending)
+            n_rows += pending.n_rows
+
+        return batch
+
+    def _score(self, batch: List[_PendingRequest]) -> Tuple[np.ndarray, np.ndarray]:
+        columns = batch[0].data.keys()
+        merged = {column: [value for pending in batch for value in pending.data[column]] for column in columns}
+        return self.predict_fn(merged)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            n_rows = sum(pending.n_rows for pending in batch)
+            batch_size_histogram.observe(n_rows)
+            queue_depth_histogram.observe(self._queue.qsize())
+
+            try:
+                predictions, probabilities = await loop.run_in_executor(self.executor, self._score, batch)
+            except Exception as e:
+                logging.error(f"Micro-batch of {n_rows} rows failed", exc_info=True)
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(MyException(e, sys))
+                continue
+
+            offset = 0
+            for pending in batch:
+                end = offset + pending.n_rows
+                if not pending.future.done():
+                    pending.future.set_result((predictions[offset:end], probabilities[offset:end]))
+                offset = end
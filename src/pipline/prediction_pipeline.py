@@ -1,8 +1,15 @@
 import sys
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN, PREDICTION_BATCH_MAX_ROWS, PREDICTION_BATCH_MAX_ERROR_ROWS
 from src.entity.config_entity import VehiclePredictorConfig
-from src.entity.s3_estimator import Proj1Estimator
+from src.entity.model_cache import ModelCache
 from src.exception import MyException
 from src.logger import logging
+from src.utils.main_utils import read_yaml_file
 from pandas import DataFrame
 
 class VehicleData:
@@ -67,6 +74,86 @@ class VehicleData:
         except Exception as e:
             raise MyException(e, sys) from e
     
+class VehicleBatchData:
+    def __init__(self, data: Union[List[Dict[str, Any]], Dict[str, List[Any]]]):
+        """
+
+        Description: Batch of vehicle records for bulk scoring
+        Input: Either a list of row dicts or a dict of column -> list of values
+
+        """
+        try:
+            self.schema = read_yaml_file(SCHEMA_FILE_PATH)
+            self.dataframe = DataFrame(data)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _feature_columns(self) -> List[Tuple[str, str]]:
+        columns = []
+        for column_dict in self.schema["columns"]:
+            columns.extend(column_dict.items())
+        return [(name, dtype) for name, dtype in columns if name != TARGET_COLUMN]
+
+    def validate(self) -> List[Dict[str, Any]]:
+        """
+
+        This method validates every row of the batch at once, one vectorized check per column.
+        Output: Returns a list of errors, each with the column, the number of bad rows and a sample of their indices
+
+        """
+        try:
+            errors = []
+            n_rows = len(self.dataframe)
+
+            if n_rows == 0:
+                return [{"error": "Batch contains no rows"}]
+            if n_rows > PREDICTION_BATCH_MAX_ROWS:
+                return [{"error": f"Batch has {n_rows} rows, the maximum is {PREDICTION_BATCH_MAX_ROWS}"}]
+
+            allowed_categories = self.schema.get("allowed_categories", {})
+
+            for column, dtype in self._feature_columns():
+                if column not in self.dataframe.columns:
+                    errors.append({"column": column, "error": "Missing column", "count": n_rows})
+                    continue
+
+                values = self.dataframe[column]
+                if dtype == "category":
+                    allowed = allowed_categories.get(column)
+                    invalid = values.isna() if allowed is None else ~values.isin(allowed)
+                else:
+                    invalid = pd.to_numeric(values, errors="coerce").isna()
+
+                invalid_count = int(invalid.sum())
+                if invalid_count:
+                    errors.append({
+                        "column": column,
+                        "error": f"Expected {dtype}" if dtype != "category" else "Value outside allowed categories",
+                        "count": invalid_count,
+                        "rows": np.flatnonzero(invalid.to_numpy())[:PREDICTION_BATCH_MAX_ERROR_ROWS].tolist(),
+                    })
+
+            return errors
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_vehicle_input_data_frame(self) -> DataFrame:
+        """
+
+        This method returns the batch as a typed DataFrame in the column order the model was trained on
+
+        """
+        try:
+            columns = self._feature_columns()
+            dataframe = self.dataframe[[name for name, _ in columns]].copy()
+            for column, dtype in columns:
+                if dtype != "category":
+                    dataframe[column] = pd.to_numeric(dataframe[column])
+            return dataframe
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
 class VehicleDataClassifier:
 
     def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig() ) -> None:
@@ -80,6 +167,19 @@ class VehicleDataClassifier:
         except Exception as e:
             raise MyException(e, sys) from e
         
+    def get_model_cache(self) -> ModelCache:
+        """
+        
+        This method returns the process-wide cache holding the production model
+
+        """
+        return ModelCache.get_instance(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_path=self.prediction_pipeline_config.model_file_path,
+            refresh_interval=self.prediction_pipeline_config.model_refresh_interval,
+            use_compiled_forest=self.prediction_pipeline_config.use_compiled_forest
+        )
+
     def predict(self, dataframe) -> str:
         """
         
@@ -88,10 +188,7 @@ class VehicleDataClassifier:
         """
         try:
             logging.info("Entered the Prediction_Method of VehicleDataClassifier")
-            model = Proj1Estimator(
-                bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                model_path=self.prediction_pipeline_config.model_file_path
-            )
+            model = self.get_model_cache().get_model()
             logging.info("Going for Prediction")
             result = model.predict(dataframe)
             logging.info("Result is Loaded")
@@ -99,6 +196,18 @@ class VehicleDataClassifier:
         
         except Exception as e:
             raise MyException(e, sys) from e
-        
 
-        
+    def predict_batch(self, dataframe: Union[DataFrame, Dict[str, List[Any]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+
+        This method scores a whole batch (DataFrame or column -> values dict) in one vectorized pass
+        and returns (predictions, probabilities) in input order
+
+        """
+        try:
+            logging.info("Entered the batch prediction method of VehicleDataClassifier")
+            model = self.get_model_cache().get_model()
+            return model.predict_with_proba(dataframe)
+
+        except Exception as e:
+            raise MyException(e, sys) from e
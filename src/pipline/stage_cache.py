@@ -0,0 +1,127 @@
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+import inspect
+import typing
+from typing import Any, Optional, Type
+
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+
+
+def compute_key(*parts: Any) -> str:
+    """
+    Stable sha256 of JSON-serialisable parts; anything else is hashed through str().
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(file_path: str) -> str:
+    """
+    Content hash of a file, or "missing" when it does not exist.
+    """
+    if not os.path.exists(file_path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_fingerprint(*objects: Any) -> str:
+    """
+    Hash of the source files defining `objects` (classes, functions or modules),
+    so editing a stage's code invalidates its cached artifacts.
+    """
+    return compute_key(*(file_fingerprint(inspect.getsourcefile(obj)) for obj in objects))
+
+
+def config_fingerprint(config: Any) -> dict:
+    """
+    Settings of a config object that affect a stage's output. Paths and directories are left out because
+    they change with every run's timestamp; private class-level hyperparameters are included.
+    """
+    values = {}
+    for name in dir(config):
+        if name.startswith("__") or name.endswith(("_dir", "_path")):
+            continue
+        value = getattr(config, name)
+        if not callable(value):
+            values[name] = value
+    return values
+
+
+class StageCache:
+    """
+    Maps (stage name, input key) to the artifact a previous run produced for those inputs.
+
+    Entries are small YAML files holding the artifact's persisted fields; in-memory fields are never
+    stored. An entry is only served while every file it points to still exists.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, stage_name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage_name, f"{key}.yaml")
+
+    @staticmethod
+    def _persisted_fields(artifact_cls: Type) -> list:
+        # In-memory fields are declared with compare=False
+        return [field for field in dataclasses.fields(artifact_cls) if field.compare]
+
+    @classmethod
+    def _to_dict(cls, artifact: Any) -> dict:
+        values = {}
+        for field in cls._persisted_fields(type(artifact)):
+            value = getattr(artifact, field.name)
+            if dataclasses.is_dataclass(value):
+                value = cls._to_dict(value)
+            elif hasattr(value, "item"):
+                # NumPy scalars, e.g. metric values, are not YAML-safe
+                value = value.item()
+            values[field.name] = value
+        return values
+
+    @classmethod
+    def _from_dict(cls, artifact_cls: Type, values: dict) -> Any:
+        hints = typing.get_type_hints(artifact_cls)
+        kwargs = {}
+        for field in cls._persisted_fields(artifact_cls):
+            value = values[field.name]
+            field_type = hints.get(field.name)
+            kwargs[field.name] = cls._from_dict(field_type, value) if dataclasses.is_dataclass(field_type) else value
+        return artifact_cls(**kwargs)
+
+    def get(self, stage_name: str, key: str, artifact_cls: Type) -> Optional[Any]:
+        try:
+            entry_path = self._entry_path(stage_name, key)
+            if not os.path.exists(entry_path):
+                return None
+            values = read_yaml_file(entry_path)
+            missing = [path for name, path in values.items()
+                       if name.endswith("_path") and isinstance(path, str) and path and not os.path.exists(path)]
+            if missing:
+                logging.info(f"Stage cache entry for {stage_name} points to missing files {missing}; ignoring it")
+                return None
+            artifact = self._from_dict(artifact_cls, values)
+            logging.info(f"Stage cache hit for {stage_name} ({key[:12]}): {artifact}")
+            return artifact
+        except Exception as e:
+            logging.warning(f"Could not read stage cache entry for {stage_name}: {e}")
+            return None
+
+    def put(self, stage_name: str, key: str, artifact: Any) -> None:
+        try:
+            entry_path = self._entry_path(stage_name, key)
+            tmp_entry_path = entry_path + ".tmp"
+            write_yaml_file(tmp_entry_path, self._to_dict(artifact))
+            os.replace(tmp_entry_path, entry_path)
+            logging.info(f"Recorded stage cache entry for {stage_name} ({key[:12]})")
+        except Exception as e:
+            raise MyException(e, sys) from e
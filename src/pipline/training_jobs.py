@@ -0,0 +1,135 @@
+import multiprocessing
+import sys
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.constants import TRAINING_JOB_MAX_WORKERS
+from src.exception import MyException
+from src.logger import logging
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _run_training_job(status, pipeline_class: Optional[type] = None) -> None:
+    """
+    Entry point executed in the training worker process. `status` is a manager dict proxy shared
+    with the API process, so every update below is visible to the status endpoint immediately.
+    `pipeline_class` replaces TrainPipeline; it must be importable by the worker.
+    """
+    if pipeline_class is None:
+        # Imported here so the API process does not pay for the full training stack on startup
+        from src.pipline.training_pipeline import TrainPipeline
+        pipeline_class = TrainPipeline
+
+    # Independent stages report from different threads
+    progress_lock = threading.Lock()
+
+    def on_progress(stage_name: str, stage_status: str) -> None:
+        with progress_lock:
+            stages = list(status["stages"])
+            if stage_status == "running":
+                stages.append({"name": stage_name, "status": stage_status, "started_at": _now(), "finished_at": None})
+                status["current_stage"] = stage_name
+            else:
+                index = max(i for i, stage in enumerate(stages) if stage["name"] == stage_name)
+                stages[index] = {**stages[index], "status": stage_status, "finished_at": _now()}
+            # Proxies only see top-level assignments, so the list is written back as a whole
+            status["stages"] = stages
+
+    status["status"] = "running"
+    status["started_at"] = _now()
+    try:
+        pipeline_class(progress_callback=on_progress).run_pipeline()
+        status["status"] = "succeeded"
+    except Exception as e:
+        status["status"] = "failed"
+        status["error"] = str(e)
+    finally:
+        status["current_stage"] = None
+        status["finished_at"] = _now()
+
+
+class TrainingJobManager:
+    """
+    Runs TrainPipeline jobs in a separate worker process so training never blocks the API's event loop.
+    Each job runs in a fresh process, so it also gets its own timestamped artifact directory.
+    """
+
+    def __init__(self, max_workers: int = TRAINING_JOB_MAX_WORKERS, pipeline_class: Optional[type] = None):
+        """
+        :param max_workers: Number of training jobs allowed to run at the same time; the rest are queued
+        :param pipeline_class: Pipeline run by the workers, TrainPipeline by default
+        """
+        self.max_workers = max_workers
+        self.pipeline_class = pipeline_class
+        self._manager = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Any] = {}
+
+    def start(self) -> None:
+        try:
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                                 max_tasks_per_child=1)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def submit(self) -> str:
+        """
+        Queues a training run and returns its job id without waiting for it.
+        """
+        try:
+            if self._executor is None:
+                raise RuntimeError("Training job manager is not running")
+
+            job_id = uuid.uuid4().hex
+            status = self._manager.dict({
+                "job_id": job_id,
+                "status": "queued",
+                "current_stage": None,
+                "stages": [],
+                "error": None,
+                "submitted_at": _now(),
+                "started_at": None,
+                "finished_at": None,
+            })
+            self._jobs[job_id] = status
+
+            future = self._executor.submit(_run_training_job, status, self.pipeline_class)
+            future.add_done_callback(lambda done: self._on_job_done(job_id, done))
+            logging.info(f"Training job {job_id} submitted")
+            return job_id
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _on_job_done(self, job_id: str, future: Future) -> None:
+        # Covers failures the worker could not report itself (killed process, broken pool, cancelled)
+        if future.cancelled() or future.exception() is not None:
+            status = self._jobs[job_id]
+            error = "cancelled" if future.cancelled() else str(future.exception())
+            try:
+                status.update({"status": "failed", "error": error, "current_stage": None, "finished_at": _now()})
+            except Exception:
+                logging.error(f"Could not record failure of training job {job_id}", exc_info=True)
+        logging.info(f"Training job {job_id} finished")
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a plain-dict snapshot of the job's status, or None for an unknown job id.
+        """
+        status = self._jobs.get(job_id)
+        return dict(status) if status is not None else None
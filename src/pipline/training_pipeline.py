@@ -1,16 +1,22 @@
 import sys
+from typing import Any, Callable, List, Optional
+
 from src.exception import MyException
 from src.logger import logging
 
 from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
+from src.components.validation_engine import ValidationEngine
+from src.components.data_drift import DataDrift
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 from src.components.model_evaluation import ModelEvaluation
 from src.components.model_pusher import ModelPusher
 
-from src.entity.config_entity import (DataIngestionConfig,
+from src.entity.config_entity import (training_pipeline_config,
+                                          DataIngestionConfig,
                                           DataValidationConfig,
+                                          DataDriftConfig,
                                           DataTransformationConfig,
                                           ModelTrainerConfig,
                                           ModelEvaluationConfig,
@@ -18,21 +24,46 @@ from src.entity.config_entity import (DataIngestionConfig,
                                           
 from src.entity.artifact_entity import (DataIngestionArtifact,
                                             DataValidationArtifact,
+                                            DataDriftArtifact,
                                             DataTransformationArtifact,
                                             ModelTrainerArtifact,
                                             ModelEvaluationArtifact,
-                                            ModelPusherArtifact)
+                                            ModelPusherArtifact,
+                                            ProductionModelArtifact)
+from src.utils.artifact_writer import ArtifactWriter
+from src.utils.main_utils import write_yaml_file
+from src.pipline.dag_executor import DagExecutor, Stage
+from src.pipline.stage_cache import StageCache, compute_key, file_fingerprint, code_fingerprint, config_fingerprint
+from src.data_access.proj1_data import Proj1Data
+from src.constants import SCHEMA_FILE_PATH
+from src.components.transformers import GenderMapper
+from src.components.resampling import ResamplingStrategy
+from src.components.hyperparameter_search import SuccessiveHalvingSearch
+from src.components.evaluation_engine import metrics_from_scores
+from src.data_access.table_storage import iter_table, write_table
+from src.entity.estimator import MyModel
+from src.entity.feature_sketches import QuantileSketch
 
 
 
 class TrainPipeline:
-    def __init__(self):
+    def __init__(self, progress_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        :param progress_callback: Optional hook called as progress_callback(stage_name, status) where
+                                  status is "running", "completed", "cached", "skipped" or "failed"
+        """
+        self.progress_callback = progress_callback
         self.data_ingestion_config = DataIngestionConfig()
         self.data_validation_config = DataValidationConfig()
+        self.data_drift_config = DataDriftConfig()
         self.data_transformation_config = DataTransformationConfig()
         self.model_trainer_config = ModelTrainerConfig()
         self.model_evaluation_config = ModelEvaluationConfig()
         self.model_pusher_config = ModelPusherConfig()
+        # Set for the duration of run_pipeline when in-memory handoff is enabled
+        self.artifact_writer: Optional[ArtifactWriter] = None
+        self.stage_cache = (StageCache(training_pipeline_config.stage_cache_dir)
+                            if training_pipeline_config.stage_cache_enabled else None)
 
 
     
@@ -43,7 +74,8 @@ class TrainPipeline:
         try:
             logging.debug("Entered the start_data_ingestion method of TrainPipeline class")
             logging.info("Getting the data from mongodb")
-            data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
+            data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config,
+                                           artifact_writer=self.artifact_writer)
             data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
             logging.debug("Got the train_set and test_set from mongodb")
             logging.debug("Exited the start_data_ingestion method of TrainPipeline class")
@@ -71,26 +103,47 @@ class TrainPipeline:
         except Exception as e:
             raise MyException(e, sys) from e
         
-    def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
+    def start_data_drift(self, data_ingestion_artifact: DataIngestionArtifact,
+                         data_validation_artifact: DataValidationArtifact,
+                         production_model_artifact: ProductionModelArtifact) -> DataDriftArtifact:
+        """
+        This method of TrainPipeline class is responsible for comparing the new data with the production model's training data
+        """
+        try:
+            data_drift = DataDrift(data_ingestion_artifact=data_ingestion_artifact,
+                                   data_validation_artifact=data_validation_artifact,
+                                   data_drift_config=self.data_drift_config,
+                                   production_model_artifact=production_model_artifact)
+            return data_drift.initiate_data_drift()
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact,
+                                  data_drift_artifact: Optional[DataDriftArtifact] = None) -> DataTransformationArtifact:
         """
-        This method of TrainPipeline class is responsible for starting data transformation component
+        This method of TrainPipeline class is responsible for starting data transformation component.
+        data_drift_artifact is only an input so that run_stage can skip retraining when drift gating says so.
         """
         try:
             data_transformation = DataTransformation(data_ingestion_artifact=data_ingestion_artifact,
                                                      data_transformation_config=self.data_transformation_config,
-                                                     data_validation_artifact=data_validation_artifact)
+                                                     data_validation_artifact=data_validation_artifact,
+                                                     artifact_writer=self.artifact_writer)
             data_transformation_artifact = data_transformation.initiate_data_transformation()
             return data_transformation_artifact
         except Exception as e:
             raise MyException(e, sys)
         
-    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
+    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact,
+                            data_drift_artifact: Optional[DataDriftArtifact] = None) -> ModelTrainerArtifact:
         """
         This method of TrainPipeline class is responsible for starting model training
         """
         try:
             model_trainer = ModelTrainer(data_transformation_artifact=data_transformation_artifact,
-                                         model_trainer_config=self.model_trainer_config
+                                         model_trainer_config=self.model_trainer_config,
+                                         artifact_writer=self.artifact_writer,
+                                         data_drift_artifact=data_drift_artifact
                                          )
             model_trainer_artifact = model_trainer.initiate_model_trainer()
             return model_trainer_artifact
@@ -98,25 +151,43 @@ class TrainPipeline:
         except Exception as e:
             raise MyException(e, sys)
 
+    def start_production_model_fetch(self) -> ProductionModelArtifact:
+        """
+        This method of TrainPipeline class is responsible for fetching the current production model from S3
+        """
+        try:
+            return ModelEvaluation.fetch_production_model(self.model_evaluation_config)
+        except Exception as e:
+            raise MyException(e, sys)
+
     def start_model_evaluation(self, data_ingestion_artifact: DataIngestionArtifact,
-                               model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
+                               model_trainer_artifact: ModelTrainerArtifact,
+                               production_model_artifact: Optional[ProductionModelArtifact] = None
+                               ) -> ModelEvaluationArtifact:
         """
         This method of TrainPipeline class is responsible for starting modle evaluation
         """
         try:
             model_evaluation = ModelEvaluation(model_eval_config=self.model_evaluation_config,
                                                data_ingestion_artifact=data_ingestion_artifact,
-                                               model_trainer_artifact=model_trainer_artifact)
+                                               model_trainer_artifact=model_trainer_artifact,
+                                               production_model_artifact=production_model_artifact)
             model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
             return model_evaluation_artifact
         except Exception as e:
             raise MyException(e, sys)
 
-    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact) -> ModelPusherArtifact:
+    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact) -> Optional[ModelPusherArtifact]:
         """
         This method of TrainPipeline class is responsible for starting model pushing
         """
         try:
+            if not model_evaluation_artifact.is_model_accepted:
+                logging.info(f"Model not accepted.")
+                return None
+            # The pusher uploads the model file, so pending background writes must land first
+            if self.artifact_writer is not None:
+                self.artifact_writer.flush()
             model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,
                                        model_pusher_config=self.model_pusher_config
                                        )
@@ -127,21 +198,145 @@ class TrainPipeline:
 
 
 
+    def get_stage_keys(self) -> dict:
+        """
+        This method of TrainPipeline class hashes the inputs of each cacheable stage. Every key chains the key of
+        the stage before it, so a change upstream invalidates everything downstream. Evaluation and pushing depend
+        on the production model in S3 and are never cached.
+        """
+        try:
+            data_fingerprint = Proj1Data().get_collection_fingerprint(
+                self.data_ingestion_config.collection_name,
+                partition_key=self.data_ingestion_config.export_partition_key)
+            schema_fingerprint = file_fingerprint(SCHEMA_FILE_PATH)
+
+            keys = {}
+            keys["data_ingestion"] = compute_key("data_ingestion", data_fingerprint,
+                                                 config_fingerprint(self.data_ingestion_config),
+                                                 code_fingerprint(DataIngestion, Proj1Data, write_table))
+            keys["data_validation"] = compute_key("data_validation", keys["data_ingestion"], schema_fingerprint,
+                                                  config_fingerprint(self.data_validation_config),
+                                                  code_fingerprint(DataValidation, ValidationEngine, iter_table))
+            keys["data_transformation"] = compute_key("data_transformation", keys["data_validation"],
+                                                      schema_fingerprint,
+                                                      config_fingerprint(self.data_transformation_config),
+                                                      code_fingerprint(DataTransformation, GenderMapper,
+                                                                       ResamplingStrategy))
+            keys["model_trainer"] = compute_key("model_trainer", keys["data_transformation"],
+                                                config_fingerprint(self.model_trainer_config),
+                                                file_fingerprint(self.model_trainer_config.model_config_file_path),
+                                                code_fingerprint(ModelTrainer, MyModel, DataDrift, QuantileSketch,
+                                                                 SuccessiveHalvingSearch, metrics_from_scores))
+            return keys
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_stages(self, keys: dict) -> List[Stage]:
+        """
+        This method of TrainPipeline class declares the pipeline as a DAG. Each stage lists the stages whose
+        artifacts it consumes, so the production model download overlaps ingestion and validation. Drift detection
+        needs the production model's sketches and sits between validation and transformation.
+        """
+        def stage(name: str, method: Callable[..., Any], artifact_cls: Optional[type] = None,
+                  **inputs: str) -> Stage:
+            return Stage(name=name,
+                         fn=lambda **kwargs: self.run_stage(name, method, cache_key=keys.get(name),
+                                                            artifact_cls=artifact_cls, **kwargs),
+                         inputs=inputs)
+
+        return [
+            stage("data_ingestion", self.start_data_ingestion, DataIngestionArtifact),
+            stage("data_validation", self.start_data_validation, DataValidationArtifact,
+                  data_ingestion_artifact="data_ingestion"),
+            stage("production_model_fetch", self.start_production_model_fetch),
+            stage("data_drift", self.start_data_drift,
+                  data_ingestion_artifact="data_ingestion", data_validation_artifact="data_validation",
+                  production_model_artifact="production_model_fetch"),
+            stage("data_transformation", self.start_data_transformation, DataTransformationArtifact,
+                  data_ingestion_artifact="data_ingestion", data_validation_artifact="data_validation",
+                  data_drift_artifact="data_drift"),
+            stage("model_trainer", self.start_model_trainer, ModelTrainerArtifact,
+                  data_transformation_artifact="data_transformation", data_drift_artifact="data_drift"),
+            stage("model_evaluation", self.start_model_evaluation,
+                  data_ingestion_artifact="data_ingestion", model_trainer_artifact="model_trainer",
+                  production_model_artifact="production_model_fetch"),
+            stage("model_pusher", self.start_model_pusher, model_evaluation_artifact="model_evaluation"),
+        ]
+
+    @staticmethod
+    def get_skip_reason(inputs: dict) -> Optional[str]:
+        """
+        This method of TrainPipeline class decides whether a stage should be skipped: when an upstream stage was
+        skipped (its artifact is None), or when drift gating found no reason to retrain.
+        """
+        for name, artifact in inputs.items():
+            if artifact is None:
+                return f"no {name} was produced"
+            if isinstance(artifact, DataDriftArtifact) and not artifact.retraining_required:
+                return f"retraining is gated on drift and {artifact.message.lower()}"
+        return None
+
+    def run_stage(self, stage_name: str, stage_method: Callable[..., Any], cache_key: Optional[str] = None,
+                  artifact_cls: Optional[type] = None, **kwargs) -> Any:
+        """
+        This method of TrainPipeline class runs one stage and reports its progress to the progress callback.
+        When a cache key is given, a matching artifact from an earlier run is returned instead of running the stage,
+        and a freshly produced artifact is recorded once its files are on disk. A skipped stage returns None.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(stage_name, "running")
+
+        skip_reason = self.get_skip_reason(kwargs)
+        if skip_reason is not None:
+            logging.info(f"Skipping stage {stage_name}: {skip_reason}")
+            if self.progress_callback is not None:
+                self.progress_callback(stage_name, "skipped")
+            return None
+
+        use_cache = self.stage_cache is not None and cache_key is not None
+        if use_cache:
+            artifact = self.stage_cache.get(stage_name, cache_key, artifact_cls)
+            if artifact is not None:
+                if self.progress_callback is not None:
+                    self.progress_callback(stage_name, "cached")
+                return artifact
+
+        try:
+            artifact = stage_method(**kwargs)
+        except Exception:
+            if self.progress_callback is not None:
+                self.progress_callback(stage_name, "failed")
+            raise
+
+        if use_cache:
+            if self.artifact_writer is not None:
+                self.artifact_writer.after_pending(self.stage_cache.put, stage_name, cache_key, artifact)
+            else:
+                self.stage_cache.put(stage_name, cache_key, artifact)
+        if self.progress_callback is not None:
+            self.progress_callback(stage_name, "completed")
+        return artifact
+
     def run_pipeline(self, ) -> None:
         """
-        This method of TrainPipeline class is responsible for running complete pipeline
+        This method of TrainPipeline class is responsible for running complete pipeline as a DAG of stages
+        and writing the per-stage timing trace next to the run's artifacts
         """
+        if training_pipeline_config.in_memory_handoff:
+            self.artifact_writer = ArtifactWriter(max_workers=training_pipeline_config.artifact_writer_workers)
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_ingestion_artifact=data_ingestion_artifact, data_validation_artifact=data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
-            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
-                                                                    model_trainer_artifact=model_trainer_artifact)
-            if not model_evaluation_artifact.is_model_accepted:
-                logging.info(f"Model not accepted.")
-                return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
-            
+            # With the cache on, a re-run after a failure resumes at the first stage whose inputs changed
+            keys = self.get_stage_keys() if self.stage_cache is not None else {}
+            executor = DagExecutor(self.get_stages(keys), max_workers=training_pipeline_config.max_parallel_stages)
+            try:
+                executor.run()
+            finally:
+                write_yaml_file(training_pipeline_config.trace_file_path, executor.trace_report())
+
         except Exception as e:
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
+        finally:
+            # Every artifact produced so far is on disk before the run returns, even when a stage failed
+            if self.artifact_writer is not None:
+                artifact_writer, self.artifact_writer = self.artifact_writer, None
+                artifact_writer.shutdown()
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Benchmarks CompiledForest against RandomForestClassifier.predict_proba.
+
+Not collected by pytest. Run from the project root with:
+    python -m src.tests.benchmark_compiled_forest
+"""
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.constants import (MODEL_TRAINER_N_ESTIMATORS, MODEL_TRAINER_MIN_SAMPLES_SPLIT, MODEL_TRAINER_MIN_SAMPLES_LEAF,
+                           MIN_SAMPLES_SPLIT_MAX_DEPTH, MIN_SAMPLES_SPLIT_CRITERION, MIN_SAMPLES_SPLIT_RANDOM_STATE)
+from src.entity.compiled_forest import CompiledForest
+
+BATCH_SIZES = [1, 64, 4096, 1_000_000]
+N_FEATURES = 12
+
+
+def best_of(function, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    X_train = rng.normal(size=(50_000, N_FEATURES))
+    y_train = (X_train[:, 0] + X_train[:, 3] * X_train[:, 5] + rng.normal(scale=0.5, size=50_000) > 0).astype(int)
+
+    # Same hyperparameters as the production trainer
+    forest = RandomForestClassifier(
+        n_estimators=MODEL_TRAINER_N_ESTIMATORS,
+        min_samples_split=MODEL_TRAINER_MIN_SAMPLES_SPLIT,
+        min_samples_leaf=MODEL_TRAINER_MIN_SAMPLES_LEAF,
+        max_depth=MIN_SAMPLES_SPLIT_MAX_DEPTH,
+        criterion=MIN_SAMPLES_SPLIT_CRITERION,
+        random_state=MIN_SAMPLES_SPLIT_RANDOM_STATE,
+    ).fit(X_train, y_train)
+    compiled = CompiledForest.from_estimator(forest)
+
+    print(f"{'batch':>10} {'sklearn (ms)':>14} {'compiled (ms)':>14} {'speedup':>9} {'identical':>10}")
+    for batch_size in BATCH_SIZES:
+        X = rng.normal(size=(batch_size, N_FEATURES))
+        repeats = 3 if batch_size >= 1_000_000 else 20
+
+        sklearn_time = best_of(lambda: forest.predict_proba(X), repeats)
+        compiled_time = best_of(lambda: compiled.predict_proba(X), repeats)
+        identical = np.array_equal(forest.predict_proba(X), compiled.predict_proba(X))
+
+        print(f"{batch_size:>10} {sklearn_time * 1e3:>14.3f} {compiled_time * 1e3:>14.3f} "
+              f"{sklearn_time / compiled_time:>8.1f}x {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
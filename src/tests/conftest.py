@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.components.data_transformation import DataTransformation
+from src.entity.estimator import MyModel
+
+
+def make_vehicle_dataframe(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic rows shaped like the Proj1-Data collection (including the Response target)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(1, n_rows + 1),
+        "Gender": rng.choice(["Male", "Female"], n_rows),
+        "Age": rng.integers(20, 85, n_rows),
+        "Driving_License": rng.integers(0, 2, n_rows),
+        "Region_Code": rng.integers(0, 53, n_rows).astype(float),
+        "Previously_Insured": rng.integers(0, 2, n_rows),
+        "Vehicle_Age": rng.choice(["< 1 Year", "1-2 Year", "> 2 Years"], n_rows),
+        "Vehicle_Damage": rng.choice(["Yes", "No"], n_rows),
+        "Annual_Premium": rng.uniform(2630, 60000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 164, n_rows).astype(float),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Response": rng.integers(0, 2, n_rows),
+    })
+
+
+@pytest.fixture(scope="session")
+def vehicle_df() -> pd.DataFrame:
+    return make_vehicle_dataframe(500)
+
+
+@pytest.fixture(scope="session")
+def fitted_model(vehicle_df) -> MyModel:
+    X, y = vehicle_df.drop(columns=["Response"]), vehicle_df["Response"]
+    pipeline = DataTransformation(None, None, None).get_preprocessor()
+    features = pipeline.fit_transform(X)
+    forest = RandomForestClassifier(n_estimators=5, max_depth=6, random_state=101).fit(features, y)
+    return MyModel(preprocessing_object=pipeline, trained_model_object=forest)
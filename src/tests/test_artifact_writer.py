@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.components.data_transformation import DataTransformation
+from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+from src.entity.config_entity import DataTransformationConfig
+from src.exception import MyException
+from src.utils.artifact_writer import ArtifactWriter, write_artifact
+from src.utils.main_utils import load_numpy_array_data
+from tests.conftest import make_vehicle_dataframe
+
+
+# Test 1: writes run in the background and flush surfaces failures
+def test_flush_waits_and_raises():
+    writer = ArtifactWriter()
+    written = []
+    write_artifact(writer, written.append, 1)
+    write_artifact(None, written.append, 2)
+    writer.flush()
+    assert sorted(written) == [1, 2]
+
+    def fail():
+        raise IOError("disk full")
+
+    writer.submit(fail)
+    with pytest.raises(MyException):
+        writer.shutdown()
+
+
+# Test 2: transformation works from in-memory frames and hands its arrays on
+def test_transformation_in_memory_handoff(tmp_path):
+    train_df, test_df = make_vehicle_dataframe(300, seed=1), make_vehicle_dataframe(100, seed=2)
+    ingestion_artifact = DataIngestionArtifact(trained_file_path=str(tmp_path / "missing_train.parquet"),
+                                               test_file_path=str(tmp_path / "missing_test.parquet"),
+                                               train_df=train_df, test_df=test_df)
+    validation_artifact = DataValidationArtifact(validation_status=True, message="", validation_report_file_path="")
+    config = DataTransformationConfig(transformed_train_file_path=str(tmp_path / "train.npy"),
+                                      transformed_test_file_path=str(tmp_path / "test.npy"),
+                                      transformed_train_target_file_path=str(tmp_path / "train_target.npy"),
+                                      transformed_test_target_file_path=str(tmp_path / "test_target.npy"),
+                                      transformed_object_file_path=str(tmp_path / "preprocessing.pkl"),
+                                      unresampled_train_file_path=str(tmp_path / "train_unresampled.npy"),
+                                      unresampled_train_target_file_path=str(tmp_path / "train_unresampled_target.npy"))
+    writer = ArtifactWriter()
+
+    artifact = DataTransformation(ingestion_artifact, validation_artifact, config,
+                                  artifact_writer=writer).initiate_data_transformation()
+    writer.shutdown()
+
+    assert artifact.preprocessing_object is not None
+    assert artifact.test_features.shape[0] == artifact.test_target.shape[0] == 100
+    assert np.array_equal(load_numpy_array_data(config.transformed_test_file_path), artifact.test_features)
+    assert os.path.exists(config.transformed_object_file_path)
@@ -0,0 +1,83 @@
+import io
+import pickle
+
+import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from src.cloud_storage.aws_storage import SimpleStorageService, downloaded_bytes, head_requests, uploaded_bytes
+from src.exception import MyException
+
+
+def _storage(mocker, transfer_config=None):
+    mocker.patch("src.cloud_storage.aws_storage.S3Client")
+    SimpleStorageService.metadata_cache.clear()
+    return SimpleStorageService(transfer_config)
+
+
+# Test 1: small models are unpickled from the response stream, never read into one buffer
+def test_load_model_streams_small_objects(mocker):
+    storage = _storage(mocker)
+    payload = pickle.dumps({"model": list(range(100))})
+    body = mocker.MagicMock(wraps=io.BytesIO(payload))
+    storage.s3_client.head_object.return_value = {"ETag": "e", "LastModified": "t", "ContentLength": len(payload)}
+    storage.s3_client.get_object.return_value = {"Body": body}
+    before = downloaded_bytes.value
+
+    assert storage.load_model("model.pkl", bucket_name="bucket") == {"model": list(range(100))}
+
+    assert all(call.args for call in body.read.call_args_list)
+    body.close.assert_called_once()
+    assert downloaded_bytes.value - before == len(payload)
+
+
+# Test 2: large models go through ranged parallel downloads, uploads through multipart, both with the config
+def test_large_transfers_use_transfer_config(mocker, tmp_path):
+    config = TransferConfig(multipart_threshold=64, multipart_chunksize=32, max_concurrency=4)
+    storage = _storage(mocker, config)
+    payload = pickle.dumps(list(range(1000)))
+    storage.s3_client.head_object.return_value = {"ETag": "e", "LastModified": "t", "ContentLength": len(payload)}
+    storage.s3_client.download_file.side_effect = \
+        lambda bucket, key, filename, Config: open(filename, "wb").write(payload)
+
+    assert storage.load_model("model.pkl", bucket_name="bucket") == list(range(1000))
+    assert storage.s3_client.download_file.call_args.kwargs["Config"] is config
+    storage.s3_client.get_object.assert_not_called()
+
+    local_file = tmp_path / "model.pkl"
+    local_file.write_bytes(payload)
+    before = uploaded_bytes.value
+    storage.upload_file(str(local_file), "versions/v1/model.pkl", "bucket", remove=False)
+    upload = storage.s3_resource.meta.client.upload_file
+    assert upload.call_args.kwargs["Config"] is config
+    assert uploaded_bytes.value - before == len(payload)
+
+
+# Test 3: existence checks are exact-key HEADs, cached across instances (misses too) until the key is written
+def test_exact_key_checks_share_cached_metadata(mocker, tmp_path):
+    storage = _storage(mocker)
+    objects = {"model.pkl.bak": {"ETag": "e", "LastModified": "t", "ContentLength": 3}}
+
+    def head_object(Bucket, Key):
+        if Key not in objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return objects[Key]
+
+    storage.s3_client.head_object.side_effect = head_object
+    before = head_requests.value
+
+    assert storage.s3_key_path_available("bucket", "model.pkl") is False
+    assert SimpleStorageService().s3_key_path_available("bucket", "model.pkl") is False
+    with pytest.raises(MyException):
+        storage.get_file_object("model.pkl", "bucket")
+    assert head_requests.value - before == 1
+
+    objects["model.pkl"] = {"ETag": "f", "LastModified": "t", "ContentLength": 3}
+    local_file = tmp_path / "model.pkl"
+    local_file.write_bytes(b"abc")
+    storage.upload_file(str(local_file), "model.pkl", "bucket", remove=False)
+    assert storage.s3_key_path_available("bucket", "model.pkl") is True
+    assert storage.get_object_metadata("bucket", "model.pkl")["ETag"] == "f"
+    assert storage.get_file_object("model.pkl", "bucket") is storage.s3_resource.Object.return_value
+    assert head_requests.value - before == 2
+    storage.s3_resource.Bucket.assert_not_called()
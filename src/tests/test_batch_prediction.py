@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.pipline.prediction_pipeline import VehicleBatchData
+
+
+# Test 1: a clean batch validates and keeps the trained column order
+def test_valid_batch(vehicle_df):
+    records = vehicle_df.drop(columns=["Response"]).iloc[::-1].to_dict(orient="records")
+    batch = VehicleBatchData(records)
+
+    assert batch.validate() == []
+    df = batch.get_vehicle_input_data_frame()
+    assert list(df.columns) == list(vehicle_df.columns[:-1])
+    assert df["id"].tolist() == vehicle_df["id"].iloc[::-1].tolist()
+
+
+# Test 2: all bad rows are reported in one pass, per column
+def test_invalid_batch_reports_every_column(vehicle_df):
+    data = vehicle_df.drop(columns=["Response", "Vintage"]).head(5).to_dict(orient="list")
+    data["Age"][1] = "forty"
+    data["Gender"][3] = "Unknown"
+
+    errors = {error["column"]: error for error in VehicleBatchData(data).validate()}
+
+    assert errors["Age"]["rows"] == [1]
+    assert errors["Gender"]["rows"] == [3]
+    assert errors["Vintage"]["error"] == "Missing column"
+
+
+# Test 3: one vectorized call matches the per-row model output
+def test_predict_with_proba_matches_predict(fitted_model, vehicle_df):
+    X = vehicle_df.drop(columns=["Response"])
+    predictions, probabilities = fitted_model.predict_with_proba(X)
+
+    assert np.array_equal(predictions, fitted_model.predict(X))
+    assert probabilities.shape == (len(X),)
+    assert np.array_equal(predictions, (probabilities > 0.5).astype(predictions.dtype))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.entity.compiled_forest import CompiledForest
+from src.exception import MyException
+
+
+@pytest.fixture(scope="module")
+def forest_and_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 12))
+    y = (X[:, 0] + X[:, 3] * X[:, 5] + rng.normal(scale=0.5, size=2000) > 0).astype(int)
+    forest = RandomForestClassifier(n_estimators=20, max_depth=10, min_samples_split=7, min_samples_leaf=6,
+                                    criterion="entropy", random_state=101).fit(X, y)
+    return forest, rng.normal(size=(1500, 12))
+
+
+# Test 1: same probabilities and labels as sklearn, across chunk boundaries
+def test_matches_sklearn(forest_and_data):
+    forest, X = forest_and_data
+    compiled = CompiledForest.from_estimator(forest, chunk_size=256)
+
+    assert np.array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(compiled.predict(X), forest.predict(X))
+
+
+# Test 2: single rows and missing values follow the same paths as sklearn
+def test_single_row_and_missing_values(forest_and_data):
+    forest, X = forest_and_data
+    compiled = CompiledForest.from_estimator(forest)
+    X = X.copy()
+    X[::5, 3] = np.nan
+
+    assert np.array_equal(compiled.predict_proba(X[:1]), forest.predict_proba(X[:1]))
+    assert np.array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+
+
+# Test 3: MyModel switches engines without changing its output
+def test_my_model_uses_compiled_forest(fitted_model, vehicle_df):
+    X = vehicle_df.drop(columns=["Response"])
+    expected = fitted_model.predict_with_proba(X)
+
+    fitted_model.compile_model()
+    try:
+        assert isinstance(fitted_model.get_inference_model(), CompiledForest)
+        predictions, probabilities = fitted_model.predict_with_proba(X)
+    finally:
+        fitted_model.compiled_model = None
+
+    assert np.array_equal(predictions, expected[0])
+    assert np.array_equal(probabilities, expected[1])
+
+
+def test_rejects_other_models():
+    with pytest.raises(MyException):
+        CompiledForest.from_estimator(object())
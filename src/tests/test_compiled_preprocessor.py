@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.entity.compiled_preprocessor import CompiledPreprocessor
+from src.entity.estimator import MyModel
+from tests.conftest import make_vehicle_dataframe
+
+
+@pytest.fixture(scope="module")
+def pipeline(fitted_model):
+    return fitted_model.preprocessing_object
+
+
+@pytest.fixture(scope="module")
+def compiled(pipeline):
+    return CompiledPreprocessor.from_pipeline(pipeline)
+
+
+@pytest.fixture(scope="module")
+def unseen_rows():
+    return make_vehicle_dataframe(200, seed=7).drop(columns=["Response"])
+
+
+def _assert_bitwise_equal(actual, expected):
+    assert actual.dtype == np.float64
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual.view(np.uint64), np.asarray(expected, dtype=np.float64).view(np.uint64))
+
+
+# Test 1: DataFrame input matches pipeline.transform bit for bit
+def test_dataframe_parity(pipeline, compiled, unseen_rows):
+    _assert_bitwise_equal(compiled.transform(unseen_rows), pipeline.transform(unseen_rows))
+
+
+# Test 2: single-row dict of scalars (the form path)
+def test_single_row_dict_parity(pipeline, compiled, unseen_rows):
+    for index in range(10):
+        row = unseen_rows.iloc[[index]]
+        record = {column: row[column].iloc[0] for column in row.columns}
+        _assert_bitwise_equal(compiled.transform(record), pipeline.transform(row))
+
+
+# Test 3: column -> values dict (the micro-batch path)
+def test_column_dict_parity(pipeline, compiled, unseen_rows):
+    columns = unseen_rows.to_dict(orient="list")
+    _assert_bitwise_equal(compiled.transform(columns), pipeline.transform(unseen_rows))
+
+
+# Test 4: 2-D array in input column order
+def test_array_parity(pipeline, compiled, unseen_rows):
+    array = unseen_rows[compiled.input_columns].to_numpy(dtype=object)
+    _assert_bitwise_equal(compiled.transform(array), pipeline.transform(unseen_rows))
+
+
+# Test 5: categories never seen in fit encode as all zeros, like handle_unknown="ignore"
+def test_unknown_categories_parity(pipeline, compiled, unseen_rows):
+    rows = unseen_rows.head(3).copy()
+    rows["Vehicle_Age"] = ["10+ Years", "< 1 Year", "unknown"]
+    rows["Vehicle_Damage"] = ["Maybe", "Yes", "No"]
+    with pytest.warns(UserWarning):
+        expected = pipeline.transform(rows)
+    _assert_bitwise_equal(compiled.transform(rows), expected)
+
+
+# Test 6: form values arrive as strings
+def test_string_form_values(pipeline, compiled, unseen_rows):
+    row = unseen_rows.iloc[[0]]
+    form = {column: [str(row[column].iloc[0])] for column in row.columns}
+    _assert_bitwise_equal(compiled.transform(form), pipeline.transform(row))
+
+
+# Test 7: MyModel predictions do not change when the fast path is switched on
+def test_compiled_model_predictions(fitted_model, unseen_rows):
+    model = MyModel(fitted_model.preprocessing_object, fitted_model.trained_model_object)
+    expected_predictions, expected_probabilities = model.predict_with_proba(unseen_rows)
+
+    model.compile_preprocessor()
+    predictions, probabilities = model.predict_with_proba(unseen_rows.to_dict(orient="list"))
+
+    assert np.array_equal(predictions, expected_predictions)
+    assert np.array_equal(probabilities, expected_probabilities)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from src.exception import MyException
+from src.pipline.dag_executor import DagExecutor, Stage
+
+
+# Test 1: independent stages overlap, dependants get their inputs, and the trace finds the critical path
+def test_runs_independent_stages_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def slow(value):
+        def run(**_):
+            barrier.wait()  # only passes if both branches are running at the same time
+            time.sleep(0.05 if value == "b" else 0.0)
+            return value
+        return run
+
+    executor = DagExecutor([
+        Stage("root", lambda: "root"),
+        Stage("a", slow("a"), inputs={"parent": "root"}),
+        Stage("b", slow("b"), inputs={"parent": "root"}),
+        Stage("join", lambda left, right: left + right, inputs={"left": "a", "right": "b"}),
+    ], max_workers=4)
+
+    artifacts = executor.run()
+
+    assert artifacts["join"] == "ab"
+    assert executor.critical_path() == ["root", "b", "join"]
+    report = executor.trace_report()
+    assert [stage["name"] for stage in report["stages"]][0] == "root"
+    assert all(stage["status"] == "completed" for stage in report["stages"])
+
+
+# Test 2: a failure stops downstream stages and is re-raised
+def test_failure_stops_downstream():
+    downstream = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    executor = DagExecutor([
+        Stage("fail", fail),
+        Stage("after", lambda parent: downstream.append(parent), inputs={"parent": "fail"}),
+    ], max_workers=2)
+
+    with pytest.raises(RuntimeError):
+        executor.run()
+    assert downstream == []
+    assert executor.trace[0].status == "failed"
+
+
+# Test 3: invalid graphs are rejected
+def test_invalid_graphs():
+    with pytest.raises(MyException):
+        DagExecutor([Stage("a", lambda parent: parent, inputs={"parent": "missing"})], max_workers=1)
+    with pytest.raises(ValueError):
+        DagExecutor([Stage("a", lambda x: x, inputs={"x": "b"}),
+                     Stage("b", lambda x: x, inputs={"x": "a"})], max_workers=1).run()
@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+
+from src.components.data_drift import DataDrift
+from src.entity.artifact_entity import (DataDriftArtifact, DataIngestionArtifact, DataValidationArtifact,
+                                        ProductionModelArtifact)
+from src.entity.config_entity import DataDriftConfig
+from src.entity.estimator import MyModel
+from src.entity.feature_sketches import QuantileSketch, compare_sketches, sketch_from_dict
+from src.pipline.training_pipeline import TrainPipeline
+from tests.conftest import make_vehicle_dataframe
+
+
+def _drift(tmp_path, df, production_model=None, gate_retraining=False):
+    report_path = tmp_path / "report.yaml"
+    report_path.write_text(json.dumps({"validation_status": True, "errors": []}))
+    config = DataDriftConfig(sketch_file_path=str(tmp_path / "sketches.yaml"), chunk_size=64,
+                             gate_retraining=gate_retraining)
+    production = ProductionModelArtifact(s3_model_path="model.pkl", is_model_present=production_model is not None)
+    if production_model is not None:
+        production.estimator = type("Estimator", (), {"loaded_model": production_model})()
+    return DataDrift(DataIngestionArtifact("train.parquet", "test.parquet", train_df=df),
+                     DataValidationArtifact(True, "", str(report_path)), config, production)
+
+
+# Test 1: the sketch stays within ~1% rank error of exact quantiles and survives serialization
+def test_quantile_sketch_accuracy_and_round_trip():
+    values = np.random.default_rng(0).lognormal(10, 0.5, 50_000)
+    sketch = QuantileSketch(capacity=200)
+    for start in range(0, len(values), 777):
+        sketch.update(values[start:start + 777])
+
+    probabilities = np.linspace(0.05, 0.95, 19)
+    estimated_ranks = np.searchsorted(np.sort(values), sketch.quantiles(probabilities)) / len(values)
+    assert np.max(np.abs(estimated_ranks - probabilities)) < 0.01
+    assert sketch.count == len(values)
+
+    restored = sketch_from_dict(sketch.to_dict())
+    assert compare_sketches(sketch, restored) == {"psi": 0.0, "ks": 0.0}
+
+
+# Test 2: same-distribution data shows no drift; shifted data is flagged and gates nothing when gating is off
+def test_drift_detection_against_production_sketches(tmp_path):
+    reference_df = make_vehicle_dataframe(3000, seed=1)
+    reference = _drift(tmp_path, reference_df).initiate_data_drift()
+    production_model = MyModel(None, None, feature_sketches=reference.sketches)
+
+    same = _drift(tmp_path, make_vehicle_dataframe(3000, seed=2), production_model, gate_retraining=True)
+    artifact = same.initiate_data_drift()
+    assert not artifact.drift_detected and not artifact.retraining_required
+
+    shifted_df = make_vehicle_dataframe(3000, seed=3)
+    shifted_df["Age"] = shifted_df["Age"] + 15
+    shifted_df["Gender"] = "Male"
+    artifact = _drift(tmp_path, shifted_df, production_model).initiate_data_drift()
+    assert artifact.drift_detected and artifact.retraining_required
+
+    with open(artifact.validation_report_file_path) as report_file:
+        drift_report = json.load(report_file)["drift"]
+    drifted = {column for column, result in drift_report["columns"].items() if result["drift_detected"]}
+    assert drifted == {"Age", "Gender"}
+    assert drift_report["columns"]["Gender"]["ks"] is None
+
+
+# Test 3: without reference sketches retraining always proceeds; a gated drift artifact skips downstream stages
+def test_retraining_gate(tmp_path):
+    artifact = _drift(tmp_path, make_vehicle_dataframe(200), gate_retraining=True).initiate_data_drift()
+    assert artifact.retraining_required and not artifact.drift_detected
+
+    gated = DataDriftArtifact(False, False, "No drift detected", "sketches.yaml", "report.yaml")
+    assert TrainPipeline.get_skip_reason({"data_drift_artifact": gated}) is not None
+    assert TrainPipeline.get_skip_reason({"data_transformation_artifact": None}) is not None
+    assert TrainPipeline.get_skip_reason({"data_drift_artifact": artifact}) is None
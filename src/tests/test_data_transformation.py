@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.constants import TARGET_COLUMN
+from src.data_access.table_storage import read_table, write_table
+from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+from src.entity.config_entity import DataTransformationConfig, ModelTrainerConfig
+from tests.conftest import make_vehicle_dataframe
+
+
+def _chunked_transformation(tmp_path, train_df, test_df, strategy):
+    train_path, test_path = str(tmp_path / "train.parquet"), str(tmp_path / "test.parquet")
+    write_table(train_df, train_path)
+    write_table(test_df, test_path)
+    config = DataTransformationConfig(
+        transformed_train_file_path=str(tmp_path / "out" / "train.npy"),
+        transformed_test_file_path=str(tmp_path / "out" / "test.npy"),
+        transformed_train_target_file_path=str(tmp_path / "out" / "train_target.npy"),
+        transformed_test_target_file_path=str(tmp_path / "out" / "test_target.npy"),
+        transformed_object_file_path=str(tmp_path / "out" / "preprocessing.pkl"),
+        unresampled_train_file_path=str(tmp_path / "out" / "train_unresampled.npy"),
+        unresampled_train_target_file_path=str(tmp_path / "out" / "train_unresampled_target.npy"),
+        resampling_strategy=strategy, chunked=True, chunk_size=37)
+    return DataTransformation(DataIngestionArtifact(train_path, test_path), DataValidationArtifact(True, "", ""),
+                              config)
+
+
+# Test 1: chunked fitting and streaming match the in-memory pipeline, even when the first chunk lacks categories
+def test_chunked_matches_in_memory(tmp_path):
+    # Sorted so the first chunk only holds one Gender and one Vehicle_Age
+    train_df = make_vehicle_dataframe(300, seed=11).sort_values(["Gender", "Vehicle_Age"], ignore_index=True)
+    test_df = make_vehicle_dataframe(90, seed=12)
+    transformation = _chunked_transformation(tmp_path, train_df, test_df, "class_weight")
+
+    artifact = transformation.initiate_data_transformation()
+
+    train_df, test_df = read_table(str(tmp_path / "train.parquet")), read_table(str(tmp_path / "test.parquet"))
+    expected = transformation.get_preprocessor().fit(train_df.drop(columns=[TARGET_COLUMN]))
+    train_features = np.load(artifact.transformed_train_file_path, mmap_mode="r")
+    test_features = np.load(artifact.transformed_test_file_path, mmap_mode="r")
+
+    np.testing.assert_allclose(train_features, expected.transform(train_df.drop(columns=[TARGET_COLUMN])),
+                               rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(test_features, expected.transform(test_df.drop(columns=[TARGET_COLUMN])),
+                               rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(np.load(artifact.transformed_train_target_file_path), train_df[TARGET_COLUMN])
+    assert set(artifact.class_weight) == {0, 1}
+    assert not os.path.exists(artifact.transformed_train_file_path + ".stream")
+
+
+# Test 2: resampling strategies that change the rows still produce a complete training array
+def test_chunked_with_resampling(tmp_path):
+    transformation = _chunked_transformation(tmp_path, make_vehicle_dataframe(200, seed=13),
+                                             make_vehicle_dataframe(50, seed=14), "undersample")
+
+    artifact = transformation.initiate_data_transformation()
+
+    train_target = np.load(artifact.transformed_train_target_file_path)
+    assert artifact.class_weight is None
+    assert train_target.mean() == 0.5
+    assert len(np.load(artifact.transformed_train_file_path)) == len(train_target)
+    assert not os.path.exists(artifact.transformed_train_file_path + ".stream")
+    # The rows before resampling are kept for the hyperparameter search
+    assert artifact.resampling_strategy == "undersample"
+    assert len(np.load(artifact.unresampled_train_target_file_path)) == 200
+
+
+# Test 3: compact arrays take at most half the memory and train exactly the same model as float64 ones
+def test_compact_dtypes_keep_metrics(tmp_path):
+    transformation = _chunked_transformation(tmp_path, make_vehicle_dataframe(400, seed=15),
+                                             make_vehicle_dataframe(150, seed=16), "smoteenn")
+    transformation.config.chunked = False
+    transformation.ingestion_artifact.train_df = read_table(transformation.ingestion_artifact.trained_file_path)
+    transformation.ingestion_artifact.test_df = read_table(transformation.ingestion_artifact.test_file_path)
+    artifact = transformation.initiate_data_transformation()
+    arrays = [np.load(path) for path in (artifact.transformed_train_file_path,
+                                         artifact.transformed_train_target_file_path,
+                                         artifact.transformed_test_file_path,
+                                         artifact.transformed_test_target_file_path)]
+    assert [array.dtype for array in arrays] == [np.float32, np.int8, np.float32, np.int8]
+
+    wide = [array.astype(np.float64) for array in arrays]
+    assert sum(array.nbytes for array in arrays) <= sum(array.nbytes for array in wide) / 2
+
+    model_config_file_path = tmp_path / "model.yaml"
+    model_config_file_path.write_text("search:\n  enabled: false\n")
+    trainer = ModelTrainer(artifact, ModelTrainerConfig(model_config_file_path=str(model_config_file_path),
+                                                        trial_log_file_path=str(tmp_path / "trials.yaml")))
+    compact_model, compact_metrics, _ = trainer.get_model_object_and_report(*arrays)
+    wide_model, wide_metrics, _ = trainer.get_model_object_and_report(*wide)
+    assert compact_metrics == wide_metrics
+    np.testing.assert_array_equal(compact_model.predict_proba(arrays[2]), wide_model.predict_proba(wide[2]))
@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+
+from src.components.data_validation import DataValidation
+from src.components.validation_engine import ValidationEngine
+from src.constants import SCHEMA_FILE_PATH
+from src.data_access.table_storage import write_table
+from src.entity.artifact_entity import DataIngestionArtifact
+from src.entity.config_entity import DataValidationConfig
+from src.utils.main_utils import read_yaml_file
+from tests.conftest import make_vehicle_dataframe
+
+
+def _dirty_dataframe():
+    df = make_vehicle_dataframe(100, seed=5)
+    df["Age"] = df["Age"].astype(float)
+    df.loc[3, "Age"] = 12.0         # below min
+    df.loc[40, "Age"] = 30.5        # not an int
+    df.loc[7, "Vehicle_Age"] = "10+ Years"
+    df.loc[8, "Annual_Premium"] = np.nan
+    return df
+
+
+def _run(df, chunk_size):
+    engine = ValidationEngine(read_yaml_file(SCHEMA_FILE_PATH), sample_rows=5)
+    for start in range(0, len(df), chunk_size):
+        engine.update(df.iloc[start:start + chunk_size])
+    return engine.result("Train")
+
+
+# Test 1: clean data passes and results do not depend on the chunk size
+def test_clean_data_and_chunk_invariance():
+    df = make_vehicle_dataframe(250, seed=6)
+    errors, report = _run(df, chunk_size=250)
+    assert errors == []
+    assert _run(df, chunk_size=7) == (errors, report)
+
+    dirty = _dirty_dataframe()
+    assert _run(dirty, chunk_size=100) == _run(dirty, chunk_size=9)
+
+
+# Test 2: every rule is counted with sample rows
+def test_violations_are_reported():
+    errors, report = _run(_dirty_dataframe(), chunk_size=30)
+
+    age = report["columns"]["Age"]
+    assert age["violations"]["below_min"] == 1 and age["violations"]["dtype"] == 1
+    assert age["samples"]["below_min"] == [{"row": 3, "value": 12.0}]
+    assert report["columns"]["Vehicle_Age"]["samples"]["category"] == [{"row": 7, "value": "10+ Years"}]
+    assert report["columns"]["Annual_Premium"]["nulls"] == 1
+    assert len(errors) == 4
+
+
+# Test 3: files are streamed in chunks and the structured report is written
+def test_initiate_data_validation_from_files(tmp_path):
+    train_path, test_path = str(tmp_path / "train.parquet"), str(tmp_path / "test.parquet")
+    write_table(_dirty_dataframe(), train_path)
+    write_table(make_vehicle_dataframe(50, seed=7), test_path)
+    config = DataValidationConfig(validation_report_file_path=str(tmp_path / "report.yaml"), chunk_size=16)
+
+    artifact = DataValidation(DataIngestionArtifact(train_path, test_path), config).initiate_data_validation()
+
+    with open(artifact.validation_report_file_path) as report_file:
+        report = json.load(report_file)
+    assert artifact.validation_status is False
+    assert report["datasets"]["Train"]["rows"] == 100
+    assert report["datasets"]["Train"]["columns"]["Age"]["violations"]["dtype"] == 1
+    assert report["datasets"]["Test"]["columns"]["Age"]["violations"]["below_min"] == 0
+    assert all(error.startswith("Train:") for error in report["errors"])
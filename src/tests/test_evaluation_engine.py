@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score, precision_score, recall_score,
+                             roc_auc_score)
+
+from src.components.evaluation_engine import (bootstrap_f1_difference, evaluate_classifier, metrics_from_scores,
+                                              subsample)
+from src.components.model_evaluation import ModelEvaluation
+from src.entity.artifact_entity import ClassificationMetricArtifact, DataIngestionArtifact, ModelTrainerArtifact
+from src.constants import TARGET_COLUMN
+from src.entity.config_entity import ModelEvaluationConfig
+
+
+def _scores(n_rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n_rows) < 0.3).astype(np.int8)
+    # Rounded so ties exercise the ROC-AUC rank averaging
+    proba = np.round(np.clip(0.3 * y + rng.random(n_rows) * 0.7, 0, 1), 2)
+    return y, (proba >= 0.5).astype(np.int8), proba
+
+
+# Test 1: every metric derived from the single confusion matrix matches sklearn's separate passes
+def test_metrics_match_sklearn():
+    y, predictions, proba = _scores()
+
+    metrics = metrics_from_scores(y, predictions, proba)
+
+    assert metrics.f1_score == pytest.approx(f1_score(y, predictions))
+    assert metrics.precision_score == pytest.approx(precision_score(y, predictions))
+    assert metrics.recall_score == pytest.approx(recall_score(y, predictions))
+    assert metrics.accuracy_score == pytest.approx(accuracy_score(y, predictions))
+    assert metrics.roc_auc_score == pytest.approx(roc_auc_score(y, proba))
+    assert metrics.confusion_matrix == confusion_matrix(y, predictions).tolist()
+    at_half = next(point for point in metrics.threshold_curve if point["threshold"] == 0.5)
+    assert at_half["f1"] == pytest.approx(metrics.f1_score, abs=1e-6)
+
+
+# Test 2: evaluate_classifier agrees with the classifier's own predict, and small train sets are not copied
+def test_evaluate_classifier_and_subsample():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 3)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(scale=0.5, size=300) > 0).astype(np.int8)
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+
+    metrics = evaluate_classifier(model, X, y)
+
+    assert metrics.f1_score == pytest.approx(f1_score(y, model.predict(X)))
+    assert subsample(X, y, 1000)[0] is X
+    x_sample, y_sample = subsample(X, y, 50, random_state=0)
+    assert x_sample.shape == (50, 3) and len(y_sample) == 50
+
+
+# Test 3: without a production model the trainer's metrics are reused and nothing is predicted again
+def test_evaluation_reuses_trainer_metrics(mocker):
+    trainer_artifact = ModelTrainerArtifact(trained_model_file_path="model.pkl",
+                                            metric_artifact=ClassificationMetricArtifact(0.8, 0.7, 0.9))
+    evaluation = ModelEvaluation(ModelEvaluationConfig(), DataIngestionArtifact("train.parquet", "test.parquet"),
+                                 trainer_artifact)
+    mocker.patch.object(evaluation, "get_best_model", return_value=None)
+    load_test_data = mocker.patch.object(evaluation, "load_test_data")
+    load_object = mocker.patch("src.components.model_evaluation.load_object")
+
+    response = evaluation.evaluate_model()
+
+    load_test_data.assert_not_called()
+    load_object.assert_not_called()
+    assert response.is_model_accepted and response.trained_model_f1_score == 0.8
+
+
+# Test 4: the multinomial bootstrap matches resampling the rows, and acceptance uses its lower bound
+def test_bootstrap_f1_difference(mocker):
+    y, challenger, _ = _scores(seed=2)
+    champion = np.where(np.random.default_rng(3).random(len(y)) < 0.25, 1 - challenger, challenger)
+
+    difference, lower, upper = bootstrap_f1_difference(y, challenger, champion, n_resamples=4000, random_state=0)
+
+    assert difference == pytest.approx(f1_score(y, challenger) - f1_score(y, champion))
+    rows = np.random.default_rng(1).integers(0, len(y), size=(400, len(y)))
+    by_rows = [f1_score(y[r], challenger[r]) - f1_score(y[r], champion[r]) for r in rows]
+    assert lower == pytest.approx(np.quantile(by_rows, 0.025), abs=0.02)
+    assert upper == pytest.approx(np.quantile(by_rows, 0.975), abs=0.02)
+    assert bootstrap_f1_difference(y, challenger, challenger) == (0.0, 0.0, 0.0)
+
+    test_df = pd.DataFrame({"feature": np.arange(len(y)), TARGET_COLUMN: y})
+    trained_model, best_model = mocker.MagicMock(), mocker.MagicMock()
+    trained_model.predict_with_proba.return_value = (challenger, challenger.astype(float))
+    best_model.loaded_model.predict_with_proba.return_value = (champion, champion.astype(float))
+    evaluation = ModelEvaluation(
+        ModelEvaluationConfig(changed_threshold_score=lower - 0.01, bootstrap_resamples=4000, random_state=0),
+        DataIngestionArtifact("train.parquet", "test.parquet", test_df=test_df),
+        ModelTrainerArtifact("model.pkl", ClassificationMetricArtifact(0.0, 0.0, 0.0), trained_model=trained_model))
+    mocker.patch.object(evaluation, "get_best_model", return_value=best_model)
+
+    response = evaluation.evaluate_model()
+
+    assert response.difference == pytest.approx(difference)
+    assert (response.difference_lower, response.difference_upper) == (lower, upper)
+    assert response.is_model_accepted
+    evaluation.model_eval_config.changed_threshold_score = lower
+    assert not evaluation.evaluate_model().is_model_accepted
@@ -0,0 +1,108 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.components import hyperparameter_search
+from src.components.hyperparameter_search import SearchSpace, SuccessiveHalvingSearch
+from src.components.resampling import ResamplingStrategy
+from src.components.model_trainer import ModelTrainer
+from src.entity.artifact_entity import DataTransformationArtifact
+from src.entity.config_entity import ModelTrainerConfig
+from src.utils.main_utils import read_yaml_file
+
+
+def _data(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 5)).astype(np.float32)
+    y = (X[:, 0] + 0.5 * rng.normal(size=n_rows) > 0).astype(np.int8)
+    return X, y
+
+
+def _space(**overrides):
+    values = {"param_distributions": {"max_depth": [2, 4, None], "min_samples_leaf": [1, 5, 20]},
+              "min_resources": 2, "max_resources": 18, "factor": 3, "n_candidates": 9, "cv": 3,
+              "min_improvement": -1.0, "random_state": 0}
+    return SearchSpace.from_dict({**values, **overrides})
+
+
+# Test 1: each round keeps the best third of the candidates with three times the trees, and every trial is recorded
+def test_successive_halving_rounds():
+    X, y = _data()
+    search = SuccessiveHalvingSearch(RandomForestClassifier(random_state=0), _space(), n_jobs=2).fit(X, y)
+
+    rounds = [[trial for trial in search.trials if trial.round == index] for index in range(3)]
+    assert [len(trials) for trials in rounds] == [9, 3, 1]
+    assert [trials[0].resources for trials in rounds] == [2, 6, 18]
+    assert search.stop_reason_ == "completed"
+    assert search.best_params_["n_estimators"] == 18
+    assert all(len(trial.scores) == 3 and len(trial.fit_times) == 3 for trial in search.trials)
+    assert {trial.candidate for trial in rounds[1]} >= {trial.candidate for trial in rounds[2]}
+
+
+# Test 2: the search stops once a round no longer improves the best score
+def test_early_stopping():
+    X, y = _data(seed=1)
+    search = SuccessiveHalvingSearch(RandomForestClassifier(random_state=0), _space(min_improvement=1.0),
+                                     n_jobs=2).fit(X, y)
+
+    assert max(trial.round for trial in search.trials) == 1
+    assert search.stop_reason_.startswith("no improvement")
+    # The best candidate of any round wins, and it is refitted with the full resource
+    assert search.best_score_ == max(trial.mean_score for trial in search.trials)
+    assert search.best_params_ == {**search.best_trial_.params, "n_estimators": 18}
+
+
+# Test 3: the trainer reads the search space from model.yaml, logs the trials and fits the final forest with every
+# tree even when the search stopped early
+def test_trainer_runs_configured_search(tmp_path):
+    model_config_file_path = tmp_path / "model.yaml"
+    model_config_file_path.write_text(
+        "model:\n  params:\n    random_state: 3\n"
+        "search:\n  min_resources: 3\n  max_resources: 12\n  factor: 2\n  n_candidates: 4\n  cv: 2\n"
+        "  min_improvement: 1.0\n  param_distributions:\n    max_depth: [3, 6, 9, 12]\n")
+    config = ModelTrainerConfig(model_config_file_path=str(model_config_file_path),
+                                trial_log_file_path=str(tmp_path / "trials.yaml"))
+    artifact = DataTransformationArtifact("", "", "", "", "")
+    X, y = _data(seed=2)
+
+    model, metrics, _ = ModelTrainer(artifact, config).get_model_object_and_report(X[:200], y[:200], X[200:], y[200:])
+
+    report = read_yaml_file(config.trial_log_file_path)
+    assert report["stop_reason"].startswith("no improvement") and report["best_resources"] < 12
+    assert report["best_params"]["max_depth"] == model.max_depth
+    assert model.n_estimators == 12 and model.random_state == 3 and model.n_jobs == -1
+    assert all(trial["fit_time"] > 0 for trial in report["trials"])
+
+
+class _SentinelSampler(ResamplingStrategy):
+    """Oversamples by appending copies of the minority rows with a sentinel in the last column."""
+    name = "sentinel"
+
+    def __init__(self):
+        super().__init__()
+        self.inputs = []
+
+    def resample(self, X, y):
+        self.inputs.append(X)
+        synthetic = X[y == 1].copy()
+        synthetic[:, -1] = 999
+        return np.vstack([X, synthetic]), np.concatenate([y, np.ones(len(synthetic), dtype=y.dtype)]), None
+
+
+# Test 4: with a sampler only the training folds are resampled; validation folds hold original rows only
+def test_validation_folds_are_never_resampled(mocker):
+    X, y = _data(seed=3)
+    sampler = _SentinelSampler()
+    fit_and_score = mocker.patch.object(hyperparameter_search, "_fit_and_score",
+                                        wraps=hyperparameter_search._fit_and_score)
+
+    SuccessiveHalvingSearch(RandomForestClassifier(random_state=0), _space(), n_jobs=2, sampler=sampler).fit(X, y)
+
+    assert len(sampler.inputs) == 3
+    assert all(len(fold) < len(X) for fold in sampler.inputs)
+    for call in fit_and_score.call_args_list:
+        X_fit, X_val = call.args[2], call.args[4]
+        assert (X_fit[:, -1] == 999).any()
+        assert not (X_val[:, -1] == 999).any()
+        # No validation row was seen by the sampler of the training fold it is scored against
+        fit_rows = {row.tobytes() for row in X_fit}
+        assert not any(row.tobytes() in fit_rows for row in X_val)
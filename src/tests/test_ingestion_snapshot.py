@@ -0,0 +1,53 @@
+import pandas as pd
+from bson import ObjectId
+
+from src.components.data_ingestion import DataIngestion
+from src.data_access.ingestion_snapshot import IngestionSnapshot
+from src.data_access.proj1_data import Proj1Data
+from src.entity.config_entity import DataIngestionConfig
+
+
+def _frame(ids):
+    return pd.DataFrame({"id": ids, "Gender": pd.Categorical(["Male"] * len(ids))})
+
+
+# Test 1: parts append in order and ObjectId watermarks survive the manifest round trip
+def test_snapshot_append_and_read(tmp_path):
+    snapshot = IngestionSnapshot(str(tmp_path), "_id")
+    assert snapshot.watermark is None and snapshot.read().empty
+
+    first, second = ObjectId(), ObjectId()
+    snapshot.append(_frame([1, 2]), first)
+    snapshot.append(_frame([]), first)
+    snapshot.append(_frame([3]), second)
+
+    reopened = IngestionSnapshot(str(tmp_path), "_id")
+    assert reopened.watermark == second
+    assert len(reopened.parts) == 2
+    assert list(reopened.read()["id"]) == [1, 2, 3]
+    # A snapshot taken on another key is not reused
+    assert IngestionSnapshot(str(tmp_path), "id").watermark is None
+
+
+# Test 2: incremental ingestion only asks MongoDB for documents above the watermark
+def test_export_incremental_pulls_delta(tmp_path, mocker):
+    config = DataIngestionConfig(incremental=True, snapshot_dir=str(tmp_path), export_partition_key="id",
+                                 export_max_workers=1)
+    ingestion = DataIngestion(config)
+    my_data = mocker.MagicMock(spec=Proj1Data)
+    my_data.concat_chunks.side_effect = Proj1Data.concat_chunks
+
+    my_data.get_max_key.return_value = 2
+    my_data.iter_collection_chunks.return_value = iter([_frame([1, 2])])
+    assert list(ingestion.export_incremental(my_data)["id"]) == [1, 2]
+    assert my_data.iter_collection_chunks.call_args.kwargs["query"] == {"id": {"$lte": 2}}
+
+    my_data.get_max_key.return_value = 5
+    my_data.iter_collection_chunks.return_value = iter([_frame([3, 4, 5])])
+    assert list(ingestion.export_incremental(my_data)["id"]) == [1, 2, 3, 4, 5]
+    assert my_data.iter_collection_chunks.call_args.kwargs["query"] == {"id": {"$lte": 5, "$gt": 2}}
+
+    # Nothing new: the snapshot is served without another export
+    my_data.iter_collection_chunks.reset_mock()
+    assert len(ingestion.export_incremental(my_data)) == 5
+    my_data.iter_collection_chunks.assert_not_called()
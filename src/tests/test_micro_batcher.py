@@ -0,0 +1,45 @@
+import asyncio
+
+import numpy as np
+
+from src.pipline.micro_batcher import MicroBatcher
+
+
+def _echo_predict(calls):
+    def predict_fn(data):
+        calls.append(len(data["x"]))
+        values = np.asarray(data["x"])
+        return values * 10, values / 100
+    return predict_fn
+
+
+async def _submit_many(batcher, n):
+    await batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit({"x": [i]}) for i in range(n)))
+    finally:
+        await batcher.stop()
+
+
+# Test 1: concurrent requests are scored together and each gets its own row back
+def test_concurrent_requests_share_one_batch():
+    calls = []
+    batcher = MicroBatcher(_echo_predict(calls), max_batch_size=64, max_wait_ms=50)
+
+    results = asyncio.run(_submit_many(batcher, 10))
+
+    assert calls == [10]
+    for i, (prediction, probability) in enumerate(results):
+        assert np.array_equal(prediction, [i * 10])
+        assert np.array_equal(probability, [i / 100])
+
+
+# Test 2: batches never exceed max_batch_size
+def test_batches_are_capped():
+    calls = []
+    batcher = MicroBatcher(_echo_predict(calls), max_batch_size=4, max_wait_ms=50)
+
+    results = asyncio.run(_submit_many(batcher, 10))
+
+    assert calls == [4, 4, 2]
+    assert [int(prediction[0]) for prediction, _ in results] == [i * 10 for i in range(10)]
@@ -0,0 +1,45 @@
+from src.entity.model_cache import ModelCache, cache_hits, cache_misses
+
+
+def _mock_estimator(mocker, versions, models):
+    estimator = mocker.MagicMock()
+    estimator.get_version.side_effect = versions
+    estimator.load_model.side_effect = models
+    mocker.patch("src.entity.model_cache.Proj1Estimator", return_value=estimator)
+    return estimator
+
+
+# Test 1: cold cache downloads once, then serves from memory
+def test_get_model_counts_hits_and_misses(mocker):
+    estimator = _mock_estimator(mocker, ["etag-1"], ["model-v1"])
+    cache = ModelCache("bucket", "model.pkl")
+    hits, misses = cache_hits.value, cache_misses.value
+
+    assert cache.get_model() == "model-v1"
+    assert cache.get_model() == "model-v1"
+    assert cache.get_model() == "model-v1"
+
+    assert cache_misses.value - misses == 1
+    assert cache_hits.value - hits == 2
+    estimator.load_model.assert_called_once()
+
+
+# Test 2: refresh only downloads when the S3 version changes
+def test_refresh_swaps_on_new_version(mocker):
+    estimator = _mock_estimator(mocker, ["etag-1", "etag-1", "etag-2"], ["model-v1", "model-v2"])
+    cache = ModelCache("bucket", "model.pkl")
+
+    assert cache.refresh() is True
+    assert cache.refresh() is False
+    assert cache.get_model() == "model-v1"
+
+    assert cache.refresh() is True
+    assert cache.get_model() == "model-v2"
+    assert [call.args for call in estimator.load_model.call_args_list] == [("etag-1",), ("etag-2",)]
+
+
+# Test 3: one shared cache per bucket/key
+def test_get_instance_is_shared():
+    first = ModelCache.get_instance("bucket", "shared.pkl")
+    assert ModelCache.get_instance("bucket", "shared.pkl") is first
+    assert ModelCache.get_instance("bucket", "other.pkl") is not first
@@ -0,0 +1,95 @@
+import hashlib
+import pickle
+import shutil
+
+import pytest
+
+from src.entity.model_registry import ModelRegistry, downloads, local_hits
+from src.entity.s3_estimator import Proj1Estimator
+from src.exception import MyException
+
+
+def _fake_s3(mocker):
+    """Storage double keeping objects in a dict, with the SimpleStorageService methods the registry uses."""
+    objects = {}
+    s3 = mocker.MagicMock()
+    s3.get_object_bytes.side_effect = lambda bucket, key: objects.get(key)
+    s3.head_object.side_effect = lambda bucket, key: (
+        {"ETag": hashlib.md5(objects[key]).hexdigest(), "ContentLength": len(objects[key])} if key in objects else None)
+    s3.put_object_bytes.side_effect = lambda bucket, key, body, content_type=None: objects.__setitem__(key, body)
+
+    def upload_file(from_filename, to_filename, bucket_name, remove=True):
+        with open(from_filename, "rb") as file_obj:
+            objects[to_filename] = file_obj.read()
+
+    def download_file(bucket, key, to_filename):
+        with open(to_filename, "wb") as file_obj:
+            file_obj.write(objects[key])
+
+    s3.upload_file.side_effect = upload_file
+    s3.download_file.side_effect = download_file
+    return s3, objects
+
+
+# Test 1: pushes get immutable versions, identical content is not uploaded twice, rollback only moves the pointer
+def test_register_promote_and_rollback(mocker, tmp_path):
+    s3, objects = _fake_s3(mocker)
+    registry = ModelRegistry("bucket", cache_dir=str(tmp_path / "cache"), s3=s3)
+    (tmp_path / "v1.pkl").write_bytes(b"model one")
+    (tmp_path / "v2.pkl").write_bytes(b"model two")
+
+    assert registry.current_version() is None
+    first = registry.register(str(tmp_path / "v1.pkl"))
+    second = registry.register(str(tmp_path / "v2.pkl"))
+    assert registry.register(str(tmp_path / "v2.pkl")) == second
+    assert s3.upload_file.call_count == 2
+    assert objects[registry.version_key(first)] == b"model one"
+
+    assert registry.rollback() == first
+    assert registry.current_version() == first
+    assert objects[registry.version_key(second)] == b"model two"
+    registry.promote(second)
+    assert registry.get_manifest()["history"] == [first, second]
+    with pytest.raises(MyException):
+        registry.promote("unknown")
+
+
+# Test 2: a version is downloaded once, verified, and then served from the content-addressed cache
+def test_fetch_uses_local_cache(mocker, tmp_path):
+    s3, objects = _fake_s3(mocker)
+    publisher = ModelRegistry("bucket", cache_dir=str(tmp_path / "publisher"), s3=s3)
+    (tmp_path / "model.pkl").write_bytes(b"model bytes")
+    version = publisher.register(str(tmp_path / "model.pkl"))
+    client = ModelRegistry("bucket", cache_dir=str(tmp_path / "client"), s3=s3)
+    hits, fetched = local_hits.value, downloads.value
+
+    path = client.fetch()
+    assert client.fetch(version) == path
+    assert open(path, "rb").read() == b"model bytes"
+    assert s3.download_file.call_count == 1
+    assert (local_hits.value - hits, downloads.value - fetched) == (1, 1)
+
+    # Corrupted bytes in S3 are rejected instead of being cached
+    shutil.rmtree(tmp_path / "client")
+    objects[client.version_key(version)] = b"model bytez"
+    with pytest.raises(MyException):
+        client.fetch(version)
+    assert list((tmp_path / "client").iterdir()) == []
+
+
+# Test 3: the estimator loads exactly the version it was asked for, even after the champion moved on
+def test_estimator_loads_requested_version(mocker, tmp_path):
+    s3, _ = _fake_s3(mocker)
+    mocker.patch("src.entity.s3_estimator.SimpleStorageService", return_value=s3)
+    registry = ModelRegistry("bucket", cache_dir=str(tmp_path / "cache"), s3=s3)
+    for name in ("model-a", "model-b"):
+        (tmp_path / name).write_bytes(pickle.dumps(name))
+    first = registry.register(str(tmp_path / "model-a"))
+    estimator = Proj1Estimator("bucket", "model.pkl", registry=registry)
+
+    version = estimator.get_version()
+    registry.register(str(tmp_path / "model-b"))
+
+    assert version == first
+    assert estimator.load_model(version) == "model-a"
+    assert estimator.load_model() == "model-b"
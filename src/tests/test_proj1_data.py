@@ -0,0 +1,90 @@
+import time
+import numpy as np
+import pandas as pd
+
+from src.data_access.proj1_data import Proj1Data
+
+
+def _make_documents(n_rows: int) -> list:
+    documents = []
+    for index in range(n_rows):
+        documents.append({
+            "id": index, "Gender": "Male" if index % 2 else "Female", "Age": 20 + index,
+            "Driving_License": 1, "Region_Code": float(index % 5), "Previously_Insured": 0,
+            "Annual_Premium": 1000.0 + index, "Policy_Sales_Channel": 26.0, "Vintage": 100,
+            "Response": index % 2, "Vehicle_Age": "1-2 Year", "Vehicle_Damage": "Yes",
+        })
+    return documents
+
+
+def _proj1_data(mocker, documents):
+    mocker.patch("src.data_access.proj1_data.MongoDBClient")
+    data = Proj1Data()
+    collection = mocker.MagicMock()
+    collection.find.return_value = iter(documents)
+    mocker.patch.object(data, "_get_collection", return_value=collection)
+    return data, collection
+
+
+# Test 1: cursor is projected and batched, chunks are bounded and typed from schema.yaml
+def test_iter_collection_chunks(mocker):
+    data, collection = _proj1_data(mocker, _make_documents(25))
+
+    chunks = list(data.iter_collection_chunks("proj1", chunk_size=10))
+
+    collection.find.assert_called_once_with({}, projection={"_id": 0}, batch_size=10, sort=None)
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[0]["Age"].dtype == np.int64
+    assert chunks[0]["Annual_Premium"].dtype == np.float64
+    assert isinstance(chunks[0]["Gender"].dtype, pd.CategoricalDtype)
+
+
+# Test 2: 'na' becomes NaN and categories survive chunks with different values
+def test_export_collection_as_dataframe(mocker):
+    documents = _make_documents(6)
+    documents[4]["Age"] = "na"
+    documents[5]["Vehicle_Age"] = "> 2 Years"
+    data, _ = _proj1_data(mocker, documents)
+
+    df = data.export_collection_as_dataframe("proj1", chunk_size=4)
+
+    assert len(df) == 6 and "_id" not in df.columns
+    assert df["Age"].dtype == np.float64 and np.isnan(df["Age"].iloc[4])
+    assert isinstance(df["Vehicle_Age"].dtype, pd.CategoricalDtype)
+    assert list(df["Vehicle_Age"].astype(str)) == ["1-2 Year"] * 5 + ["> 2 Years"]
+
+
+# Test 3: split points walk the key index and ranges cover the whole key space
+def test_partition_bounds_and_queries(mocker):
+    data, collection = _proj1_data(mocker, [])
+    collection.find.side_effect = [iter([{"id": 10}]), iter([{"id": 10}]), iter([{"id": 30}]), iter([])]
+
+    bounds = data.get_partition_bounds("proj1", partition_key="id", partition_size=10)
+
+    assert bounds == [10, 30]
+    # A run of duplicate keys longer than a partition moves on past the key instead of looping
+    assert collection.find.call_args_list[2].args[0] == {"id": {"$gt": 10}}
+    assert data.get_partition_queries(bounds, "id") == [
+        {"id": {"$lt": 10}}, {"id": {"$gte": 10, "$lt": 30}}, {"id": {"$gte": 30}}]
+    assert data.get_partition_queries([], "id") == [{}]
+
+
+# Test 4: partitions are merged in key order whichever worker finishes first
+def test_export_collection_parallel_is_deterministic(mocker):
+    documents = _make_documents(30)
+    data, _ = _proj1_data(mocker, [])
+    mocker.patch.object(data, "get_partition_bounds", return_value=[10, 20])
+
+    def fake_chunks(collection_name, database_name=None, chunk_size=None, query=None, sort=None):
+        key_range = query.get("id", {})
+        rows = [d for d in documents
+                if key_range.get("$gte", -1) <= d["id"] < key_range.get("$lt", len(documents))]
+        if key_range.get("$gte") is None:
+            time.sleep(0.05)  # first partition finishes last
+        yield Proj1Data.documents_to_dataframe(rows, Proj1Data.get_schema_dtypes())
+
+    mocker.patch.object(data, "iter_collection_chunks", side_effect=fake_chunks)
+
+    df = data.export_collection_parallel("proj1", partition_key="id", max_workers=3)
+
+    assert list(df["id"]) == list(range(30))
@@ -0,0 +1,41 @@
+import re
+
+import numpy as np
+import pytest
+
+from src.components.resampling import RESAMPLING_STRATEGIES, get_resampling_strategy, resample_with_metrics
+from src.exception import MyException
+
+
+def _imbalanced(n_rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n_rows) < 0.15).astype(int)
+    X = rng.normal(size=(n_rows, 4)) + y[:, None]
+    return X, y
+
+
+# Test 1: every strategy rebalances, either through the rows or through class weights
+@pytest.mark.parametrize("name", sorted(RESAMPLING_STRATEGIES))
+def test_strategies_rebalance(name, mocker):
+    X, y = _imbalanced()
+    log_info = mocker.patch("src.components.resampling.logging.info")
+    strategy = get_resampling_strategy(name, n_jobs=2, random_state=0)
+
+    X_resampled, y_resampled, class_weight = resample_with_metrics(strategy, X, y)
+
+    assert len(X_resampled) == len(y_resampled)
+    minority_share = y_resampled.mean()
+    if name == "class_weight":
+        assert X_resampled is X
+        assert class_weight[1] > 1 > class_weight[0]
+        assert class_weight[1] * minority_share == pytest.approx(class_weight[0] * (1 - minority_share))
+    else:
+        assert class_weight is None
+        assert minority_share > 0.35
+    assert re.search(r"peak memory \d+\.\d MiB \(\+\d+\.\d MiB during resampling\)", log_info.call_args.args[0])
+
+
+# Test 2: an unknown strategy name is rejected
+def test_unknown_strategy():
+    with pytest.raises(MyException):
+        get_resampling_strategy("oversample-everything")
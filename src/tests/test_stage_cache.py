@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.entity.artifact_entity import ClassificationMetricArtifact, DataIngestionArtifact, ModelTrainerArtifact
+from src.pipline.stage_cache import StageCache, compute_key, config_fingerprint
+from src.pipline.training_pipeline import TrainPipeline
+from src.entity.config_entity import ModelTrainerConfig
+
+
+# Test 1: nested artifacts round-trip and entries whose files are gone are ignored
+def test_put_get_round_trip(tmp_path):
+    cache = StageCache(str(tmp_path / "cache"))
+    model_file = tmp_path / "model.pkl"
+    model_file.write_bytes(b"model")
+    artifact = ModelTrainerArtifact(trained_model_file_path=str(model_file),
+                                    metric_artifact=ClassificationMetricArtifact(np.float64(0.8), 0.7, 0.9),
+                                    trained_model=object())
+
+    cache.put("model_trainer", "abc", artifact)
+    cached = cache.get("model_trainer", "abc", ModelTrainerArtifact)
+
+    assert cached == artifact and cached.trained_model is None
+    assert cached.metric_artifact.f1_score == 0.8
+    assert cache.get("model_trainer", "other", ModelTrainerArtifact) is None
+
+    model_file.unlink()
+    assert cache.get("model_trainer", "abc", ModelTrainerArtifact) is None
+
+
+# Test 2: keys ignore timestamped paths but follow hyperparameters
+def test_config_fingerprint():
+    fingerprint = config_fingerprint(ModelTrainerConfig())
+    assert "_n_estimators" in fingerprint and "trained_model_file_path" not in fingerprint
+    assert compute_key(fingerprint) == compute_key(config_fingerprint(ModelTrainerConfig()))
+
+
+# Test 3: a cache hit skips the stage, a miss runs it and records the artifact
+def test_run_stage_uses_cache(tmp_path, mocker):
+    pipeline = TrainPipeline(progress_callback=mocker.Mock())
+    pipeline.stage_cache = StageCache(str(tmp_path))
+    train_file, test_file = tmp_path / "train.parquet", tmp_path / "test.parquet"
+    train_file.touch()
+    test_file.touch()
+    stage = mocker.Mock(return_value=DataIngestionArtifact(str(train_file), str(test_file)))
+
+    first = pipeline.run_stage("data_ingestion", stage, cache_key="k1", artifact_cls=DataIngestionArtifact)
+    second = pipeline.run_stage("data_ingestion", stage, cache_key="k1", artifact_cls=DataIngestionArtifact)
+
+    assert stage.call_count == 1
+    assert second == first
+    pipeline.progress_callback.assert_called_with("data_ingestion", "cached")
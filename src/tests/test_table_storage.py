@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.data_access.table_storage import read_table, table_file_path, write_table
+from src.entity.config_entity import DataIngestionConfig
+from src.exception import MyException
+from tests.conftest import make_vehicle_dataframe
+
+
+# Test 1: every backend round-trips schema-typed columns and honours column projection
+@pytest.mark.parametrize("file_format", ["parquet", "feather", "csv"])
+def test_round_trip_with_projection(tmp_path, file_format):
+    df = make_vehicle_dataframe(50, seed=3)
+    file_path = table_file_path(str(tmp_path / "train.csv"), file_format)
+
+    write_table(df, file_path)
+    result = read_table(file_path, columns=["Age", "Gender", "Annual_Premium"])
+
+    assert list(result.columns) == ["Age", "Gender", "Annual_Premium"]
+    assert result["Age"].dtype == np.int64
+    assert isinstance(result["Gender"].dtype, pd.CategoricalDtype)
+    assert np.array_equal(result["Annual_Premium"].to_numpy(), df["Annual_Premium"].to_numpy())
+
+
+def test_unknown_extension(tmp_path):
+    with pytest.raises(MyException):
+        read_table(str(tmp_path / "train.xlsx"))
+
+
+# Test 2: ingestion writes the configured format and CSV only on request
+def test_ingestion_file_format_and_csv_export(tmp_path):
+    df = make_vehicle_dataframe(40, seed=4)
+    config = DataIngestionConfig(training_file_path=str(tmp_path / "train.csv"),
+                                 testing_file_path=str(tmp_path / "test.csv"),
+                                 file_format="feather", export_csv=True)
+
+    artifact = DataIngestion(config).split_data_as_train_test(df)
+    trained_file_path, test_file_path = artifact.trained_file_path, artifact.test_file_path
+
+    assert trained_file_path.endswith("train.feather") and test_file_path.endswith("test.feather")
+    assert len(read_table(trained_file_path)) + len(read_table(test_file_path)) == 40
+    assert os.path.exists(tmp_path / "train.csv") and os.path.exists(tmp_path / "test.csv")
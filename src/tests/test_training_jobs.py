@@ -0,0 +1,131 @@
+import os
+import time
+from concurrent.futures import Future
+
+from fastapi.testclient import TestClient
+
+from src.pipline.training_jobs import TrainingJobManager, _run_training_job
+
+# Stub pipelines run in the spawned worker, which imports them from this module; the gate file lets the test
+# observe a job while it is running
+GATE_ENV_KEY = "TRAINING_JOB_TEST_GATE"
+
+
+class _GatedPipeline:
+    def __init__(self, progress_callback):
+        self.progress_callback = progress_callback
+
+    def run_pipeline(self):
+        self.progress_callback("data_ingestion", "running")
+        deadline = time.monotonic() + 60
+        while not os.path.exists(os.environ[GATE_ENV_KEY]) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.progress_callback("data_ingestion", "completed")
+
+
+class _FailingPipeline:
+    def __init__(self, progress_callback):
+        self.progress_callback = progress_callback
+
+    def run_pipeline(self):
+        self.progress_callback("data_ingestion", "running")
+        self.progress_callback("data_ingestion", "failed")
+        raise RuntimeError("ingestion broke")
+
+
+class _CachedPipeline:
+    def __init__(self, progress_callback):
+        self.progress_callback = progress_callback
+
+    def run_pipeline(self):
+        for stage, outcome in (("data_ingestion", "cached"), ("data_drift", "skipped"), ("model_trainer", "completed")):
+            self.progress_callback(stage, "running")
+            self.progress_callback(stage, outcome)
+
+
+def _wait_for(manager, job_id, statuses, stage=None, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = manager.get_status(job_id)
+        if status["status"] in statuses and (stage is None or status["current_stage"] == stage):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} never reached {statuses}: {manager.get_status(job_id)}")
+
+
+# Test 1: jobs run in a spawned worker and go from queued to running to succeeded or failed
+def test_job_lifecycle(tmp_path, monkeypatch):
+    gate = tmp_path / "gate"
+    monkeypatch.setenv(GATE_ENV_KEY, str(gate))
+    manager = TrainingJobManager(max_workers=1, pipeline_class=_GatedPipeline)
+    manager.start()
+    try:
+        first = manager.submit()
+        second = manager.submit()
+        assert first != second
+
+        running = _wait_for(manager, first, {"running"}, stage="data_ingestion")
+        assert running["stages"][0]["status"] == "running"
+        # One worker: the second job waits behind the first
+        assert manager.get_status(second)["status"] == "queued"
+
+        gate.touch()
+        succeeded = _wait_for(manager, first, {"succeeded", "failed"})
+        assert succeeded["status"] == "succeeded" and succeeded["current_stage"] is None
+        assert [stage["status"] for stage in succeeded["stages"]] == ["completed"]
+        assert _wait_for(manager, second, {"succeeded", "failed"})["status"] == "succeeded"
+
+        manager.pipeline_class = _FailingPipeline
+        failed = _wait_for(manager, manager.submit(), {"succeeded", "failed"})
+        assert failed["status"] == "failed" and failed["error"] == "ingestion broke"
+        assert failed["stages"][0]["status"] == "failed"
+    finally:
+        manager.shutdown()
+
+
+# Test 2: stage bookkeeping records the cached and skipped outcomes, each with its timestamps
+def test_stage_progress_bookkeeping():
+    status = {"status": "queued", "current_stage": None, "stages": [], "error": None,
+              "started_at": None, "finished_at": None}
+
+    _run_training_job(status, _CachedPipeline)
+
+    assert status["status"] == "succeeded" and status["current_stage"] is None
+    assert [(stage["name"], stage["status"]) for stage in status["stages"]] == [
+        ("data_ingestion", "cached"), ("data_drift", "skipped"), ("model_trainer", "completed")]
+    assert all(stage["started_at"] and stage["finished_at"] for stage in status["stages"])
+
+
+# Test 3: a worker that died without reporting is recorded as failed; unknown jobs have no status
+def test_dead_worker_and_unknown_job():
+    manager = TrainingJobManager()
+    manager._jobs["job"] = {"status": "running", "current_stage": "model_trainer", "error": None}
+    future = Future()
+    future.set_exception(RuntimeError("A process in the process pool was terminated abruptly"))
+
+    manager._on_job_done("job", future)
+
+    status = manager.get_status("job")
+    assert status["status"] == "failed" and status["current_stage"] is None
+    assert "terminated abruptly" in status["error"]
+    assert manager.get_status("missing") is None
+
+
+# Test 4: /train answers with the status URL without waiting for the job; unknown ids are a 404
+def test_train_endpoints(mocker):
+    import app as app_module
+
+    # No lifespan: the job manager is replaced before any request, so no worker process is started
+    client = TestClient(app_module.app)
+    jobs = mocker.MagicMock()
+    jobs.submit.return_value = "abc123"
+    jobs.get_status.side_effect = lambda job_id: {"job_id": job_id, "status": "queued"} if job_id == "abc123" else None
+    mocker.patch.object(app_module.app.state, "training_jobs", jobs, create=True)
+
+    response = client.get("/train")
+    assert response.status_code == 200
+    assert response.json() == {"status": True, "job_id": "abc123", "status_url": "/train/abc123"}
+    jobs.submit.assert_called_once_with()
+
+    assert client.get("/train/abc123").json()["status"] == "queued"
+    assert client.get("/train/unknown").status_code == 404
@@ -1,6 +1,7 @@
 import os
 import pytest
 import numpy as np
+from sklearn.utils import check_array
 from src.exception import MyException
 
 from src.utils.main_utils import read_yaml_file, write_yaml_file
@@ -38,3 +39,13 @@ def test_save_and_load_object(tmp_path):
 def test_read_yaml_invalid_path():
     with pytest.raises(MyException):
         read_yaml_file("non_existent_file.yaml")
+
+def test_memory_mapped_array_reaches_sklearn_without_copy(tmp_path):
+    file_path = tmp_path / "features.npy"
+    save_numpy_array_data(str(file_path), np.arange(12, dtype=np.float32).reshape(4, 3))
+
+    mapped = load_numpy_array_data(str(file_path), mmap_mode="r")
+    validated = check_array(mapped, dtype=np.float32)
+
+    assert isinstance(mapped, np.memmap) and mapped.flags.c_contiguous
+    assert np.shares_memory(validated, mapped)
@@ -0,0 +1,79 @@
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+
+from src.exception import MyException
+from src.logger import logging
+
+
+class ArtifactWriter:
+    """
+    Persists pipeline artifacts on background threads while later stages work from the in-memory copies.
+
+    Objects handed to submit() must not be mutated afterwards; stages treat artifacts as immutable.
+    flush() blocks until everything submitted so far is on disk and re-raises the first failed write.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, write_fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="artifact-writer")
+            future = self._executor.submit(write_fn, *args, **kwargs)
+            self._futures.append(future)
+        return future
+
+    def after_pending(self, callback: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Runs `callback` once every write submitted so far has succeeded; it is skipped if any of them failed.
+        """
+        with self._lock:
+            pending = list(self._futures)
+
+        def run_when_written():
+            # Only waits on writes queued ahead of it, so it cannot starve them of workers
+            wait(pending)
+            if all(future.exception() is None for future in pending):
+                return callback(*args, **kwargs)
+
+        return self.submit(run_when_written)
+
+    def flush(self) -> None:
+        try:
+            with self._lock:
+                futures, self._futures = self._futures, []
+            errors = [future.exception() for future in futures]
+            errors = [error for error in errors if error is not None]
+            if errors:
+                logging.error(f"{len(errors)} background artifact writes failed")
+                raise errors[0]
+            if futures:
+                logging.info(f"Flushed {len(futures)} background artifact writes")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def shutdown(self) -> None:
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+
+
+def write_artifact(artifact_writer: Optional[ArtifactWriter], write_fn: Callable[..., Any], *args, **kwargs) -> None:
+    """
+    Runs write_fn in the background when an ArtifactWriter is given, otherwise writes synchronously.
+    """
+    if artifact_writer is None:
+        write_fn(*args, **kwargs)
+    else:
+        artifact_writer.submit(write_fn, *args, **kwargs)
@@ -1,6 +1,6 @@
 import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 import dill
@@ -74,11 +74,15 @@ def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
         raise MyException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.ndarray:
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.ndarray:
     """
     Loads a NumPy array from disk.
+    With mmap_mode ("r", "r+", "c") the array is memory-mapped instead of read: pages are loaded from the
+    page cache on first access and nothing is copied into process memory up front.
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return np.load(file_obj)
 
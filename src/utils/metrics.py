@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+
+# =========================
+# Metric Types
+# =========================
+
+class Counter:
+    """
+    Thread-safe monotonically increasing counter.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": "counter", "description": self.description, "value": self._value}
+
+
+class Gauge:
+    """
+    Thread-safe value that can go up and down (queue depth, bytes in flight, ...).
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": "gauge", "description": self.description, "value": self._value}
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed, cumulative upper-bound buckets.
+    """
+
+    def __init__(self, name: str, buckets: Sequence[float], description: str = ""):
+        self.name = name
+        self.description = description
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative, running = {}, 0
+        for upper_bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += bucket_count
+            cumulative[str(upper_bound)] = running
+
+        return {
+            "type": "histogram",
+            "description": self.description,
+            "count": count,
+            "sum": total,
+            "buckets": cumulative,
+        }
+
+
+# =========================
+# Registry
+# =========================
+
+class MetricsRegistry:
+    """
+    Process-wide collection of named metrics. Asking for an existing name returns the same metric.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, description))
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(name, lambda: Gauge(name, description))
+
+    def histogram(self, name: str, buckets: Sequence[float], description: str = "") -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, buckets, description))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+
+metrics = MetricsRegistry()